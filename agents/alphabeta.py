@@ -0,0 +1,297 @@
+"""Depth-limited alpha-beta search agent over game_base.games.Game.
+
+Games of 3-4 players are searched with the paranoid reduction: the
+opponents are assumed to play together against the searching player, so
+every position has a single value (for the searching player) that it
+maximizes & the opponents minimize.
+"""
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Optional
+from game_base.games import Game, GameState
+from game_base.players import Player
+from game_base.action_sets import ACTION_SPACE_SIZE
+from game_base.tables import NUM_BONUS_COLORS
+from game_base.zobrist import ZOBRIST_KEYS
+from agents.transposition import (TranspositionTable, EXACT, LOWER_BOUND,
+                                  UPPER_BOUND)
+
+# The value of a game won right away (& minus the value of a lost one),
+# each ply to the end of the game takes 1 from it
+WIN_VALUE: float = 1000.0
+# The values beyond which games are won (or lost), far from the scores
+WON_THRESHOLD: float = WIN_VALUE / 2
+# The weights of the parts of a player's score (see score)
+POINT_WEIGHT: float = 1.0
+BONUS_WEIGHT: float = 0.5
+TOKEN_WEIGHT: float = 0.1
+# The number of killer moves kept for each ply
+NUM_KILLERS: int = 2
+
+
+def score(player: Player) -> float:
+    """Returns a heuristic score of the player's position: the prestige
+    points plus the weighted number of bonuses & tokens."""
+    return (POINT_WEIGHT * player.prestige_points +
+            BONUS_WEIGHT * sum(player.bonus_owned.counts[:NUM_BONUS_COLORS]) +
+            TOKEN_WEIGHT * sum(player.token_reserved.counts))
+
+
+def evaluate_paranoid(game: Game, player_idx: int,
+                      ply: int = 0) -> float:
+    """Returns the value of the game for the player with the given index:
+    WIN_VALUE - ply if they won the finished game & ply - WIN_VALUE if they
+    lost it (so faster wins & slower losses are preferred), else their
+    score minus the best score of the opponents."""
+    if game.meta_data.state == GameState.FINISHED:
+        won = game.get_winner() is game.players[player_idx]
+        return WIN_VALUE - ply if won else ply - WIN_VALUE
+    return (score(game.players[player_idx]) -
+            max(score(player) for opponent_idx, player
+                in enumerate(game.players) if opponent_idx != player_idx))
+
+
+def _value_to_table(value: float, ply: int) -> float:
+    """Returns the value of a won/lost game counted from the searched
+    position instead of the root, to be stored in the transposition table
+    (as the position can be reached at other plies)."""
+    if value > WON_THRESHOLD:
+        return value + ply
+    if value < -WON_THRESHOLD:
+        return value - ply
+    return value
+
+
+def _value_from_table(value: float, ply: int) -> float:
+    """Returns the stored value counted from the root (see _value_to_table).
+    """
+    if value > WON_THRESHOLD:
+        return value - ply
+    if value < -WON_THRESHOLD:
+        return value + ply
+    return value
+
+
+class _SearchTimeout(Exception):
+    """Raised inside a search when its time is up."""
+
+
+@dataclass(slots=True)
+class AlphaBetaStats:
+    """Statistics of a single search.
+
+    Parameters
+    ----------
+    depth : int
+        The depth of the last completed iteration of the search.
+    nodes : int
+        The number of searched positions.
+    seconds : float
+        The duration of the search.
+    cutoffs : int
+        The number of beta (or alpha) cutoffs.
+    first_move_cutoffs : int
+        The number of cutoffs by the first searched move (the better the
+        move ordering, the closer to the number of cutoffs).
+    """
+    depth: int = 0
+    nodes: int = 0
+    seconds: float = 0.0
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+
+@dataclass(slots=True)
+class AlphaBetaAgent:
+    """An agent that picks its moves with a depth-limited alpha-beta search
+    (paranoid for 3-4 players, see evaluate_paranoid) with iterative
+    deepening, within a maximum depth and/or seconds per move.
+
+    The search makes & unmakes the moves on a single copy of the game (see
+    Game.apply & Game.undo). The moves of a position are searched in the
+    order: the best move stored in the transposition table, the killer
+    moves of the ply (the last moves that caused a cutoff at the same
+    depth), then the rest by their history score (the sum of the squared
+    remaining depths of their cutoffs).
+    (The cards drawn during the search are the real top cards of the
+    decks.)
+
+    Parameters
+    ----------
+    max_depth : Optional[int]
+        The maximum depth of the search (in moves).
+    time_limit : Optional[float]
+        The maximum number of seconds per move (the move of the last
+        completed depth is picked).
+    transpositions : Optional[TranspositionTable]
+        The table of the searched positions (kept between the moves),
+        None to search without one.
+    """
+    max_depth: Optional[int] = None
+    time_limit: Optional[float] = 1.0
+    transpositions: Optional[TranspositionTable] = field(
+        default_factory=lambda: TranspositionTable(capacity=1 << 16),
+        repr=False, compare=False)
+    # Statistics of the last search
+    stats: AlphaBetaStats = field(default_factory=AlphaBetaStats,
+                                  compare=False)
+    # The killer moves of each ply & the history scores of each player's
+    # moves (reset for every search)
+    _killers: list[list[int]] = field(default_factory=list, init=False,
+                                      repr=False, compare=False)
+    _history: list[list[int]] = field(default_factory=list, init=False,
+                                      repr=False, compare=False)
+    _root_idx: int = field(default=0, init=False, repr=False, compare=False)
+    _root_key: int = field(default=0, init=False, repr=False, compare=False)
+    # The best move of the last searched depth
+    _root_action: int = field(default=-1, init=False, repr=False,
+                              compare=False)
+    _deadline: Optional[float] = field(default=None, init=False, repr=False,
+                                       compare=False)
+
+    def __post_init__(self) -> None:
+        if self.max_depth is None and self.time_limit is None:
+            raise ValueError("The search needs a depth or time limit")
+        if self.max_depth is not None and self.max_depth < 1:
+            raise ValueError("The maximum depth of the search must be "
+                             "positive")
+
+    def __call__(self, game: Game) -> int:
+        return self.search(game)[0]
+
+    def search(self, game: Game) -> tuple[int, float]:
+        """Searches the moves of the current player of the game (which isn't
+        modified) & returns the best move's action index and its value."""
+        legal = game.legal_action_mask().nonzero()[0].tolist()
+        if not legal:
+            raise ValueError(f"Player {game.current_player.id} has no legal "
+                             "moves to search")
+        start = perf_counter()
+        self._deadline = (None if self.time_limit is None
+                          else start + self.time_limit)
+        self._root_idx = game.current_player_idx
+        # (The values are for the searching player, so the positions of
+        # different searching players are stored apart)
+        self._root_key = ZOBRIST_KEYS.key('root', self._root_idx)
+        self._killers = []
+        self._history = [[0] * ACTION_SPACE_SIZE
+                         for _ in range(game.num_players)]
+        if self.transpositions is not None:
+            self.transpositions.new_search()
+        self.stats = AlphaBetaStats()
+        # The moves are made & unmade on a copy that maintains its legal
+        # moves incrementally
+        game = game.clone()
+        game.track_legal_actions()
+        best_action, best_value = legal[0], evaluate_paranoid(
+            game, self._root_idx)
+        depth = 0
+        while self.max_depth is None or depth < self.max_depth:
+            try:
+                best_action, best_value = self._search_root(game, depth + 1)
+            except _SearchTimeout:
+                break
+            depth += 1
+            self.stats.depth = depth
+            # A won or lost game can't be searched deeper
+            if abs(best_value) > WON_THRESHOLD:
+                break
+        self.stats.seconds = perf_counter() - start
+        return best_action, best_value
+
+    def _search_root(self, game: Game, depth: int) -> tuple[int, float]:
+        value = self._search(game, depth, -float('inf'), float('inf'), 0)
+        return self._root_action, value
+
+    def _order_moves(self, legal: list[int], best_action: int, ply: int,
+                     player_idx: int) -> list[int]:
+        """Orders the legal moves: best action, killers, then by history."""
+        legal.sort(key=self._history[player_idx].__getitem__, reverse=True)
+        first_moves = [best_action, *self._killers[ply]]
+        for action_index in reversed(first_moves):
+            if action_index in legal:
+                legal.remove(action_index)
+                legal.insert(0, action_index)
+        return legal
+
+    def _search(self, game: Game, depth: int, alpha: float, beta: float,
+                ply: int) -> float:
+        """Returns the value of the game searched to the given depth, within
+        the window (alpha, beta)."""
+        self.stats.nodes += 1
+        if self._deadline is not None and perf_counter() > self._deadline:
+            raise _SearchTimeout
+        if depth == 0 or game.meta_data.state != GameState.IN_PROGRESS:
+            return evaluate_paranoid(game, self._root_idx, ply)
+        key = game.zobrist_hash ^ self._root_key
+        best_action = -1
+        # (The bound of the stored value is of the window it was searched
+        # with, before the stored bounds narrow it)
+        original_alpha, original_beta = alpha, beta
+        entry = (None if self.transpositions is None
+                 else self.transpositions.probe(key))
+        if entry is not None:
+            best_action = entry.best_action
+            if entry.depth >= depth and ply > 0:
+                value = _value_from_table(entry.value, ply)
+                if entry.bound == EXACT:
+                    return value
+                if entry.bound == LOWER_BOUND:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        legal = game.legal_action_mask().nonzero()[0].tolist()
+        if not legal:
+            return evaluate_paranoid(game, self._root_idx, ply)
+        while len(self._killers) <= ply:
+            self._killers.append([-1] * NUM_KILLERS)
+        player_idx = game.current_player_idx
+        maximizing = player_idx == self._root_idx
+        best_value = -float('inf') if maximizing else float('inf')
+        cards = game.cards.get_all_cards_on_tables()
+        for move_idx, action_index in enumerate(self._order_moves(
+                legal, best_action, ply, player_idx)):
+            record = game.apply(game.possible_actions.decode_action(
+                action_index, game.current_player, cards))
+            value = self._search(game, depth - 1, alpha, beta, ply + 1)
+            game.undo(record)
+            if (value > best_value) if maximizing else (value < best_value):
+                best_value = value
+                best_action = action_index
+            if maximizing:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                self._record_cutoff(action_index, depth, ply, player_idx,
+                                    move_idx == 0)
+                break
+        if ply == 0:
+            self._root_action = best_action
+        if self.transpositions is not None:
+            bound = (UPPER_BOUND if best_value <= original_alpha else
+                     LOWER_BOUND if best_value >= original_beta else EXACT)
+            self.transpositions.store(key, depth,
+                                      _value_to_table(best_value, ply),
+                                      best_action, bound)
+        return best_value
+
+    def _record_cutoff(self, action_index: int, depth: int, ply: int,
+                       player_idx: int, first_move: bool) -> None:
+        self.stats.cutoffs += 1
+        self.stats.first_move_cutoffs += first_move
+        killers = self._killers[ply]
+        if killers[0] != action_index:
+            killers[1:] = killers[:-1]
+            killers[0] = action_index
+        self._history[player_idx][action_index] += depth * depth
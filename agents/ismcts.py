@@ -0,0 +1,108 @@
+"""Information Set Monte Carlo Tree Search agent over game_base.games.Game.
+
+The searching player doesn't know the order of the cards in the decks, so
+(unlike MCTSAgent, which searches the real order) every iteration searches
+a different determinization of the game (see DeterminizationSampler) in
+a single tree of the moves, whose statistics are shared by all of the
+determinizations (single observer ISMCTS).
+"""
+from dataclasses import dataclass, field
+from typing import ClassVar, Optional
+import numpy as np
+from game_base.games import Game, GameState
+from game_base.action_sets import ACTION_SPACE_SIZE
+from game_base.determinization import DeterminizationSampler
+from agents.mcts import (MCTSAgent, RolloutPolicy, SearchTree, ROOT,
+                         search_rng)
+
+# The actions of the children of an expanded node (every action index)
+ALL_ACTIONS: np.ndarray = np.arange(ACTION_SPACE_SIZE)
+
+
+@dataclass(slots=True)
+class InformationSetTree(SearchTree):
+    """A search tree whose nodes have a child for every action index, as
+    the legal moves of a node depend on the determinization.
+    (The child of an action is first_child + action index.)
+
+    The availability of a node is the number of times it was a legal move
+    when its parent was visited, which replaces the visits of the parent
+    in its UCB1 score.
+    """
+    _FILL_VALUES: ClassVar[dict[str, int]] = {
+        **SearchTree._FILL_VALUES, 'availability': 0}
+    availability: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        SearchTree.__post_init__(self)
+        self.availability = np.zeros(self.capacity, dtype=np.float64)
+
+    def expand_all(self, node: int, mover: int) -> None:
+        """Adds a child for every action index of the mover."""
+        self.expand(node, ALL_ACTIONS, mover)
+
+    def select_available_child(self, node: int, legal: np.ndarray,
+                               exploration: float) -> int:
+        """Returns the child of the legal moves (a mask over the action
+        indices) with the highest UCB1 score (unvisited children first)
+        & adds to the availability of the legal moves."""
+        start = int(self.first_child[node])
+        end = start + ACTION_SPACE_SIZE
+        availability = self.availability[start:end]
+        availability += legal
+        visits = self.visits[start:end]
+        unvisited = legal & (visits == 0)
+        if unvisited.any():
+            return start + int(unvisited.argmax())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (self.value_sum[start:end] / visits + exploration *
+                      np.sqrt(np.log(availability) / visits))
+        scores[~legal] = -np.inf
+        return start + int(scores.argmax())
+
+
+@dataclass(slots=True)
+class ISMCTSAgent(MCTSAgent):
+    """An MCTSAgent that doesn't see the order of the decks: every
+    iteration reshuffles the cards left in the decks of its copy of the
+    game, then selects a path down the shared tree through the moves that
+    are legal in that determinization (see InformationSetTree).
+
+    The parameters are the ones of MCTSAgent.
+    """
+    # The sampler of the last search (seeded by a copy of the game's random
+    # number generator)
+    sampler: Optional[DeterminizationSampler] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def search(self, game: Game) -> SearchTree:
+        """Searches the moves of the current player of the game (which isn't
+        modified) and returns the search tree."""
+        self.sampler = DeterminizationSampler(
+            seed=search_rng(game).getrandbits(64))
+        return MCTSAgent.search(self, game)
+
+    def _new_tree(self, root_legal: list[int],
+                  mover: int) -> InformationSetTree:
+        tree = InformationSetTree()
+        tree.expand_all(ROOT, mover)
+        return tree
+
+    def _iterate(self, game: Game, tree: InformationSetTree,
+                 policy: RolloutPolicy) -> None:
+        self.sampler.sample(game)
+        node = ROOT
+        path = [ROOT]
+        # Selection & expansion (of the nodes reached by a rollout)
+        while game.meta_data.state == GameState.IN_PROGRESS:
+            legal = game.legal_action_mask()
+            if not legal.any():
+                break
+            if not tree.is_expanded(node):
+                tree.expand_all(node, game.current_player_idx)
+            node = tree.select_available_child(node, legal, self.exploration)
+            path.append(node)
+            game.step(int(tree.action[node]))
+            if tree.visits[node] == 0:
+                break
+        tree.backpropagate(path, *self._simulate(game, policy))
@@ -0,0 +1,314 @@
+"""Monte Carlo Tree Search agent over game_base.games.Game.
+
+The search tree is stored in arrays indexed by node (see SearchTree), the
+children of a node being a contiguous block of nodes, so there is no Python
+object per node or edge. Moves are the action indices of the fixed action
+space (see game_base.action_sets).
+"""
+from dataclasses import dataclass, field
+from math import log, sqrt
+from random import Random
+from time import perf_counter
+from typing import Callable, ClassVar, Optional, Sequence
+import numpy as np
+from game_base.games import Game, GameState
+from game_base.action_sets import ACTION_SPACE_SIZE, PURCHASE_TABLE_OFFSET
+
+# A rollout policy picks the action index of the next move in a rollout
+# from the indices of the legal moves (using the game's random number
+# generator, so that searches are reproducible).
+RolloutPolicy = Callable[[Game, list[int]], int]
+# Index of the root node & the value of the first child of unexpanded nodes
+ROOT: int = 0
+UNEXPANDED: int = -1
+
+
+def search_rng(game: Game) -> Random:
+    """Returns a copy of the game's random number generator for a search,
+    so searches are reproducible without advancing the game's generator."""
+    rng = Random.__new__(Random)
+    rng.setstate(game.rng.getstate())
+    return rng
+
+
+def random_rollout_policy(game: Game, legal: list[int]) -> int:
+    """Picks a uniformly random legal move."""
+    return game.rng.choice(legal)
+
+
+def greedy_rollout_policy(game: Game, legal: list[int]) -> int:
+    """Picks the purchase of the card with the most prestige points
+    if any purchase is legal, else a uniformly random legal move."""
+    purchases = [action_index for action_index in legal
+                 if action_index >= PURCHASE_TABLE_OFFSET]
+    if not purchases:
+        return game.rng.choice(legal)
+    cards = game.cards.get_all_cards_on_tables()
+    return max(purchases, key=lambda action_index: game.possible_actions
+               .decode_action(action_index, game.current_player, cards)
+               .card.prestige_points)
+
+
+ROLLOUT_POLICIES: dict[str, RolloutPolicy] = {
+    'random': random_rollout_policy, 'greedy': greedy_rollout_policy}
+
+
+def evaluate(game: Game) -> list[float]:
+    """Returns the reward of each player for the state of the game:
+    1 for the winner of a finished game & 0 for the others.
+    (Unfinished games are won by the players with the most prestige points,
+    sharing the reward on ties.)"""
+    if game.meta_data.state == GameState.FINISHED:
+        winner = game.get_winner()
+        return [float(player is winner) for player in game.players]
+    points = [player.prestige_points for player in game.players]
+    most_points = max(points)
+    num_leaders = points.count(most_points)
+    return [1 / num_leaders if player_points == most_points else 0.0
+            for player_points in points]
+
+
+def rollout(game: Game, policy: RolloutPolicy,
+            max_moves: int) -> list[float]:
+    """Plays the game with the policy (for at most the given number of
+    moves) & returns the players' rewards (see evaluate)."""
+    for _ in range(max_moves):
+        if game.meta_data.state != GameState.IN_PROGRESS:
+            break
+        legal = game.legal_action_mask().nonzero()[0].tolist()
+        if not legal:
+            break
+        game.step(policy(game, legal))
+    return evaluate(game)
+
+
+@dataclass(slots=True)
+class SearchStats:
+    """Statistics of a single search."""
+    iterations: int = 0
+    nodes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    @property
+    def iterations_per_second(self) -> float:
+        return self.iterations / self.seconds if self.seconds else 0.0
+
+
+@dataclass(slots=True)
+class SearchTree:
+    """A search tree stored as arrays indexed by node.
+
+    A node is the state after the move of its action, made by its mover
+    (the root has no action). The children of an expanded node are the
+    nodes [first_child, first_child + num_children). The value sum of a
+    node is the sum of the rewards of its mover over its visits.
+
+    Parameters
+    ----------
+    capacity : int
+        The initial number of nodes (the arrays grow when full).
+    """
+    # The value of each array for new nodes
+    _FILL_VALUES: ClassVar[dict[str, int]] = {
+        'first_child': UNEXPANDED, 'num_children': 0, 'action': -1,
+        'mover': -1, 'visits': 0, 'value_sum': 0}
+    capacity: int = 4096
+    size: int = field(init=False)
+    first_child: np.ndarray = field(init=False, repr=False)
+    num_children: np.ndarray = field(init=False, repr=False)
+    action: np.ndarray = field(init=False, repr=False)
+    mover: np.ndarray = field(init=False, repr=False)
+    visits: np.ndarray = field(init=False, repr=False)
+    value_sum: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.first_child = np.full(self.capacity, UNEXPANDED, dtype=np.int32)
+        self.num_children = np.zeros(self.capacity, dtype=np.int32)
+        self.action = np.full(self.capacity, -1, dtype=np.int16)
+        self.mover = np.full(self.capacity, -1, dtype=np.int8)
+        self.visits = np.zeros(self.capacity, dtype=np.float64)
+        self.value_sum = np.zeros(self.capacity, dtype=np.float64)
+        # The root
+        self.size = 1
+
+    def _grow(self, min_capacity: int) -> None:
+        capacity = self.capacity
+        while capacity < min_capacity:
+            capacity *= 2
+        for name, fill_value in self._FILL_VALUES.items():
+            array = getattr(self, name)
+            grown = np.full(capacity, fill_value, dtype=array.dtype)
+            grown[:self.capacity] = array
+            setattr(self, name, grown)
+        self.capacity = capacity
+
+    def is_expanded(self, node: int) -> bool:
+        return self.first_child[node] != UNEXPANDED
+
+    def children(self, node: int) -> range:
+        start = int(self.first_child[node])
+        return range(start, start + int(self.num_children[node]))
+
+    def expand(self, node: int, actions: Sequence[int], mover: int) -> None:
+        """Adds a child for each of the actions of the mover."""
+        start = self.size
+        end = start + len(actions)
+        if end > self.capacity:
+            self._grow(end)
+        self.first_child[node] = start
+        self.num_children[node] = len(actions)
+        self.action[start:end] = actions
+        self.mover[start:end] = mover
+        self.size = end
+
+    def select_child(self, node: int, exploration: float) -> int:
+        """Returns the child of the node with the highest UCB1 score
+        (unvisited children first)."""
+        start = int(self.first_child[node])
+        end = start + int(self.num_children[node])
+        visits = self.visits[start:end]
+        unvisited = visits == 0
+        if unvisited.any():
+            return start + int(unvisited.argmax())
+        scores = (self.value_sum[start:end] / visits +
+                  exploration * np.sqrt(log(self.visits[node]) / visits))
+        return start + int(scores.argmax())
+
+    def backpropagate(self, path: list[int], rewards: list[float],
+                      visits: int = 1) -> None:
+        """Adds the visits & the reward of each node's mover along the path
+        (the rewards are summed over the visits)."""
+        self.visits[path] += visits
+        movers = self.mover[path[1:]]
+        self.value_sum[path[1:]] += np.take(rewards, movers)
+
+    def action_statistics(self, node: int = ROOT
+                          ) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the visits & value sums of the children of the node
+        indexed by their action (zero for the actions that aren't
+        children), so the statistics of different trees can be added."""
+        children = self.children(node)
+        actions = self.action[children.start:children.stop]
+        visits = np.zeros(ACTION_SPACE_SIZE, dtype=np.float64)
+        value_sums = np.zeros(ACTION_SPACE_SIZE, dtype=np.float64)
+        visits[actions] = self.visits[children.start:children.stop]
+        value_sums[actions] = self.value_sum[children.start:children.stop]
+        return visits, value_sums
+
+    def best_action(self) -> int:
+        """Returns the action of the most visited child of the root."""
+        children = self.children(ROOT)
+        return int(self.action[children.start +
+                               int(self.visits[children.start:
+                                               children.stop].argmax())])
+
+
+@dataclass(slots=True)
+class MCTSAgent:
+    """An agent that picks its moves with UCT (Monte Carlo Tree Search with
+    UCB1 selection), within a budget of iterations and/or seconds per move.
+
+    Every iteration selects a path down the tree on a clone of the game,
+    expands the reached node with all of its legal moves, plays a rollout
+    to the end of the game (or the rollout move limit) and adds the reward
+    of each move's player along the path (see evaluate).
+
+    Parameters
+    ----------
+    iterations : Optional[int]
+        The maximum number of iterations per move.
+    time_limit : Optional[float]
+        The maximum number of seconds per move (at least one iteration is
+        run, so the picked move is one of the searched moves).
+    exploration : float
+        The exploration constant of UCB1.
+    rollout_policy : str
+        The name of the rollout policy (see ROLLOUT_POLICIES).
+    max_rollout_moves : int
+        The maximum number of moves in a rollout.
+    """
+    iterations: Optional[int] = 1000
+    time_limit: Optional[float] = None
+    exploration: float = sqrt(2)
+    rollout_policy: str = 'random'
+    max_rollout_moves: int = 200
+    # Statistics of the last search
+    stats: SearchStats = field(default_factory=SearchStats, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.iterations is None and self.time_limit is None:
+            raise ValueError("The search needs an iteration or time budget")
+        if self.iterations is not None and self.iterations < 1:
+            raise ValueError("The search needs at least one iteration")
+        if self.rollout_policy not in ROLLOUT_POLICIES:
+            raise ValueError("Unknown rollout policy "
+                             f"'{self.rollout_policy}'")
+
+    def __call__(self, game: Game) -> int:
+        return self.search(game).best_action()
+
+    def search(self, game: Game) -> SearchTree:
+        """Searches the moves of the current player of the game (which isn't
+        modified) and returns the search tree."""
+        root_legal = game.legal_action_mask().nonzero()[0].tolist()
+        if not root_legal:
+            raise ValueError(f"Player {game.current_player.id} has no legal "
+                             "moves to search")
+        tree = self._new_tree(root_legal, game.current_player_idx)
+        # The searched copies maintain their legal moves incrementally &
+        # share a copy of the game's random number generator
+        root_game = game.clone(rng=search_rng(game))
+        root_game.track_legal_actions()
+        root_game.legal_action_mask()
+        policy = ROLLOUT_POLICIES[self.rollout_policy]
+        max_iterations = self.iterations
+        deadline = (None if self.time_limit is None
+                    else perf_counter() + self.time_limit)
+        start = perf_counter()
+        iteration = 0
+        while iteration == 0 or (
+                (max_iterations is None or iteration < max_iterations) and
+                (deadline is None or perf_counter() < deadline)):
+            self._iterate(root_game.clone(rng=root_game.rng), tree, policy)
+            iteration += 1
+        self.stats = SearchStats(iterations=iteration, nodes=tree.size,
+                                 seconds=perf_counter() - start)
+        return tree
+
+    def _new_tree(self, root_legal: list[int], mover: int) -> SearchTree:
+        """Returns a tree with the root expanded with the legal moves."""
+        tree = SearchTree()
+        tree.expand(ROOT, root_legal, mover)
+        return tree
+
+    def _iterate(self, game: Game, tree: SearchTree,
+                 policy: RolloutPolicy) -> None:
+        node = ROOT
+        path = [ROOT]
+        # Selection
+        while tree.is_expanded(node):
+            node = tree.select_child(node, self.exploration)
+            path.append(node)
+            game.step(int(tree.action[node]))
+            if tree.visits[node] == 0:
+                break
+        # Expansion (once a node has been reached by a rollout)
+        if (tree.visits[node] > 0 and
+                game.meta_data.state == GameState.IN_PROGRESS):
+            legal = game.legal_action_mask().nonzero()[0].tolist()
+            if legal:
+                tree.expand(node, legal, game.current_player_idx)
+                node = tree.select_child(node, self.exploration)
+                path.append(node)
+                game.step(int(tree.action[node]))
+        tree.backpropagate(path, *self._simulate(game, policy))
+
+    def _simulate(self, game: Game,
+                  policy: RolloutPolicy) -> tuple[list[float], int]:
+        """Returns the players' rewards summed over the rollouts from the
+        reached state of the game & the number of rollouts."""
+        return rollout(game, policy, self.max_rollout_moves), 1
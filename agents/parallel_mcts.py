@@ -0,0 +1,171 @@
+"""Monte Carlo Tree Search across worker processes.
+
+Root parallelization searches an independent tree of the same game in each
+worker (with different random number generators) and adds up the
+statistics of their root moves. Leaf parallelization searches a single
+tree, playing several rollouts of every reached leaf in the workers.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from random import Random
+from time import perf_counter
+from typing import Any, Callable, Iterable, Optional
+import numpy as np
+from game_base.games import Game
+from agents.mcts import (MCTSAgent, RolloutPolicy, SearchStats,
+                         ROLLOUT_POLICIES, rollout, search_rng)
+
+
+@dataclass(slots=True)
+class WorkerPool:
+    """A pool of worker processes, started on first use.
+    (Pickled pools only keep their number of workers, so agents with pools
+    can be sent to other processes, ex. the self-play workers.)
+
+    Parameters
+    ----------
+    workers : Optional[int]
+        The number of worker processes (default is the number of CPUs,
+        1 runs the tasks in the current process).
+    """
+    workers: Optional[int] = None
+    _executor: Optional[ProcessPoolExecutor] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    @property
+    def num_workers(self) -> int:
+        return self.workers or os.cpu_count() or 1
+
+    def map(self, function: Callable[[Any], Any],
+            tasks: Iterable[Any]) -> list[Any]:
+        """Runs the function for each task & returns the results in order."""
+        if self.workers == 1:
+            return list(map(function, tasks))
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return list(self._executor.map(function, tasks))
+
+    def close(self) -> None:
+        """Stops the worker processes (restarted if the pool is used again).
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __getstate__(self) -> tuple:
+        return (self.workers,)
+
+    def __setstate__(self, state: tuple) -> None:
+        (self.workers,) = state
+        self._executor = None
+
+
+def _search_task(seed: int, game: Game, agent: MCTSAgent
+                 ) -> tuple[np.ndarray, np.ndarray, SearchStats]:
+    """Searches the game with its own random number generator & returns the
+    statistics of the root moves (see SearchTree.action_statistics)."""
+    game = game.clone(rng=Random(seed))
+    visits, value_sums = agent.search(game).action_statistics()
+    return visits, value_sums, agent.stats
+
+
+@dataclass(slots=True)
+class RootParallelMCTSAgent:
+    """An agent that searches independent trees of the current game in
+    worker processes and picks the move with the most visits over all
+    of the trees.
+
+    Parameters
+    ----------
+    agent : MCTSAgent
+        The search of each tree (the budget is per tree).
+    num_trees : Optional[int]
+        The number of searched trees (default is the number of workers).
+    pool : WorkerPool
+        The worker processes that search the trees.
+    """
+    agent: MCTSAgent = field(default_factory=MCTSAgent)
+    num_trees: Optional[int] = None
+    pool: WorkerPool = field(default_factory=WorkerPool)
+    # Statistics of the last search (summed over the trees, with the
+    # seconds of the whole search)
+    stats: SearchStats = field(default_factory=SearchStats, compare=False)
+
+    def __call__(self, game: Game) -> int:
+        visits, _ = self.search(game)
+        return int(visits.argmax())
+
+    def search(self, game: Game) -> tuple[np.ndarray, np.ndarray]:
+        """Searches the moves of the current player of the game (which isn't
+        modified) & returns the visits & value sums of each action index,
+        summed over the trees."""
+        num_trees = self.num_trees or self.pool.num_workers
+        rng = search_rng(game)
+        seeds = [rng.getrandbits(64) for _ in range(num_trees)]
+        start = perf_counter()
+        results = self.pool.map(partial(_search_task, game=game,
+                                        agent=self.agent), seeds)
+        self.stats = SearchStats(
+            iterations=sum(stats.iterations for *_, stats in results),
+            nodes=sum(stats.nodes for *_, stats in results),
+            seconds=perf_counter() - start)
+        visits = np.sum([tree_visits for tree_visits, *_ in results], axis=0)
+        value_sums = np.sum([tree_value_sums
+                             for _, tree_value_sums, _ in results], axis=0)
+        return visits, value_sums
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def _rollouts_task(task: tuple[int, int], game: Game, policy: RolloutPolicy,
+                   max_moves: int) -> list[float]:
+    """Plays the given number of rollouts of the game with its own random
+    number generator & returns the players' summed rewards."""
+    seed, num_rollouts = task
+    rng = Random(seed)
+    summed_rewards = [0.0] * game.num_players
+    for _ in range(num_rollouts):
+        rollout_game = game.clone(rng=rng)
+        for player_idx, reward in enumerate(rollout(rollout_game, policy,
+                                                    max_moves)):
+            summed_rewards[player_idx] += reward
+    return summed_rewards
+
+
+@dataclass(slots=True)
+class LeafParallelMCTSAgent(MCTSAgent):
+    """An MCTSAgent that plays several rollouts of every reached leaf,
+    split between worker processes.
+    (Every iteration waits for the workers, so it's only worth it when the
+    rollouts take longer than sending the game to the workers.)
+
+    Parameters
+    ----------
+    rollouts_per_leaf : Optional[int]
+        The number of rollouts of each leaf (default is the number of
+        workers).
+    pool : WorkerPool
+        The worker processes that play the rollouts.
+    """
+    rollouts_per_leaf: Optional[int] = None
+    pool: WorkerPool = field(default_factory=WorkerPool)
+
+    def _simulate(self, game: Game,
+                  policy: RolloutPolicy) -> tuple[list[float], int]:
+        num_rollouts = self.rollouts_per_leaf or self.pool.num_workers
+        num_tasks = min(num_rollouts, self.pool.num_workers)
+        tasks = [(game.rng.getrandbits(64),
+                  num_rollouts // num_tasks + (task_idx <
+                                               num_rollouts % num_tasks))
+                 for task_idx in range(num_tasks)]
+        results = self.pool.map(
+            partial(_rollouts_task, game=game,
+                    policy=ROLLOUT_POLICIES[self.rollout_policy],
+                    max_moves=self.max_rollout_moves), tasks)
+        return [sum(rewards) for rewards in zip(*results)], num_rollouts
+
+    def close(self) -> None:
+        self.pool.close()
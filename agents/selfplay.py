@@ -0,0 +1,209 @@
+"""Runs many games between agents across a pool of worker processes.
+
+Run from the main directory of the project:
+    python splendor_selfplay.py --games 1000 --agents random greedy
+"""
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, asdict
+from functools import partial
+from time import perf_counter
+from typing import Callable, Iterator, Optional, Sequence, Union
+from game_base.games import Game, GameState
+from game_base.players import Player
+from game_base.action_sets import PURCHASE_TABLE_OFFSET
+from agents.mcts import MCTSAgent
+from agents.ismcts import ISMCTSAgent
+from agents.alphabeta import AlphaBetaAgent
+from agents.parallel_mcts import RootParallelMCTSAgent
+
+# An agent picks the action index (in the fixed action space) of the move
+# for the current player of the game. (Agents must be picklable, i.e.
+# defined at module level, to be sent to the worker processes, and should
+# use the game's random number generator to be reproducible.)
+Agent = Callable[[Game], int]
+
+
+def random_agent(game: Game) -> int:
+    """Picks a uniformly random legal move."""
+    return game.rng.choice(game.legal_action_mask().nonzero()[0].tolist())
+
+
+def greedy_agent(game: Game) -> int:
+    """Picks the purchase of the card with the most prestige points
+    if any purchase is legal, else a uniformly random legal move."""
+    legal = game.legal_action_mask().nonzero()[0].tolist()
+    purchases = [action_index for action_index in legal
+                 if action_index >= PURCHASE_TABLE_OFFSET]
+    if not purchases:
+        return game.rng.choice(legal)
+    cards = game.cards.get_all_cards_on_tables()
+    return max(purchases, key=lambda action_index: game.possible_actions
+               .decode_action(action_index, game.current_player, cards)
+               .card.prestige_points)
+
+
+# The agents by name, as factories, so an agent is only built when it
+# plays (with its own state for each player)
+AGENTS: dict[str, Callable[[], Agent]] = {
+    'random': lambda: random_agent, 'greedy': lambda: greedy_agent,
+    'mcts': lambda: MCTSAgent(iterations=200),
+    'ismcts': lambda: ISMCTSAgent(iterations=200),
+    'alphabeta': lambda: AlphaBetaAgent(max_depth=3, time_limit=None),
+    # (Searches on all of the CPUs, so play its games with a single worker)
+    'mcts-root': lambda: RootParallelMCTSAgent(MCTSAgent(iterations=200))}
+
+
+@dataclass(slots=True, frozen=True)
+class GameRecord:
+    """The compact result of a single played game.
+
+    Parameters
+    ----------
+    game_idx : int
+        The index of the game in the run.
+    seed : int
+        The seed the game was played with.
+    winner : Optional[int]
+        The index of the winning player (None if the game didn't finish,
+        because it reached the turn limit or a player had no legal moves).
+    turns : int
+        The number of full turns played.
+    final_points : tuple[int, ...]
+        The prestige points of each player at the end of the game.
+    moves : bytes
+        The action index of every move made, in order.
+    """
+    game_idx: int
+    seed: int
+    winner: Optional[int]
+    turns: int
+    final_points: tuple[int, ...]
+    moves: bytes
+
+    def to_json(self) -> str:
+        record = asdict(self)
+        record['moves'] = list(self.moves)
+        return json.dumps(record)
+
+
+def play_game(game_idx: int, agents: Sequence[Agent], seed: int = 0,
+              max_turns: int = 100) -> GameRecord:
+    """Plays a single game where the i-th player is controlled by the
+    i-th agent, and returns its record.
+    (The game is reproducible from its seed & moves.)"""
+    game = Game(players=[Player(f'player_{i + 1}')
+                         for i in range(len(agents))], seed=seed)
+    game.initialize()
+    moves = bytearray()
+    while (game.meta_data.state == GameState.IN_PROGRESS and
+           game.meta_data.turns_played < max_turns):
+        if not game.legal_action_mask().any():
+            break
+        action_index = agents[game.current_player_idx](game)
+        game.step(action_index)
+        moves.append(action_index)
+    winner = (game.players.index(game.get_winner())
+              if game.meta_data.state == GameState.FINISHED else None)
+    return GameRecord(game_idx=game_idx, seed=seed, winner=winner,
+                      turns=game.meta_data.turns_played,
+                      final_points=tuple(player.prestige_points
+                                         for player in game.players),
+                      moves=bytes(moves))
+
+
+def _play_game_task(task: tuple[int, int], agents: Sequence[Agent],
+                    max_turns: int) -> GameRecord:
+    game_idx, seed = task
+    return play_game(game_idx, agents, seed=seed, max_turns=max_turns)
+
+
+def run_selfplay(num_games: int, agents: Sequence[Union[Agent, str]],
+                 seed: int = 0, max_turns: int = 100,
+                 workers: Optional[int] = None,
+                 chunksize: int = 16) -> Iterator[GameRecord]:
+    """Plays the games across a pool of worker processes and yields their
+    records in the order of the games (waiting for the earlier games to be
+    finished).
+
+    Parameters
+    ----------
+    num_games : int
+        The number of games to play.
+    agents : Sequence[Union[Agent, str]]
+        The agent (or its name in AGENTS) of each player.
+    seed : int
+        The seed of the run (game i is played with seed + i).
+    max_turns : int
+        The maximum number of turns a game can last.
+    workers : Optional[int]
+        The number of worker processes (default is the number of CPUs,
+        1 plays the games in the current process).
+    chunksize : int
+        The number of games sent to a worker at a time.
+    """
+    agents = [AGENTS[agent]() if isinstance(agent, str) else agent
+              for agent in agents]
+    if not Game._MIN_PLAYERS <= len(agents) <= Game._MAX_PLAYERS:
+        raise ValueError(f"Games can't be played by {len(agents)} agents")
+    tasks = [(game_idx, seed + game_idx) for game_idx in range(num_games)]
+    play_task = partial(_play_game_task, agents=agents, max_turns=max_turns)
+    if workers == 1:
+        yield from map(play_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(play_task, tasks, chunksize=chunksize)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Play games between agents across worker processes.")
+    parser.add_argument('--games', type=int, default=100,
+                        help="number of games to play")
+    parser.add_argument('--agents', nargs='+', choices=sorted(AGENTS),
+                        default=['random', 'random'],
+                        help="agent of each player (2 to 4 agents)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="number of worker processes (default: all CPUs)")
+    parser.add_argument('--chunksize', type=int, default=16,
+                        help="number of games sent to a worker at a time")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="seed of the first game")
+    parser.add_argument('--max-turns', type=int, default=100,
+                        help="maximum number of turns in a game")
+    parser.add_argument('--output', default=None,
+                        help="file to write the game records to (JSON lines)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
+    wins = [0] * len(args.agents)
+    num_unfinished = total_turns = 0
+    start = perf_counter()
+    with (open(args.output, 'w') if args.output else nullcontext()) as output:
+        for record in run_selfplay(args.games, args.agents, seed=args.seed,
+                                   max_turns=args.max_turns,
+                                   workers=args.workers,
+                                   chunksize=args.chunksize):
+            if record.winner is None:
+                num_unfinished += 1
+            else:
+                wins[record.winner] += 1
+            total_turns += record.turns
+            if output:
+                output.write(record.to_json() + '\n')
+    duration = perf_counter() - start
+    print(f"Played {args.games} games in {duration:.1f}s "
+          f"({args.games / duration:.1f} games/s)")
+    for player_idx, (agent, num_wins) in enumerate(zip(args.agents, wins)):
+        print(f"player_{player_idx + 1} ({agent}): {num_wins} wins "
+              f"({num_wins / max(args.games, 1):.1%})")
+    print(f"Unfinished games: {num_unfinished}")
+    print(f"Average turns: {total_turns / max(args.games, 1):.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""A fixed-capacity transposition table of searched game states.
+
+Entries are keyed by the 64-bit hash of the game state (see
+Game.zobrist_hash), so a position reached by different move orders is
+only searched once.
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+
+# The kind of bound of a stored value (alpha-beta searches store the values
+# that failed low as upper bounds & the ones that failed high as lower
+# bounds)
+EXACT: int = 0
+LOWER_BOUND: int = 1
+UPPER_BOUND: int = 2
+# The depth of empty slots
+EMPTY: int = -1
+# The largest age of a search (the ages are restarted after it)
+MAX_AGE: int = np.iinfo(np.uint8).max
+# The number of bytes of an entry (key, depth, value, best action, bound &
+# age)
+ENTRY_BYTES: int = 8 + 2 + 8 + 1 + 1 + 1
+
+
+@dataclass(slots=True, frozen=True)
+class TranspositionEntry:
+    """A stored search result of a game state."""
+    depth: int
+    value: float
+    best_action: int
+    bound: int = EXACT
+
+
+@dataclass(slots=True)
+class TranspositionTable:
+    """A hash table of a fixed number of entries (stored in NumPy arrays),
+    with open addressing.
+
+    A key can be stored in any of the probe_limit slots after its home
+    slot (key modulo capacity). When they are all taken by other keys,
+    the new entry replaces the least valuable of them, i.e. the shallowest
+    entry of an older search (see new_search), else the shallowest entry
+    if it isn't deeper than the new one.
+
+    Parameters
+    ----------
+    capacity : int
+        The number of entries (rounded up to a power of 2).
+    probe_limit : int
+        The number of slots a key can be stored in.
+    """
+    capacity: int = 1 << 20
+    probe_limit: int = 4
+    keys: np.ndarray = field(init=False, repr=False)
+    depths: np.ndarray = field(init=False, repr=False)
+    values: np.ndarray = field(init=False, repr=False)
+    best_actions: np.ndarray = field(init=False, repr=False)
+    bounds: np.ndarray = field(init=False, repr=False)
+    ages: np.ndarray = field(init=False, repr=False)
+    # The age of the current search
+    age: int = field(default=0, init=False)
+    # Counts of the probes that found their key & of all of the probes
+    hits: int = field(default=0, init=False)
+    probes: int = field(default=0, init=False)
+    _mask: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.capacity < 1 or self.probe_limit < 1:
+            raise ValueError("The table needs a positive capacity & probe "
+                             "limit")
+        self.capacity = 1 << (self.capacity - 1).bit_length()
+        self._mask = self.capacity - 1
+        # (The slots after the last home slot keep every probe window
+        # contiguous)
+        num_slots = self.capacity + self.probe_limit - 1
+        self.keys = np.zeros(num_slots, dtype=np.uint64)
+        self.depths = np.full(num_slots, EMPTY, dtype=np.int16)
+        self.values = np.zeros(num_slots, dtype=np.float64)
+        self.best_actions = np.full(num_slots, -1, dtype=np.int8)
+        self.bounds = np.zeros(num_slots, dtype=np.int8)
+        self.ages = np.zeros(num_slots, dtype=np.uint8)
+
+    @classmethod
+    def from_megabytes(cls, megabytes: float,
+                       probe_limit: int = 4) -> 'TranspositionTable':
+        """Returns the largest table that fits in the given memory."""
+        max_entries = int(megabytes * 2 ** 20 / ENTRY_BYTES) - probe_limit
+        if max_entries < 1:
+            raise ValueError(f"{megabytes} MB can't fit a table")
+        return cls(capacity=1 << (max_entries.bit_length() - 1),
+                   probe_limit=probe_limit)
+
+    @property
+    def num_entries(self) -> int:
+        return int((self.depths != EMPTY).sum())
+
+    @property
+    def nbytes(self) -> int:
+        """The memory used by the entries."""
+        return sum(array.nbytes for array in [
+            self.keys, self.depths, self.values, self.best_actions,
+            self.bounds, self.ages])
+
+    def _slot(self, key: int) -> int:
+        """Returns the slot of the key (-1 if it isn't stored)."""
+        start = key & self._mask
+        # (Python lists are faster than NumPy for a few slots)
+        window_keys = self.keys[start:start + self.probe_limit].tolist()
+        if key not in window_keys:
+            return -1
+        depths = self.depths[start:start + self.probe_limit].tolist()
+        for offset, (slot_key, depth) in enumerate(zip(window_keys, depths)):
+            if slot_key == key and depth != EMPTY:
+                return start + offset
+        return -1
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        """Returns the entry of the key, if it is stored."""
+        self.probes += 1
+        slot = self._slot(key)
+        if slot < 0:
+            return None
+        self.hits += 1
+        return TranspositionEntry(depth=self.depths.item(slot),
+                                  value=self.values.item(slot),
+                                  best_action=self.best_actions.item(slot),
+                                  bound=self.bounds.item(slot))
+
+    def store(self, key: int, depth: int, value: float,
+              best_action: int = -1, bound: int = EXACT) -> bool:
+        """Stores the search result of the key & returns whether it was
+        stored (see the replacement scheme of the table).
+        (The result of a key that is already stored is replaced unless it
+        is from the current search & deeper.)"""
+        slot = self._slot(key)
+        if slot >= 0:
+            if self.ages[slot] == self.age and self.depths[slot] > depth:
+                return False
+        else:
+            start = key & self._mask
+            window = slice(start, start + self.probe_limit)
+            depths = self.depths[window]
+            empty = (depths == EMPTY).nonzero()[0]
+            if len(empty):
+                slot = start + int(empty[0])
+            else:
+                old = self.ages[window] != self.age
+                # The shallowest entry, preferring the older searches
+                slot = start + int(np.lexsort((depths, ~old))[0])
+                if not old[slot - start] and self.depths[slot] > depth:
+                    return False
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.values[slot] = value
+        self.best_actions[slot] = best_action
+        self.bounds[slot] = bound
+        self.ages[slot] = self.age
+        return True
+
+    def new_search(self) -> None:
+        """Starts a new search, so the entries of the previous searches are
+        replaced first."""
+        self.age += 1
+        if self.age > MAX_AGE:
+            # (Instead of wrapping around, which would make the entries of
+            # older searches current again, all of the entries become
+            # older than the new search)
+            self.ages.fill(0)
+            self.age = 1
+
+    def clear(self) -> None:
+        """Removes all of the entries."""
+        self.depths.fill(EMPTY)
+        self.age = self.hits = self.probes = 0
@@ -0,0 +1,42 @@
+"""Benchmark of the steps per second of SplendorAECEnv with agents that
+pick uniformly random legal actions from the observed action masks.
+
+Run from the main directory of the project:
+    python -m benchmarks.bench_aec_env
+"""
+from time import perf_counter
+import numpy as np
+from game_base.aec_env import SplendorAECEnv
+
+
+def env_steps_per_second(num_steps: int = 20000, num_players: int = 4,
+                         dense: bool = True, seed: int = 0) -> float:
+    rng = np.random.default_rng(seed)
+    env = SplendorAECEnv(num_players=num_players, dense=dense)
+    env.reset(seed=seed)
+    start = perf_counter()
+    for _ in range(num_steps):
+        if not env.agents:
+            env.reset(seed=int(rng.integers(2 ** 32)))
+        observation, reward, termination, truncation, info = env.last()
+        if termination or truncation:
+            action = None
+        else:
+            action = int(rng.choice(np.flatnonzero(
+                observation['action_mask'])))
+        env.step(action)
+    return num_steps / (perf_counter() - start)
+
+
+def main() -> None:
+    for num_players in [2, 4]:
+        for dense in [True, False]:
+            layout = 'dense' if dense else 'sparse'
+            steps_per_second = env_steps_per_second(num_players=num_players,
+                                                    dense=dense)
+            print(f"{num_players} players, {layout:6} observations: "
+                  f"{steps_per_second:10,.0f} steps/s")
+
+
+if __name__ == '__main__':
+    main()
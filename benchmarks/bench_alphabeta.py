@@ -0,0 +1,36 @@
+"""Benchmark of AlphaBetaAgent with a fixed think time per move: the depth
+reached, nodes per second & the rate of cutoffs by the first searched move
+(the quality of the move ordering), with & without a transposition table.
+
+Run from the main directory of the project:
+    python -m benchmarks.bench_alphabeta
+"""
+from agents.alphabeta import AlphaBetaAgent
+from benchmarks.bench_mcts import positions_for_benchmark
+
+
+def main(time_limit: float = 1.0) -> None:
+    for num_players in [2, 3, 4]:
+        positions = positions_for_benchmark(num_players=num_players)
+        for use_transpositions in [True, False]:
+            agent = (AlphaBetaAgent(time_limit=time_limit)
+                     if use_transpositions else
+                     AlphaBetaAgent(time_limit=time_limit,
+                                    transpositions=None))
+            depth = nodes = seconds = cutoffs = first_move_cutoffs = 0
+            for game in positions:
+                agent(game)
+                depth += agent.stats.depth
+                nodes += agent.stats.nodes
+                seconds += agent.stats.seconds
+                cutoffs += agent.stats.cutoffs
+                first_move_cutoffs += agent.stats.first_move_cutoffs
+            print(f"{num_players} players, "
+                  f"{'with' if use_transpositions else 'without':>7} "
+                  f"transpositions: depth {depth / len(positions):4.1f}, "
+                  f"{nodes / seconds:8,.0f} nodes/s, first move cutoffs "
+                  f"{first_move_cutoffs / max(cutoffs, 1):6.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark of the environment steps per second of BatchedGames against
+stepping the Game objects one by one, with uniformly random legal moves.
+
+Run from the main directory of the project:
+    python -m benchmarks.bench_batched_games
+"""
+from time import perf_counter
+import numpy as np
+from game_base.games import Game, GameState
+from game_base.players import Player
+from game_base.batched_games import BatchedGames
+
+
+def random_legal_actions(mask: np.ndarray,
+                         rng: np.random.Generator) -> np.ndarray:
+    """Picks a uniformly random legal action index for every row of the
+    mask. (Rows without legal actions get index 0.)"""
+    return (rng.random(mask.shape) * mask).argmax(axis=1)
+
+
+def game_steps_per_second(num_steps: int = 5000, num_players: int = 4,
+                          seed: int = 0) -> float:
+    players = [Player(f'player_{i + 1}') for i in range(num_players)]
+    game = Game(players=players, seed=seed)
+    game.initialize()
+    start = perf_counter()
+    for _ in range(num_steps):
+        mask = game.legal_action_mask()
+        if game.meta_data.state != GameState.IN_PROGRESS or not mask.any():
+            game = Game(players=[Player(player.id) for player in players],
+                        seed=game.rng.getrandbits(32))
+            game.initialize()
+            mask = game.legal_action_mask()
+        game.step(game.rng.choice(mask.nonzero()[0].tolist()))
+    return num_steps / (perf_counter() - start)
+
+
+def batched_steps_per_second(num_games: int, num_calls: int = 200,
+                             num_players: int = 4, seed: int = 0) -> float:
+    rng = np.random.default_rng(seed)
+    batch = BatchedGames(num_games, num_players, seed=seed)
+    start = perf_counter()
+    for _ in range(num_calls):
+        mask = batch.legal_action_mask()
+        # Restart the finished games & the ones without legal moves
+        done = ~mask.any(axis=1)
+        if done.any():
+            batch.reset(np.flatnonzero(done))
+            mask = batch.legal_action_mask()
+        batch.step(random_legal_actions(mask, rng))
+    return num_games * num_calls / (perf_counter() - start)
+
+
+def main() -> None:
+    print(f"Game           : {game_steps_per_second():12,.0f} steps/s")
+    for num_games in [1, 100, 1000, 10000]:
+        print(f"BatchedGames({num_games:>5}): "
+              f"{batched_steps_per_second(num_games):12,.0f} steps/s")
+
+
+if __name__ == '__main__':
+    main()
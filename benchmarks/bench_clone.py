@@ -0,0 +1,37 @@
+"""Benchmark of Game.clone() against copy.deepcopy() for branching a game.
+
+Run from the main directory of the project:
+    python -m benchmarks.bench_clone
+"""
+from copy import deepcopy
+from timeit import timeit
+from game_base.games import Game
+from game_base.players import Player
+
+
+def mid_game_for_benchmark(num_players: int = 4, num_moves: int = 20,
+                           seed: int = 0) -> Game:
+    """Creates a game with the given number of random legal moves made."""
+    game = Game(players=[Player(f'player_{i + 1}')
+                         for i in range(num_players)], seed=seed)
+    game.initialize()
+    for _ in range(num_moves):
+        legal_actions = game.possible_actions.legal_actions(
+            game.current_player, game.bank,
+            game.cards.get_all_cards_on_tables())
+        game.make_move_for_current_player(game.rng.choice(legal_actions))
+    return game
+
+
+def main(number: int = 2000) -> None:
+    game = mid_game_for_benchmark()
+    assert game.clone() == game
+    time_deepcopy = timeit(lambda: deepcopy(game), number=number)
+    time_clone = timeit(game.clone, number=number)
+    print(f"copy.deepcopy: {time_deepcopy / number * 1e6:8.1f} us/copy")
+    print(f"Game.clone   : {time_clone / number * 1e6:8.1f} us/copy")
+    print(f"Speedup      : {time_deepcopy / time_clone:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""Benchmark of the legal action masks computed from scratch for every move
+against the masks maintained incrementally (Game.track_legal_actions),
+in random playouts.
+
+Run from the main directory of the project:
+    python -m benchmarks.bench_legal_actions
+"""
+from time import perf_counter
+from game_base.games import Game, GameState
+from game_base.players import Player
+
+
+def moves_per_second(incremental: bool, num_moves: int = 20000,
+                     num_players: int = 4, seed: int = 0) -> float:
+    players = [Player(f'player_{i + 1}') for i in range(num_players)]
+    game = Game(players=players, seed=seed)
+    game.track_legal_actions(incremental)
+    game.initialize()
+    start = perf_counter()
+    for _ in range(num_moves):
+        mask = game.legal_action_mask()
+        if game.meta_data.state != GameState.IN_PROGRESS or not mask.any():
+            game.reset()
+            mask = game.legal_action_mask()
+        game.step(game.rng.choice(mask.nonzero()[0].tolist()))
+    return num_moves / (perf_counter() - start)
+
+
+def main() -> None:
+    print(f"Full        : {moves_per_second(False):10,.0f} moves/s")
+    print(f"Incremental : {moves_per_second(True):10,.0f} moves/s")
+
+
+if __name__ == '__main__':
+    main()
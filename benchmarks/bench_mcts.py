@@ -0,0 +1,48 @@
+"""Benchmark of the search speed of MCTSAgent & ISMCTSAgent (nodes &
+iterations per second) with a fixed think time per move, on positions from
+random games.
+
+Run from the main directory of the project:
+    python -m benchmarks.bench_mcts
+"""
+from game_base.games import Game
+from game_base.players import Player
+from agents.mcts import MCTSAgent
+from agents.ismcts import ISMCTSAgent
+
+
+def positions_for_benchmark(num_positions: int = 5, num_players: int = 2,
+                            num_moves: int = 10) -> list[Game]:
+    """Creates games with the given number of random legal moves made."""
+    positions = []
+    for seed in range(num_positions):
+        game = Game(players=[Player(f'player_{i + 1}')
+                             for i in range(num_players)], seed=seed)
+        game.initialize()
+        for _ in range(num_moves):
+            game.step(game.rng.choice(
+                game.legal_action_mask().nonzero()[0].tolist()))
+        positions.append(game)
+    return positions
+
+
+def main(time_limit: float = 1.0) -> None:
+    positions = positions_for_benchmark()
+    for agent_type, rollout_policy in [(MCTSAgent, 'random'),
+                                       (MCTSAgent, 'greedy'),
+                                       (ISMCTSAgent, 'random')]:
+        agent = agent_type(iterations=None, time_limit=time_limit,
+                           rollout_policy=rollout_policy)
+        nodes = iterations = seconds = 0
+        for game in positions:
+            agent(game)
+            nodes += agent.stats.nodes
+            iterations += agent.stats.iterations
+            seconds += agent.stats.seconds
+        print(f"{agent_type.__name__:>11}, {rollout_policy:>6} rollouts: "
+              f"{nodes / seconds:10,.0f} "
+              f"nodes/s, {iterations / seconds:8,.0f} iterations/s")
+
+
+if __name__ == '__main__':
+    main()
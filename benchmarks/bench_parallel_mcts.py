@@ -0,0 +1,61 @@
+"""Benchmark of the scaling of root-parallel & leaf-parallel MCTS from 1 to
+all of the CPUs, with a fixed think time per move on a fixed set of
+positions (see benchmarks.bench_mcts).
+
+Run from the main directory of the project:
+    python -m benchmarks.bench_parallel_mcts
+"""
+import os
+from agents.mcts import MCTSAgent
+from agents.parallel_mcts import (RootParallelMCTSAgent,
+                                  LeafParallelMCTSAgent, WorkerPool)
+from benchmarks.bench_mcts import positions_for_benchmark
+
+
+def worker_counts(max_workers: int) -> list[int]:
+    """Returns the powers of 2 up to the maximum number of workers (and the
+    maximum itself)."""
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    return counts
+
+
+def rollouts_per_second(agent, positions) -> float:
+    """Returns the number of rollouts per second of the agent's searches
+    of the positions."""
+    # Starts the worker processes
+    agent(positions[0])
+    rollouts = seconds = 0
+    for game in positions:
+        agent(game)
+        rollouts += agent.stats.iterations * getattr(
+            agent, 'rollouts_per_leaf', 1)
+        seconds += agent.stats.seconds
+    return rollouts / seconds
+
+
+def main(time_limit: float = 1.0) -> None:
+    positions = positions_for_benchmark()
+    for name, make_agent in [
+            ('root', lambda workers: RootParallelMCTSAgent(
+                MCTSAgent(iterations=None, time_limit=time_limit),
+                pool=WorkerPool(workers))),
+            ('leaf', lambda workers: LeafParallelMCTSAgent(
+                iterations=None, time_limit=time_limit,
+                rollouts_per_leaf=workers, pool=WorkerPool(workers)))]:
+        baseline = None
+        for workers in worker_counts(os.cpu_count() or 1):
+            agent = make_agent(workers)
+            speed = rollouts_per_second(agent, positions)
+            agent.close()
+            baseline = baseline or speed
+            print(f"{name} parallel, {workers:3} workers: {speed:10,.0f} "
+                  f"rollouts/s (speedup {speed / baseline:5.2f}, "
+                  f"efficiency {speed / baseline / workers:6.1%})")
+
+
+if __name__ == '__main__':
+    main()
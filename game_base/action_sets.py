@@ -1,13 +1,16 @@
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from itertools import combinations
+from typing import Hashable, Optional
+import numpy as np
 from game_base.actions import (Action, ReserveCard, PurchaseCard,
                      Reserve2SameColorTokens,
                      Reserve3UniqueColorTokens)
 from game_base.players import Player
 from game_base.banks import Bank
-from game_base.cards import Card
-from game_base.tokens import Token
+from game_base.cards import Card, CardRegistry
+from game_base.tokens import Token, NUM_TOKEN_COLORS
+from game_base.tables import STANDARD_CARDS
 
 
 @dataclass
@@ -24,6 +27,26 @@ class ActionSet(ABC):
         """Abstract method for checking all legal actions for a player."""
         pass
 
+    @abstractmethod
+    def legal_action_mask(self, player: Player, **kwargs) -> np.ndarray:
+        """Abstract method for checking all legal actions for a player
+        as a boolean mask over the fixed action space."""
+        pass
+
+    @abstractmethod
+    def decode_action(self, action_index: int, player: Player,
+                      **kwargs) -> Optional[Action]:
+        """Abstract method for getting the action with the given index
+        in the fixed action space."""
+        pass
+
+    @abstractmethod
+    def encode_action(self, action: Action, player: Player,
+                      **kwargs) -> int:
+        """Abstract method for getting the index of the given action
+        in the fixed action space."""
+        pass
+
 
 def generate_3_unique_token_actions() -> list[Action]:
     """Creates a list of all possible 3 unique color token actions."""
@@ -43,22 +66,145 @@ def generate_standard_token_actions() -> list[Action]:
     return generate_3_unique_token_actions() + generate_2_same_token_actions()
 
 
+def token_action_key(action: Action) -> Hashable:
+    """Returns a key that is the same for all equivalent token actions.
+    (The order of the colors of Reserve3UniqueColorTokens doesn't matter.)"""
+    match action:
+        case Reserve3UniqueColorTokens(colors=colors):
+            return (Reserve3UniqueColorTokens, frozenset(colors))
+        case Reserve2SameColorTokens(color=color):
+            return (Reserve2SameColorTokens, color)
+        case _:
+            raise ValueError(f"{action} is not a token action.")
+
+
+# %% Fixed action space of the standard actions
+# [0, 15)  : token actions (in the order of generate_standard_token_actions)
+# [15, 27) : reserve the card in a table slot (level 1 slots first)
+# [27, 39) : purchase the card in a table slot
+# [39, 42) : purchase the card in a reserved card slot of the player
+NUM_TOKEN_ACTIONS: int = 15
+NUM_TABLE_SLOTS: int = 12
+NUM_RESERVED_SLOTS: int = 3
+RESERVE_TABLE_OFFSET: int = NUM_TOKEN_ACTIONS
+PURCHASE_TABLE_OFFSET: int = RESERVE_TABLE_OFFSET + NUM_TABLE_SLOTS
+PURCHASE_RESERVED_OFFSET: int = PURCHASE_TABLE_OFFSET + NUM_TABLE_SLOTS
+ACTION_SPACE_SIZE: int = PURCHASE_RESERVED_OFFSET + NUM_RESERVED_SLOTS
+# Maximum number of tokens a player can have after a token action
+MAX_PLAYER_TOKENS: int = 10
+
+
+def token_action_matrices() -> tuple[np.ndarray, np.ndarray]:
+    """Creates the matrices (num. token actions x num. colors) of the
+    amount of tokens each standard token action takes from the bank,
+    and of the amount the bank needs to hold for the action to be possible.
+    (Taking 2 same color tokens requires at least 4 tokens of that color.)"""
+    amounts = np.zeros((NUM_TOKEN_ACTIONS, NUM_TOKEN_COLORS), dtype=np.int64)
+    for action_index, action in enumerate(generate_standard_token_actions()):
+        match action:
+            case Reserve3UniqueColorTokens(colors=colors):
+                for color in colors:
+                    amounts[action_index, color.ordinal] = 1
+            case Reserve2SameColorTokens(color=color):
+                amounts[action_index, color.ordinal] = 2
+    bank_minimums = np.where(amounts == 2, 4, amounts)
+    return amounts, bank_minimums
+
+
+TOKEN_ACTION_AMOUNTS, TOKEN_ACTION_BANK_MINIMUMS = token_action_matrices()
+TOKEN_ACTION_SIZES: np.ndarray = TOKEN_ACTION_AMOUNTS.sum(axis=1)
+# The tokens each standard token action moves from the bank to the player
+# without the (never taken) wildcards (num. token actions x num. colors - 1)
+TOKEN_ACTION_DELTAS: np.ndarray = TOKEN_ACTION_AMOUNTS[
+    :, :NUM_TOKEN_COLORS - 1].astype(np.int16)
+TOKEN_ACTION_DELTAS.setflags(write=False)
+# Cost row used for empty card slots
+_EMPTY_SLOT_COST: list[int] = [0] * NUM_TOKEN_COLORS
+# The card action index (from RESERVE_TABLE_OFFSET onwards) ->
+# (action type, whether the slot is a reserved card slot, slot index)
+CARD_SLOT_ACTIONS: tuple[tuple[type[Action], bool, int], ...] = (
+    tuple((ReserveCard, False, slot) for slot in range(NUM_TABLE_SLOTS)) +
+    tuple((PurchaseCard, False, slot) for slot in range(NUM_TABLE_SLOTS)) +
+    tuple((PurchaseCard, True, slot) for slot in range(NUM_RESERVED_SLOTS)))
+
+
+@dataclass(slots=True)
+class CardActionPool:
+    """Preallocated ReserveCard & PurchaseCard actions of every card in a
+    card set, so that building action lists allocates no actions.
+    (The actions are frozen, so sharing them is safe.)
+
+    Parameters
+    ----------
+    registry : CardRegistry
+        The card set (the actions are indexed by the card indices).
+    """
+    registry: CardRegistry
+    reserve_actions: tuple[ReserveCard, ...] = field(init=False, repr=False)
+    purchase_actions: tuple[PurchaseCard, ...] = field(init=False,
+                                                       repr=False)
+    # Card -> card index (cards are interned & hashed by identity)
+    _indices: dict[Card, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.reserve_actions = tuple(ReserveCard(card)
+                                     for card in self.registry.cards)
+        self.purchase_actions = tuple(PurchaseCard(card)
+                                      for card in self.registry.cards)
+        self._indices = {card: card_index for card_index, card
+                         in enumerate(self.registry.cards)}
+
+    def reserve(self, card: Card) -> ReserveCard:
+        """Returns the action reserving the given card.
+        (Cards outside of the card set get a new action.)"""
+        card_index = self._indices.get(card)
+        return (ReserveCard(card) if card_index is None
+                else self.reserve_actions[card_index])
+
+    def purchase(self, card: Card) -> PurchaseCard:
+        """Returns the action purchasing the given card.
+        (Cards outside of the card set get a new action.)"""
+        card_index = self._indices.get(card)
+        return (PurchaseCard(card) if card_index is None
+                else self.purchase_actions[card_index])
+
+
+# The card actions of the standard cards (shared by all action sets)
+STANDARD_CARD_ACTIONS: CardActionPool = CardActionPool(STANDARD_CARDS)
+
+
 @dataclass(slots=True)
 class StandardActionSet(ActionSet):
     """All standard game actions."""
     # List of possible actions with tokens (immutable during entire game)
     token_actions: list[Action] = field(
         default_factory=generate_standard_token_actions)
+    # The preallocated card actions
+    card_actions: CardActionPool = field(
+        default_factory=lambda: STANDARD_CARD_ACTIONS, repr=False)
+    # Token action key -> index in the fixed action space
+    token_action_indices: dict[Hashable, int] = field(init=False,
+                                                      repr=False)
+
+    def __post_init__(self) -> None:
+        self.token_action_indices = {token_action_key(action): action_index
+                                     for action_index, action
+                                     in enumerate(self.token_actions)}
 
     def possible_card_actions(self, player: Player,
                               cards: list[Card]) -> list[Action]:
-        """Creates a list of actions for all available cards."""
-        reserve_cards = [ReserveCard(card) for card in cards]
+        """Creates a list of actions for all available cards.
+        (Empty table & reserved card slots are skipped.)"""
+        reserve = self.card_actions.reserve
+        purchase = self.card_actions.purchase
+        reserve_cards = [reserve(card) for card in cards
+                         if card is not None]
         # Add all of the cards on the tables.
-        purchase_cards = [PurchaseCard(card) for card in cards]
+        purchase_cards = [purchase(card) for card in cards
+                          if card is not None]
         # Add the already reserved cards in the player's inventory
-        purchase_cards += [PurchaseCard(card) for
-                           card in player.cards_reserved]
+        purchase_cards += [purchase(card) for
+                           card in player.cards_reserved if card is not None]
         return reserve_cards + purchase_cards
 
     def possible_actions(self, player: Player,
@@ -71,3 +217,297 @@ class StandardActionSet(ActionSet):
         """Returns all legal actions for the given player."""
         return [action for action in self.possible_actions(player, cards)
                 if action.can_perform(player=player, bank=bank)]
+
+    def decode_action(self, action_index: int, player: Player,
+                      cards: list[Card]) -> Optional[Action]:
+        """Returns the action with the given index in the fixed action space
+        for the given player & cards on the tables.
+        (Returns None if the card slot of the action is empty.)"""
+        if not 0 <= action_index < ACTION_SPACE_SIZE:
+            raise IndexError(f"Action index {action_index} is outside of "
+                             f"the action space [0, {ACTION_SPACE_SIZE})")
+        if action_index < NUM_TOKEN_ACTIONS:
+            return self.token_actions[action_index]
+        action_type, is_reserved_slot, slot = CARD_SLOT_ACTIONS[
+            action_index - RESERVE_TABLE_OFFSET]
+        card = player.cards_reserved[slot] if is_reserved_slot else cards[slot]
+        if card is None:
+            return None
+        return (self.card_actions.reserve(card) if action_type is ReserveCard
+                else self.card_actions.purchase(card))
+
+    def encode_action(self, action: Action, player: Player,
+                      cards: list[Card]) -> int:
+        """Returns the index of the given action in the fixed action space
+        for the given player & cards on the tables."""
+        match action:
+            case ReserveCard(card=None) | PurchaseCard(card=None):
+                raise ValueError("A card action without a card is not in "
+                                 "the action space.")
+            case ReserveCard(card=card) if card in cards:
+                return RESERVE_TABLE_OFFSET + cards.index(card)
+            case PurchaseCard(card=card) if card in cards:
+                return PURCHASE_TABLE_OFFSET + cards.index(card)
+            case PurchaseCard(card=card) if card in player.cards_reserved:
+                return (PURCHASE_RESERVED_OFFSET +
+                        player.cards_reserved.index(card))
+            case ReserveCard() | PurchaseCard():
+                raise ValueError(f"The card of the action '{action}' is not "
+                                 "in a card slot of the action space.")
+            case _:
+                return self.token_action_indices[token_action_key(action)]
+
+    def legal_action_mask(self, player: Player, bank: Bank,
+                          cards: list[Card],
+                          out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns a boolean mask of the legal actions for the given player
+        over the fixed action space, computed with array operations.
+        (Equivalent to encoding all of the legal_actions.)
+        The mask is written into out if it is given."""
+        mask = np.zeros(ACTION_SPACE_SIZE, dtype=bool) if out is None else out
+        bank_tokens = np.array(bank.token_available.counts)
+        player_tokens = player.token_reserved.counts
+        # The bank holds enough tokens & the player won't have too many
+        mask[:NUM_TOKEN_ACTIONS] = (
+            ~(TOKEN_ACTION_BANK_MINIMUMS > bank_tokens).any(axis=1) &
+            (sum(player_tokens) + TOKEN_ACTION_SIZES <= MAX_PLAYER_TOKENS))
+        # Costs of the table slots followed by the player's reserved slots
+        slot_cards = [*cards, *player.cards_reserved]
+        occupied = np.array([card is not None for card in slot_cards])
+        costs = []
+        for card in slot_cards:
+            costs.extend(_EMPTY_SLOT_COST if card is None
+                         else card.token_cost.counts)
+        buying_power = np.add(player.bonus_owned.counts, player_tokens)
+        # Costs that aren't covered by bonuses & tokens need wildcards
+        shortfalls = np.maximum(
+            np.reshape(costs, (len(slot_cards), NUM_TOKEN_COLORS)) -
+            buying_power, 0)
+        affordable = (shortfalls.sum(axis=1) <=
+                      player_tokens[Token.YELLOW.ordinal]) & occupied
+        mask[RESERVE_TABLE_OFFSET:PURCHASE_TABLE_OFFSET] = (
+            occupied[:NUM_TABLE_SLOTS] & (player.num_reserved_cards <
+                                          NUM_RESERVED_SLOTS))
+        mask[PURCHASE_TABLE_OFFSET:PURCHASE_RESERVED_OFFSET] = (
+            affordable[:NUM_TABLE_SLOTS])
+        mask[PURCHASE_RESERVED_OFFSET:] = affordable[NUM_TABLE_SLOTS:]
+        return mask
+
+
+
+# The (color index, minimum amount) the bank needs to hold for each token
+# action & the token actions taking each color
+_TOKEN_ACTION_REQUIREMENTS: tuple[tuple[tuple[int, int], ...], ...] = tuple(
+    tuple((int(color_idx), int(minimums[color_idx]))
+          for color_idx in np.flatnonzero(minimums))
+    for minimums in TOKEN_ACTION_BANK_MINIMUMS)
+_TOKEN_ACTIONS_BY_COLOR: tuple[tuple[int, ...], ...] = tuple(
+    tuple(int(action_index)
+          for action_index in np.flatnonzero(TOKEN_ACTION_AMOUNTS[:, color]))
+    for color in range(NUM_TOKEN_COLORS))
+# Whether each token action fits in the number of free token places
+# (free places -> mask of the token actions)
+_TOKEN_ACTIONS_FITTING: tuple[np.ndarray, ...] = tuple(
+    TOKEN_ACTION_SIZES <= free_places
+    for free_places in range(MAX_PLAYER_TOKENS + 1))
+# Card -> the (color index, amount) of its non-zero costs
+_COST_PAIRS: dict[Card, tuple[tuple[int, int], ...]] = {}
+
+
+def _cost_pairs(card: Optional[Card]) -> Optional[tuple[tuple[int, int],
+                                                          ...]]:
+    if card is None:
+        return None
+    pairs = _COST_PAIRS.get(card)
+    if pairs is None:
+        pairs = tuple((color_idx, amount) for color_idx, amount
+                      in enumerate(card.token_cost.counts) if amount)
+        _COST_PAIRS[card] = pairs
+    return pairs
+
+
+def _affordable(costs: list[Optional[tuple[tuple[int, int], ...]]],
+                power: list[int], wildcards: int) -> list[bool]:
+    """Whether cards with the given costs (see _cost_pairs) can be
+    purchased, with wildcards for the costs that bonuses & tokens
+    (power) don't cover."""
+    affordable = []
+    for pairs in costs:
+        if pairs is None:
+            affordable.append(False)
+            continue
+        shortfall = 0
+        for color_idx, amount in pairs:
+            owned = power[color_idx]
+            if amount > owned:
+                shortfall += amount - owned
+        affordable.append(shortfall <= wildcards)
+    return affordable
+
+
+@dataclass(slots=True)
+class LegalActionCache:
+    """Keeps the legal action masks of all players over the fixed action
+    space up to date between moves, recomputing only what a move changed
+    (see StandardActionSet.legal_action_mask for the full computation):
+        - the token actions with a bank color that changed
+        - the table slot whose card was replaced (for every player)
+        - the affordability, tokens & reserved cards of the moving player
+
+    The other players' views stay cached until it is their turn.
+    Changes to the game that aren't moves aren't tracked, so the cache
+    has to be invalidated after them (it is rebuilt when next used).
+    (The updates are plain Python, as they touch too few values for
+    array operations to pay off.)
+
+    Parameters
+    ----------
+    num_players : int
+        The number of players in the game.
+    """
+    num_players: int
+    # Whether the cache has to be rebuilt before it can be used
+    dirty: bool = True
+    # The bank tokens & whether the bank holds enough for each token action
+    bank_tokens: list[int] = field(init=False, repr=False)
+    bank_allows: np.ndarray = field(init=False, repr=False)
+    # The costs of the cards in the table slots (see _cost_pairs)
+    table_costs: list[Optional[tuple[tuple[int, int], ...]]] = field(
+        init=False, repr=False)
+    table_occupied: np.ndarray = field(init=False, repr=False)
+    # The tokens + bonuses of each color, wildcards, number of tokens &
+    # number of reserved cards of each player
+    player_power: list[list[int]] = field(init=False, repr=False)
+    player_wildcards: list[int] = field(init=False, repr=False)
+    player_num_tokens: list[int] = field(init=False, repr=False)
+    player_num_reserved: list[int] = field(init=False, repr=False)
+    # Whether each player can purchase the card of each table/reserved slot
+    table_affordable: list[list[bool]] = field(init=False, repr=False)
+    reserved_affordable: list[list[bool]] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.bank_tokens = [0] * NUM_TOKEN_COLORS
+        self.bank_allows = np.zeros(NUM_TOKEN_ACTIONS, dtype=bool)
+        self.table_costs = [None] * NUM_TABLE_SLOTS
+        self.table_occupied = np.zeros(NUM_TABLE_SLOTS, dtype=bool)
+        self.player_power = [[0] * (NUM_TOKEN_COLORS - 1)
+                             for _ in range(self.num_players)]
+        self.player_wildcards = [0] * self.num_players
+        self.player_num_tokens = [0] * self.num_players
+        self.player_num_reserved = [0] * self.num_players
+        self.table_affordable = [[False] * NUM_TABLE_SLOTS
+                                 for _ in range(self.num_players)]
+        self.reserved_affordable = [[False] * NUM_RESERVED_SLOTS
+                                    for _ in range(self.num_players)]
+
+    def clone(self) -> 'LegalActionCache':
+        """Returns a copy of the cache (for a clone of the game)."""
+        cache = LegalActionCache.__new__(LegalActionCache)
+        cache.num_players = self.num_players
+        cache.dirty = self.dirty
+        cache.bank_tokens = self.bank_tokens.copy()
+        cache.bank_allows = self.bank_allows.copy()
+        cache.table_costs = self.table_costs.copy()
+        cache.table_occupied = self.table_occupied.copy()
+        cache.player_power = [power.copy() for power in self.player_power]
+        cache.player_wildcards = self.player_wildcards.copy()
+        cache.player_num_tokens = self.player_num_tokens.copy()
+        cache.player_num_reserved = self.player_num_reserved.copy()
+        cache.table_affordable = [affordable.copy()
+                                  for affordable in self.table_affordable]
+        cache.reserved_affordable = [
+            affordable.copy() for affordable in self.reserved_affordable]
+        return cache
+
+    def invalidate(self) -> None:
+        """Marks the cache to be rebuilt when it is next used."""
+        self.dirty = True
+
+    def rebuild(self, players: list[Player], bank: Bank,
+                cards: list[Card]) -> None:
+        """Computes all of the cached values from scratch."""
+        self.bank_tokens[:] = bank.token_available.counts
+        for action_index in range(NUM_TOKEN_ACTIONS):
+            self._update_bank_allows(action_index)
+        for slot, card in enumerate(cards):
+            self._set_table_slot(slot, card)
+        for player_idx, player in enumerate(players):
+            self._update_player(player_idx, player)
+        self.dirty = False
+
+    def update(self, players: list[Player], bank: Bank, cards: list[Card],
+               player_idx: int, table_slot: Optional[int] = None) -> None:
+        """Updates the cache after the move of the player with the given
+        index, that took the card from the given table slot (if any).
+        (Rebuilds the cache if it is invalid.)"""
+        if self.dirty:
+            self.rebuild(players, bank, cards)
+            return
+        # Only the token actions with a changed bank color
+        bank_tokens = bank.token_available.counts
+        if bank_tokens != self.bank_tokens:
+            for color_idx, (amount, cached_amount) in enumerate(
+                    zip(bank_tokens, self.bank_tokens)):
+                if amount != cached_amount:
+                    self.bank_tokens[color_idx] = amount
+                    for action_index in _TOKEN_ACTIONS_BY_COLOR[color_idx]:
+                        self._update_bank_allows(action_index)
+        # The replaced table card, for every other player
+        if table_slot is not None:
+            self._set_table_slot(table_slot, cards[table_slot],
+                                 skip_player_idx=player_idx)
+        # Everything that depends on the moving player's inventory
+        self._update_player(player_idx, players[player_idx])
+
+    def legal_action_mask(self, player_idx: int,
+                          out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns the (cached) boolean mask of the legal actions for the
+        player with the given index over the fixed action space.
+        (The mask is written into out if it is given.)"""
+        mask = np.zeros(ACTION_SPACE_SIZE, dtype=bool) if out is None else out
+        # The bank holds enough tokens & the player won't have too many
+        np.logical_and(self.bank_allows, _TOKEN_ACTIONS_FITTING[
+            max(MAX_PLAYER_TOKENS - self.player_num_tokens[player_idx], 0)],
+            out=mask[:NUM_TOKEN_ACTIONS])
+        if self.player_num_reserved[player_idx] < NUM_RESERVED_SLOTS:
+            mask[RESERVE_TABLE_OFFSET:PURCHASE_TABLE_OFFSET] = (
+                self.table_occupied)
+        else:
+            mask[RESERVE_TABLE_OFFSET:PURCHASE_TABLE_OFFSET] = False
+        mask[PURCHASE_TABLE_OFFSET:PURCHASE_RESERVED_OFFSET] = (
+            self.table_affordable[player_idx])
+        mask[PURCHASE_RESERVED_OFFSET:] = self.reserved_affordable[player_idx]
+        return mask
+
+    def _update_bank_allows(self, action_index: int) -> None:
+        bank_tokens = self.bank_tokens
+        self.bank_allows[action_index] = all(
+            bank_tokens[color_idx] >= minimum for color_idx, minimum
+            in _TOKEN_ACTION_REQUIREMENTS[action_index])
+
+    def _set_table_slot(self, slot: int, card: Optional[Card],
+                        skip_player_idx: Optional[int] = None) -> None:
+        costs = [_cost_pairs(card)]
+        self.table_costs[slot] = costs[0]
+        self.table_occupied[slot] = card is not None
+        for player_idx in range(self.num_players):
+            if player_idx != skip_player_idx:
+                self.table_affordable[player_idx][slot] = _affordable(
+                    costs, self.player_power[player_idx],
+                    self.player_wildcards[player_idx])[0]
+
+    def _update_player(self, player_idx: int, player: Player) -> None:
+        tokens = player.token_reserved.counts
+        power = self.player_power[player_idx]
+        power[:] = [bonus + amount for bonus, amount
+                    in zip(player.bonus_owned.counts[:NUM_TOKEN_COLORS - 1],
+                           tokens)]
+        wildcards = tokens[Token.YELLOW.ordinal]
+        self.player_wildcards[player_idx] = wildcards
+        self.player_num_tokens[player_idx] = sum(tokens)
+        self.player_num_reserved[player_idx] = player.num_reserved_cards
+        self.table_affordable[player_idx] = _affordable(self.table_costs,
+                                                        power, wildcards)
+        self.reserved_affordable[player_idx] = _affordable(
+            [_cost_pairs(card) for card in player.cards_reserved], power,
+            wildcards)
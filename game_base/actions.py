@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 from abc import ABC, abstractmethod
 from game_base.players import Player
 from game_base.banks import Bank
@@ -7,10 +8,11 @@ from game_base.cards import Card
 from copy import deepcopy
 
 
-@dataclass
+@dataclass(frozen=True)
 class Action(ABC):
     """Abstract class for representation of an interaction by a player
-    with game assets."""
+    with game assets.
+    (Actions are frozen, as the action sets share them between games.)"""
 
     @abstractmethod
     def can_perform(self, player: Player, bank: Bank) -> bool:
@@ -23,7 +25,7 @@ class Action(ABC):
         pass
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class Reserve3UniqueColorTokens(Action):
     """Reserve 1 token of 3 unique colors for the player.
 
@@ -74,7 +76,7 @@ class Reserve3UniqueColorTokens(Action):
                 f"{self.colors[2]} tokens.")
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class Reserve2SameColorTokens(Action):
     """Reserve 2 token of the same color for the player.
 
@@ -118,7 +120,7 @@ class Reserve2SameColorTokens(Action):
         return (f"reserved 2 {self.color} tokens.")
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ReserveCard(Action):
     """Reserve the given card for the player.
 
@@ -159,7 +161,7 @@ class ReserveCard(Action):
         return f"reserved card {self.card.id}."
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class PurchaseCard(Action):
     """Purchase the given card for the player.
 
@@ -185,10 +187,13 @@ class PurchaseCard(Action):
         reserved tokens of the player and wildcard tokens given as collateral
         is >= than the cost of tokens of the card for those colors.
         """
-        return player.can_purchase_card(self.card)
+        return player.card_payment(self.card) is not None
 
-    def perform(self, player: Player, bank: Bank) -> None:
+    def perform(self, player: Player, bank: Bank,
+                payment: Optional[dict[Token, int]] = None) -> None:
         """Purchase the card for the player.
+        (With the given payment of Player.card_payment, if it was already
+        computed for the checks of the move.)
 
         The process of purchasing a card follows this process:
 
@@ -206,7 +211,7 @@ class PurchaseCard(Action):
 
         The card is automatically added to the player's owned cards.
         """
-        removed_player_tokens = player.purchase_card(self.card)
+        removed_player_tokens = player.purchase_card(self.card, payment)
         bank.add_token(removed_player_tokens)
 
     def __str__(self) -> str:
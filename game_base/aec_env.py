@@ -0,0 +1,194 @@
+"""A PettingZoo AEC (agent environment cycle) environment of the game.
+
+PettingZoo & Gymnasium are optional: without them the environment keeps
+the same interface, but doesn't derive from pettingzoo.AECEnv and has no
+observation/action spaces.
+"""
+from typing import Any, Optional
+import numpy as np
+from game_base.games import Game, GameState
+from game_base.players import Player
+from game_base.action_sets import ACTION_SPACE_SIZE
+from game_base.observations import ObservationEncoder
+
+try:
+    from pettingzoo import AECEnv
+except ImportError:
+    AECEnv = object
+
+try:
+    from gymnasium import spaces
+except ImportError:
+    spaces = None
+
+
+class SplendorAECEnv(AECEnv):
+    """Splendor as a turn-based multi-agent environment following the
+    PettingZoo AEC conventions.
+
+    Observations are dicts of the encoded game state from the agent's
+    perspective (see ObservationEncoder) and the mask of its legal actions
+    over the fixed action space (see game_base.action_sets). Both arrays are
+    copies, so they can be kept between steps.
+
+    At the end of the game the winner is rewarded with 1 & the others with
+    -1. The game is truncated (without rewards) when the turn limit is
+    reached or the current agent has no legal actions.
+
+    Parameters
+    ----------
+    num_players : int
+        The number of players in the game.
+    max_turns : int
+        The maximum number of turns a game can last.
+    dense : bool
+        Whether to use the dense or the sparse observation layout.
+    """
+    metadata = {'name': 'splendor_v0', 'render_modes': ['human'],
+                'is_parallelizable': False}
+
+    def __init__(self, num_players: int = 2, max_turns: int = 100,
+                 dense: bool = True,
+                 render_mode: Optional[str] = None) -> None:
+        if not Game._MIN_PLAYERS <= num_players <= Game._MAX_PLAYERS:
+            raise ValueError("The environment can't be created with "
+                             f"{num_players} players")
+        super().__init__()
+        self.num_players = num_players
+        self.max_turns = max_turns
+        self.render_mode = render_mode
+        self.possible_agents = [f'player_{i}' for i in range(num_players)]
+        self.agent_name_mapping = {agent: agent_idx for agent_idx, agent
+                                   in enumerate(self.possible_agents)}
+        self.game = Game(players=[Player(agent)
+                                  for agent in self.possible_agents])
+        self.encoder = ObservationEncoder(num_players, dense=dense,
+                                          registry=self.game.cards.registry)
+        # The legal actions of the current player (computed once per step)
+        self._action_mask = np.zeros(ACTION_SPACE_SIZE, dtype=np.int8)
+        # The mask of the agents that can't move
+        self._no_actions = np.zeros(ACTION_SPACE_SIZE, dtype=np.int8)
+        self._action_mask_bool = np.zeros(ACTION_SPACE_SIZE, dtype=bool)
+        self.agents = []
+        self.agent_selection = None
+
+    # %% Spaces (require Gymnasium)
+    def observation_space(self, agent: str) -> Any:
+        if spaces is None:
+            raise ImportError("Observation spaces require gymnasium")
+        return spaces.Dict({
+            'observation': spaces.Box(low=0, high=np.inf,
+                                      shape=(self.encoder.size,),
+                                      dtype=self.encoder.dtype),
+            'action_mask': spaces.Box(low=0, high=1,
+                                      shape=(ACTION_SPACE_SIZE,),
+                                      dtype=np.int8)})
+
+    def action_space(self, agent: str) -> Any:
+        if spaces is None:
+            raise ImportError("Action spaces require gymnasium")
+        return spaces.Discrete(ACTION_SPACE_SIZE)
+
+    # %% Environment methods
+    def reset(self, seed: Optional[int] = None,
+              options: Optional[dict] = None) -> None:
+        """Starts a new game (reusing the game objects)."""
+        self.game.reset(seed)
+        self.agents = self.possible_agents.copy()
+        self.rewards = {agent: 0 for agent in self.agents}
+        self._cumulative_rewards = {agent: 0 for agent in self.agents}
+        self.terminations = {agent: False for agent in self.agents}
+        self.truncations = {agent: False for agent in self.agents}
+        self.infos = {agent: {} for agent in self.agents}
+        self._update_action_mask()
+        self._check_truncation()
+        self.agent_selection = self.possible_agents[
+            self.game.current_player_idx]
+
+    def action_mask(self, agent: Optional[str] = None) -> np.ndarray:
+        """Returns the mask of the legal actions of the agent (the selected
+        agent by default), which only has legal actions on its turn."""
+        if agent is None or agent == self.agent_selection:
+            return self._action_mask
+        return self._no_actions
+
+    def observe(self, agent: str) -> dict[str, np.ndarray]:
+        """Returns the observation of the game from the agent's
+        perspective.
+        (The arrays are copies, as the encoder & the masks reuse their
+        buffers.)"""
+        return {'observation': self.encoder.encode(
+                    self.game, self.agent_name_mapping[agent]).copy(),
+                'action_mask': self.action_mask(agent).copy()}
+
+    def last(self, observe: bool = True) -> tuple:
+        """Returns the observation, cumulative reward, termination,
+        truncation & info of the selected agent."""
+        agent = self.agent_selection
+        return (self.observe(agent) if observe else None,
+                self._cumulative_rewards[agent], self.terminations[agent],
+                self.truncations[agent], self.infos[agent])
+
+    def step(self, action: Optional[int]) -> None:
+        """Makes the move with the given action index for the selected agent.
+        (Agents that are done are removed by stepping them with None.)
+
+        Raises:
+            ValueError: If the action isn't legal for the agent
+        """
+        agent = self.agent_selection
+        if self.terminations[agent] or self.truncations[agent]:
+            self._remove_done_agent(action)
+            return
+        self._cumulative_rewards[agent] = 0
+        for other_agent in self.rewards:
+            self.rewards[other_agent] = 0
+        self.game.step(action)
+        if self.game.meta_data.state == GameState.FINISHED:
+            winner = self.game.players.index(self.game.get_winner())
+            for agent_idx, other_agent in enumerate(self.possible_agents):
+                self.rewards[other_agent] = 1 if agent_idx == winner else -1
+                self.terminations[other_agent] = True
+        self._update_action_mask()
+        self._check_truncation()
+        self.agent_selection = self.possible_agents[
+            self.game.current_player_idx]
+        for other_agent, reward in self.rewards.items():
+            self._cumulative_rewards[other_agent] += reward
+
+    def render(self) -> None:
+        if self.render_mode == 'human':
+            print(self.game.meta_data)
+            for player in self.game.players:
+                print(f"{player.id}: {player.prestige_points} points")
+
+    def close(self) -> None:
+        pass
+
+    # %% Helper methods
+    def _update_action_mask(self) -> None:
+        self.game.legal_action_mask(out=self._action_mask_bool)
+        np.copyto(self._action_mask, self._action_mask_bool)
+
+    def _check_truncation(self) -> None:
+        """Truncates the game if it can't be finished."""
+        if self.game.meta_data.state != GameState.IN_PROGRESS:
+            return
+        if (self.game.meta_data.turns_played >= self.max_turns or
+                not self._action_mask_bool.any()):
+            for agent in self.agents:
+                self.truncations[agent] = True
+
+    def _remove_done_agent(self, action: Optional[int]) -> None:
+        """Removes the selected agent that is done & selects the next
+        agent that is done (if any)."""
+        if action is not None:
+            raise ValueError("Agents that are done can only step with None")
+        agent = self.agent_selection
+        del self.terminations[agent]
+        del self.truncations[agent]
+        del self.rewards[agent]
+        del self._cumulative_rewards[agent]
+        del self.infos[agent]
+        self.agents.remove(agent)
+        self.agent_selection = self.agents[0] if self.agents else None
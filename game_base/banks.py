@@ -1,12 +1,12 @@
 from dataclasses import dataclass, field, InitVar
-from game_base.tokens import TokenBag, Token
+from game_base.tokens import ArrayTokenBag, Token
 
 
 @dataclass(slots=True)
 class Bank:
     """A representation of the unreserved tokens in the game."""
 
-    token_available: TokenBag = field(init=False)
+    token_available: ArrayTokenBag = field(init=False)
     initial_regular_token_amount: int = field(init=False)
     initial_wildcard_token_amount: int = field(init=False)
     num_players: InitVar[int] = 4
@@ -19,18 +19,35 @@ class Bank:
             case _: raise ValueError("Cannot initialize a bank for "
                                      f"{num_players}, only 2, 3 or 4")
         self.initial_wildcard_token_amount = 5
-        self.token_available = TokenBag(self.initial_regular_token_amount,
-                                        self.initial_wildcard_token_amount)
+        self.token_available = ArrayTokenBag(
+            self.initial_regular_token_amount,
+            self.initial_wildcard_token_amount)
+
+    def clone(self) -> 'Bank':
+        """Returns a copy of the bank with its own token amounts."""
+        bank = Bank.__new__(Bank)
+        bank.token_available = self.token_available.clone()
+        bank.initial_regular_token_amount = self.initial_regular_token_amount
+        bank.initial_wildcard_token_amount = (self
+                                              .initial_wildcard_token_amount)
+        return bank
+
+    def reset(self) -> None:
+        """Refills the bank to the initial token amounts."""
+        counts = self.token_available.counts
+        counts[:] = [self.initial_regular_token_amount] * len(counts)
+        counts[Token.YELLOW.ordinal] = self.initial_wildcard_token_amount
 
     def can_remove_token(self, amount_to_remove: dict[Token, int]) -> bool:
         """Check if tokens of given colors can be removed."""
-        for color in amount_to_remove:
-            match amount_to_remove[color]:
+        available = self.token_available.counts
+        for color, amount in amount_to_remove.items():
+            match amount:
                 case 2:
-                    if self.token_available.tokens[color] < 4:
+                    if available[color.ordinal] < 4:
                         return False
                 case 1:
-                    if self.token_available.tokens[color] < 1:
+                    if available[color.ordinal] < 1:
                         return False
                 case 0: return True
                 case other_amount:
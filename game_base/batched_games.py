@@ -0,0 +1,384 @@
+from dataclasses import dataclass, field, InitVar
+from typing import Optional
+import numpy as np
+from game_base.tokens import Token, NUM_TOKEN_COLORS
+from game_base.nobles import DEFAULT_NOBLES
+from game_base.banks import Bank
+from game_base.games import Game, GameState
+from game_base.action_sets import (TOKEN_ACTION_AMOUNTS,
+                                   TOKEN_ACTION_BANK_MINIMUMS,
+                                   TOKEN_ACTION_SIZES, MAX_PLAYER_TOKENS,
+                                   ACTION_SPACE_SIZE, NUM_TOKEN_ACTIONS,
+                                   NUM_TABLE_SLOTS, NUM_RESERVED_SLOTS,
+                                   RESERVE_TABLE_OFFSET,
+                                   PURCHASE_TABLE_OFFSET,
+                                   PURCHASE_RESERVED_OFFSET)
+from game_base import tables
+from game_base.tables import STANDARD_CARDS
+
+YELLOW: int = Token.YELLOW.ordinal
+NUM_CARD_LEVELS: int = 3
+TABLE_SIZE: int = NUM_TABLE_SLOTS // NUM_CARD_LEVELS
+# Index used for empty card slots & removed nobles
+EMPTY: int = -1
+
+# %% Static tables of the standard cards & nobles (see game_base.tables)
+# padded with the wildcard column and a last row for the EMPTY index
+# (an empty card slot costs nothing & a removed noble can't be gained)
+CARD_COSTS: np.ndarray = np.pad(tables.CARD_COSTS, ((0, 1), (0, 1)))
+CARD_POINTS: np.ndarray = np.pad(tables.CARD_POINTS, (0, 1))
+CARD_BONUS_COLORS: np.ndarray = np.pad(tables.CARD_BONUS_COLORS, (0, 1))
+NOBLE_REQUIREMENTS: np.ndarray = np.pad(
+    np.pad(tables.NOBLE_REQUIREMENTS, ((0, 0), (0, 1))), ((0, 1), (0, 0)),
+    constant_values=np.iinfo(np.int16).max)
+NOBLE_POINTS: np.ndarray = np.pad(tables.NOBLE_POINTS, (0, 1))
+# The card indices of each level, in the order of the registry
+LEVEL_CARDS: list[np.ndarray] = [
+    np.flatnonzero(tables.CARD_LEVELS == level)
+    for level in range(1, NUM_CARD_LEVELS + 1)]
+MAX_DECK_SIZE: int = max(len(cards) for cards in LEVEL_CARDS)
+WINNER_PRESTIGE_POINTS_THRESHOLD: int = Game._WINNER_PRESTIGE_POINTS_THRESHOLD
+
+
+@dataclass(slots=True)
+class BatchedGames:
+    """A struct-of-arrays engine holding the state of many independent games
+    with the same number of players, all played with the standard cards &
+    nobles.
+
+    All of the games are advanced with a single step call taking one action
+    index (of the fixed action space in game_base.action_sets) per game.
+    The rules are the same as in game_base.games.Game.
+
+    Cards are represented by their index in the standard card registry,
+    nobles by their index in the default nobles list and empty slots by -1.
+    Decks are drawn from the end (the same as the list decks in Game).
+
+    Games whose current player has no legal moves are truncated by step
+    (ended without a winner), as they can't continue.
+    """
+    num_games: int
+    num_players: int = 4
+    seed: InitVar[Optional[int]] = None
+    rng: np.random.Generator = field(init=False, repr=False)
+    # %% Game state arrays
+    # (num_games, num colors)
+    bank: np.ndarray = field(init=False, repr=False)
+    # (num_games, num_players, num colors)
+    player_tokens: np.ndarray = field(init=False, repr=False)
+    player_bonuses: np.ndarray = field(init=False, repr=False)
+    # (num_games, num_players, num reserved slots)
+    player_reserved: np.ndarray = field(init=False, repr=False)
+    # (num_games, num_players)
+    player_points: np.ndarray = field(init=False, repr=False)
+    player_num_cards: np.ndarray = field(init=False, repr=False)
+    player_num_nobles: np.ndarray = field(init=False, repr=False)
+    # (num_games, num levels, table size)
+    tables: np.ndarray = field(init=False, repr=False)
+    # (num_games, num levels, max deck size) & (num_games, num levels)
+    decks: np.ndarray = field(init=False, repr=False)
+    deck_sizes: np.ndarray = field(init=False, repr=False)
+    # (num_games, num_players + 1)
+    nobles: np.ndarray = field(init=False, repr=False)
+    # (num_games,)
+    current_player: np.ndarray = field(init=False, repr=False)
+    turns_played: np.ndarray = field(init=False, repr=False)
+    finished: np.ndarray = field(init=False, repr=False)
+    # Games ended without a winner (see truncate)
+    truncated: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self, seed: Optional[int]) -> None:
+        if not Game._MIN_PLAYERS <= self.num_players <= Game._MAX_PLAYERS:
+            raise ValueError("Games can't be initialized with "
+                             f"{self.num_players} players")
+        self.rng = np.random.default_rng(seed)
+        num_games, num_players = self.num_games, self.num_players
+        self.bank = np.zeros((num_games, NUM_TOKEN_COLORS), dtype=np.int16)
+        self.player_tokens = np.zeros(
+            (num_games, num_players, NUM_TOKEN_COLORS), dtype=np.int16)
+        self.player_bonuses = np.zeros_like(self.player_tokens)
+        self.player_reserved = np.full(
+            (num_games, num_players, NUM_RESERVED_SLOTS), EMPTY,
+            dtype=np.int16)
+        self.player_points = np.zeros((num_games, num_players),
+                                      dtype=np.int16)
+        self.player_num_cards = np.zeros_like(self.player_points)
+        self.player_num_nobles = np.zeros_like(self.player_points)
+        self.tables = np.full((num_games, NUM_CARD_LEVELS, TABLE_SIZE),
+                              EMPTY, dtype=np.int16)
+        self.decks = np.full((num_games, NUM_CARD_LEVELS, MAX_DECK_SIZE),
+                             EMPTY, dtype=np.int16)
+        self.deck_sizes = np.zeros((num_games, NUM_CARD_LEVELS),
+                                   dtype=np.int16)
+        self.nobles = np.full((num_games, num_players + 1), EMPTY,
+                              dtype=np.int16)
+        self.current_player = np.zeros(num_games, dtype=np.int16)
+        self.turns_played = np.zeros(num_games, dtype=np.int32)
+        self.finished = np.zeros(num_games, dtype=bool)
+        self.truncated = np.zeros(num_games, dtype=bool)
+        self.reset()
+
+    @classmethod
+    def from_games(cls, games: list[Game]) -> 'BatchedGames':
+        """Creates the batch with the current state of the given games.
+        (The games must be in progress, have the same number of players
+        and use the standard cards.)"""
+        batch = cls(len(games), games[0].num_players)
+        for game_idx, game in enumerate(games):
+            batch.set_game(game_idx, game)
+        return batch
+
+    def set_game(self, game_idx: int, game: Game) -> None:
+        """Copies the state of the given game into the batch."""
+        if game.num_players != self.num_players:
+            raise ValueError(f"The game has {game.num_players} players "
+                             f"instead of {self.num_players}")
+        if game.meta_data.state == GameState.NOT_STARTED:
+            raise ValueError("The game hasn't been initialized")
+        self.bank[game_idx] = game.bank.token_available.counts
+        for player_idx, player in enumerate(game.players):
+            self.player_tokens[game_idx, player_idx] = (player.token_reserved
+                                                        .counts)
+            self.player_bonuses[game_idx, player_idx] = (player.bonus_owned
+                                                         .counts)
+            self.player_reserved[game_idx, player_idx] = [
+                EMPTY if card is None else STANDARD_CARDS.get_index(card)
+                for card in player.cards_reserved]
+            self.player_points[game_idx, player_idx] = player.prestige_points
+            self.player_num_cards[game_idx, player_idx] = len(
+                player.cards_owned)
+            self.player_num_nobles[game_idx, player_idx] = len(
+                player.nobles_owned)
+        for level_idx, manager in enumerate(game.cards.managers):
+            self.tables[game_idx, level_idx] = [
+                EMPTY if card is None else STANDARD_CARDS.get_index(card)
+                for card in manager.table]
+            self.decks[game_idx, level_idx] = EMPTY
+            self.decks[game_idx, level_idx, :len(manager.deck)] = [
+                STANDARD_CARDS.get_index(card) for card in manager.deck]
+            self.deck_sizes[game_idx, level_idx] = len(manager.deck)
+        self.nobles[game_idx] = EMPTY
+        self.nobles[game_idx, :len(game.nobles)] = [
+            DEFAULT_NOBLES.index(noble) for noble in game.nobles]
+        self.current_player[game_idx] = game.current_player_idx
+        self.turns_played[game_idx] = game.meta_data.turns_played
+        self.finished[game_idx] = (game.meta_data.state ==
+                                   GameState.FINISHED)
+        self.truncated[game_idx] = False
+
+    # %% Game initialization methods
+    def reset(self, game_indices: Optional[np.ndarray] = None) -> None:
+        """Starts new games (with shuffled decks & nobles) in the given
+        slots of the batch, or in all of them if no slots are given."""
+        if game_indices is None:
+            game_indices = np.arange(self.num_games)
+        game_indices = np.asarray(game_indices)
+        num_reset = len(game_indices)
+        self.bank[game_indices] = Bank(self.num_players).token_available.counts
+        self.player_tokens[game_indices] = 0
+        self.player_bonuses[game_indices] = 0
+        self.player_reserved[game_indices] = EMPTY
+        self.player_points[game_indices] = 0
+        self.player_num_cards[game_indices] = 0
+        self.player_num_nobles[game_indices] = 0
+        for level_idx, level_cards in enumerate(LEVEL_CARDS):
+            # Random permutation of the level's cards for each game
+            permutations = self.rng.random(
+                (num_reset, len(level_cards))).argsort(axis=1)
+            decks = level_cards[permutations]
+            # Fill the table slots in order by drawing from the deck's end
+            self.tables[game_indices, level_idx] = decks[:, :-TABLE_SIZE-1:-1]
+            self.decks[game_indices, level_idx] = EMPTY
+            self.decks[game_indices, level_idx, :len(level_cards)] = decks
+            self.deck_sizes[game_indices, level_idx] = (len(level_cards) -
+                                                        TABLE_SIZE)
+        self.nobles[game_indices] = self.rng.random(
+            (num_reset, len(DEFAULT_NOBLES))).argsort(
+                axis=1)[:, :self.num_players + 1]
+        self.current_player[game_indices] = 0
+        self.turns_played[game_indices] = 0
+        self.finished[game_indices] = False
+        self.truncated[game_indices] = False
+
+    # %% Active game methods
+    def _slot_cards(self) -> np.ndarray:
+        """Returns the cards of the table slots followed by the reserved slots
+        of the current player for all games.
+        (num_games, num table slots + num reserved slots)"""
+        current_reserved = self.player_reserved[np.arange(self.num_games),
+                                                self.current_player]
+        return np.concatenate(
+            [self.tables.reshape(self.num_games, NUM_TABLE_SLOTS),
+             current_reserved], axis=1)
+
+    def legal_action_mask(self) -> np.ndarray:
+        """Returns a boolean mask of the legal moves of the current player
+        over the fixed action space for all games.
+        (num_games, action space size; finished & truncated games have no
+        legal moves)"""
+        games = np.arange(self.num_games)
+        tokens = self.player_tokens[games, self.current_player]
+        bonuses = self.player_bonuses[games, self.current_player]
+        mask = np.zeros((self.num_games, ACTION_SPACE_SIZE), dtype=bool)
+        # The bank holds enough tokens & the player won't have too many
+        mask[:, :NUM_TOKEN_ACTIONS] = (
+            ~(TOKEN_ACTION_BANK_MINIMUMS > self.bank[:, None, :]).any(axis=2) &
+            (tokens.sum(axis=1, keepdims=True) + TOKEN_ACTION_SIZES <=
+             MAX_PLAYER_TOKENS))
+        slot_cards = self._slot_cards()
+        occupied = slot_cards != EMPTY
+        # Costs that aren't covered by bonuses & tokens need wildcards
+        shortfalls = np.maximum(CARD_COSTS[slot_cards] -
+                                (bonuses + tokens)[:, None, :], 0)
+        affordable = occupied & (shortfalls.sum(axis=2) <=
+                                 tokens[:, YELLOW, None])
+        num_reserved = (self.player_reserved[games, self.current_player] !=
+                        EMPTY).sum(axis=1)
+        mask[:, RESERVE_TABLE_OFFSET:PURCHASE_TABLE_OFFSET] = (
+            occupied[:, :NUM_TABLE_SLOTS] &
+            (num_reserved < NUM_RESERVED_SLOTS)[:, None])
+        mask[:, PURCHASE_TABLE_OFFSET:] = affordable
+        mask[self.finished | self.truncated] = False
+        return mask
+
+    def _replace_table_cards(self, games: np.ndarray, levels: np.ndarray,
+                             positions: np.ndarray) -> None:
+        """Replaces the cards in the given table slots with cards drawn
+        from the decks, or empties the slots if the decks are empty."""
+        deck_sizes = self.deck_sizes[games, levels]
+        has_cards = deck_sizes > 0
+        drawn = self.decks[games, levels, np.maximum(deck_sizes - 1, 0)]
+        self.tables[games, levels, positions] = np.where(has_cards, drawn,
+                                                         EMPTY)
+        self.deck_sizes[games[has_cards], levels[has_cards]] -= 1
+
+    def _take_tokens(self, games: np.ndarray, players: np.ndarray,
+                     actions: np.ndarray) -> None:
+        amounts = TOKEN_ACTION_AMOUNTS[actions]
+        self.bank[games] -= amounts
+        self.player_tokens[games, players] += amounts
+
+    def _reserve_cards(self, games: np.ndarray, players: np.ndarray,
+                       table_slots: np.ndarray) -> None:
+        levels, positions = np.divmod(table_slots, TABLE_SIZE)
+        cards = self.tables[games, levels, positions]
+        free_slots = np.argmax(self.player_reserved[games, players] == EMPTY,
+                               axis=1)
+        self.player_reserved[games, players, free_slots] = cards
+        # Give the player 1 wildcard token, if the transfer is possible
+        gets_wildcard = ((self.bank[games, YELLOW] >= 1) &
+                         (self.player_tokens[games, players].sum(axis=1) + 1
+                          <= MAX_PLAYER_TOKENS))
+        self.bank[games[gets_wildcard], YELLOW] -= 1
+        self.player_tokens[games[gets_wildcard], players[gets_wildcard],
+                           YELLOW] += 1
+        self._replace_table_cards(games, levels, positions)
+
+    def _purchase_cards(self, games: np.ndarray, players: np.ndarray,
+                        cards: np.ndarray) -> None:
+        _, payments = tables.affordable_cards(
+            self.player_tokens[games, players],
+            self.player_bonuses[games, players], cards[:, None])
+        paid = payments[:, 0]
+        self.player_tokens[games, players] -= paid
+        self.bank[games] += paid
+        self.player_bonuses[games, players, CARD_BONUS_COLORS[cards]] += 1
+        self.player_points[games, players] += CARD_POINTS[cards]
+        self.player_num_cards[games, players] += 1
+
+    def _noble_check(self, games: np.ndarray, players: np.ndarray) -> None:
+        """Gives the first noble the players are eligible for (if any)."""
+        eligible = (self.player_bonuses[games, players][:, None, :] >=
+                    NOBLE_REQUIREMENTS[self.nobles[games]]).all(axis=2)
+        has_noble = eligible.any(axis=1)
+        games, players = games[has_noble], players[has_noble]
+        noble_slots = np.argmax(eligible[has_noble], axis=1)
+        self.player_points[games, players] += NOBLE_POINTS[
+            self.nobles[games, noble_slots]]
+        self.player_num_nobles[games, players] += 1
+        # Keep the order of the remaining nobles
+        nobles = self.nobles[games]
+        removed = np.arange(nobles.shape[1]) >= noble_slots[:, None]
+        nobles[removed] = np.concatenate(
+            [nobles[:, 1:], np.full((len(games), 1), EMPTY, dtype=np.int16)],
+            axis=1)[removed]
+        self.nobles[games] = nobles
+
+    def _end_player_turns(self, games: np.ndarray,
+                          players: np.ndarray) -> None:
+        last_players = players + 1 == self.num_players
+        games_turn_end = games[last_players]
+        self.finished[games_turn_end] = (
+            self.player_points[games_turn_end] >=
+            WINNER_PRESTIGE_POINTS_THRESHOLD).any(axis=1)
+        self.turns_played[games_turn_end] += 1
+        self.current_player[games_turn_end] = 0
+        self.current_player[games[~last_players]] += 1
+
+    def truncate(self, game_indices: np.ndarray) -> None:
+        """Ends the games in the given slots of the batch without a winner
+        (ex. at a turn limit). Finished games stay finished."""
+        game_indices = np.asarray(game_indices)
+        self.truncated[game_indices] = ~self.finished[game_indices]
+
+    def step(self, actions: np.ndarray) -> None:
+        """Makes the move with the given action index for the current player
+        of every game in progress. (Actions of finished & truncated games
+        are ignored.)
+        Games whose current player has no legal moves are truncated instead
+        (their actions are ignored as well).
+
+        Raises:
+            ValueError: If any of the actions is illegal for its game
+        """
+        actions = np.asarray(actions)
+        games = np.flatnonzero(~(self.finished | self.truncated))
+        mask = self.legal_action_mask()[games]
+        stalled = ~mask.any(axis=1)
+        self.truncated[games[stalled]] = True
+        games, mask = games[~stalled], mask[~stalled]
+        actions = actions[games]
+        if not mask[np.arange(len(games)), actions].all():
+            raise ValueError("Not all of the actions are legal moves.")
+        players = self.current_player[games].astype(np.intp)
+        is_token = actions < RESERVE_TABLE_OFFSET
+        self._take_tokens(games[is_token], players[is_token],
+                          actions[is_token])
+        is_reserve = ((actions >= RESERVE_TABLE_OFFSET) &
+                      (actions < PURCHASE_TABLE_OFFSET))
+        self._reserve_cards(games[is_reserve], players[is_reserve],
+                            actions[is_reserve] - RESERVE_TABLE_OFFSET)
+        is_table_purchase = ((actions >= PURCHASE_TABLE_OFFSET) &
+                             (actions < PURCHASE_RESERVED_OFFSET))
+        purchase_games = games[is_table_purchase]
+        levels, positions = np.divmod(
+            actions[is_table_purchase] - PURCHASE_TABLE_OFFSET, TABLE_SIZE)
+        self._purchase_cards(purchase_games, players[is_table_purchase],
+                             self.tables[purchase_games, levels, positions])
+        self._replace_table_cards(purchase_games, levels, positions)
+        is_reserved_purchase = actions >= PURCHASE_RESERVED_OFFSET
+        purchase_games = games[is_reserved_purchase]
+        purchase_players = players[is_reserved_purchase]
+        reserved_slots = (actions[is_reserved_purchase] -
+                          PURCHASE_RESERVED_OFFSET)
+        self._purchase_cards(purchase_games, purchase_players,
+                             self.player_reserved[purchase_games,
+                                                  purchase_players,
+                                                  reserved_slots])
+        self.player_reserved[purchase_games, purchase_players,
+                             reserved_slots] = EMPTY
+        self._noble_check(games, players)
+        self._end_player_turns(games, players)
+
+    def winners(self) -> np.ndarray:
+        """Returns the winner's index of every finished game (-1 otherwise).
+
+        If there's more than one eligible player to win,
+        sort by most prestige points, then least owned cards
+        (then the earliest player, the same as Game.get_winner)."""
+        eligible = self.player_points >= WINNER_PRESTIGE_POINTS_THRESHOLD
+        # Owned cards are < 100, so the key orders by points first
+        keys = np.where(eligible,
+                        self.player_points.astype(np.int32) * 100 -
+                        self.player_num_cards, np.iinfo(np.int32).min)
+        return np.where(self.finished, np.argmax(keys, axis=1), EMPTY)
@@ -1,23 +1,41 @@
 from pathlib import Path
 from dataclasses import dataclass, field, InitVar
-from random import shuffle
-import pandas as pd
+from random import Random, shuffle
+from typing import Optional
 import pickle
-from os import path
-from game_base.tokens import Token, TokenBag
+import os
+from hashlib import sha256
+from tempfile import NamedTemporaryFile
+from game_base.tokens import Token, TokenBag, ArrayTokenBag
+from game_base.cards_data import CARDS_DATA
 
 # Set the files path to be relative to this file
 CARDS_FILE_PATH_CSV: Path = (Path(__file__).parent /
                              'splendor_cards_list.csv').resolve()
-CARDS_FILE_PATH_PKL: Path = (Path(__file__).parent /
-                             'cards_manager_collection.pkl').resolve()
+CARDS_CACHE_DIR: Path = Path(__file__).parent.resolve()
+# Increase when the pickled structure of the cards changes
+# (Card, CardManager, CardManagerCollection, CardRegistry or the token bags)
+CARDS_CACHE_SCHEMA_VERSION: int = 1
+CARDS_DATA_FILE_PATH: Path = (Path(__file__).parent /
+                              'cards_data.py').resolve()
+# The order of the colors in the token costs of the precompiled card data
+CARDS_DATA_COST_COLORS: tuple[Token, ...] = (Token.GREEN, Token.WHITE,
+                                             Token.BLUE, Token.BLACK,
+                                             Token.RED)
 
+# All of the cards created in this process, by their attributes
+_INTERNED_CARDS: dict[tuple, 'Card'] = {}
 
-@dataclass(order=True, frozen=True, slots=True)
+
+@dataclass(frozen=True, slots=True, init=False, eq=False)
 class Card:
     '''
     Cards are purchasable items by players that give them color bonuses
     and possible prestige points
+
+    Cards are interned value objects: creating a card with the same
+    attributes as an existing card returns the existing card,
+    so cards are compared & hashed by identity.
     '''
     # The order of the attributes is important for sorting
     # Difficulty of purchasing development card
@@ -25,19 +43,80 @@ class Card:
     # Number of prestige points given by owning the card
     prestige_points: int
     # Number of tokens required to purchase the card per color
-    token_cost: TokenBag
+    token_cost: ArrayTokenBag
     # Color of the bonus gem given by owning the card
     bonus_color: Token
+    # Cached string identifier (see the id property)
+    _id: str = field(repr=False)
 
-    def __post_init__(self):
-        if self.token_cost.tokens[Token.YELLOW]:
+    def __new__(cls, level: int, prestige_points: int,
+                token_cost: TokenBag | ArrayTokenBag,
+                bonus_color: Token) -> 'Card':
+        if not isinstance(token_cost, ArrayTokenBag):
+            token_cost = ArrayTokenBag.from_bag(token_cost)
+        key = (level, prestige_points, tuple(token_cost.counts), bonus_color)
+        card = _INTERNED_CARDS.get(key)
+        if card is not None:
+            return card
+        if token_cost.counts[Token.YELLOW.ordinal]:
             raise ValueError("A card can't require wildcard tokens")
-        if self.bonus_color == Token.YELLOW:
+        if bonus_color == Token.YELLOW:
             raise ValueError("A card can't have wildcard as a bonus color")
-        if all(cost == 0 for cost in self.token_cost.tokens.values()):
+        if not any(token_cost.counts):
             raise ValueError("A card can't cost nothing.")
-        if self.level not in [1, 2, 3]:
+        if level not in [1, 2, 3]:
             raise ValueError('Card level is not 1, 2 or 3')
+        card = object.__new__(cls)
+        object.__setattr__(card, 'level', level)
+        object.__setattr__(card, 'prestige_points', prestige_points)
+        # (A copy, so changes to the caller's bag don't reach the card)
+        object.__setattr__(card, 'token_cost', token_cost.clone())
+        object.__setattr__(card, 'bonus_color', bonus_color)
+        object.__setattr__(card, '_id',
+                           "".join([str(amount) for color, amount
+                                    in zip(Token, token_cost.counts)
+                                    if color != Token.YELLOW]))
+        _INTERNED_CARDS[key] = card
+        return card
+
+    def __init__(self, *args, **kwargs) -> None:
+        # The card is created (or found among the interned cards) in __new__
+        pass
+
+    def __reduce__(self):
+        # Unpickled cards go through __new__ to get the interned card
+        return (Card, (self.level, self.prestige_points,
+                       self.token_cost, self.bonus_color))
+
+    def __copy__(self) -> 'Card':
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Card':
+        return self
+
+    def _sort_key(self) -> tuple[int, int, tuple[int, ...], int]:
+        return (self.level, self.prestige_points,
+                tuple(self.token_cost.counts), self.bonus_color.ordinal)
+
+    def __lt__(self, other):
+        if isinstance(other, Card):
+            return self._sort_key() < other._sort_key()
+        return NotImplemented
+
+    def __le__(self, other):
+        if isinstance(other, Card):
+            return self._sort_key() <= other._sort_key()
+        return NotImplemented
+
+    def __gt__(self, other):
+        if isinstance(other, Card):
+            return self._sort_key() > other._sort_key()
+        return NotImplemented
+
+    def __ge__(self, other):
+        if isinstance(other, Card):
+            return self._sort_key() >= other._sort_key()
+        return NotImplemented
 
     @property
     def id(self) -> str:
@@ -47,9 +126,7 @@ class Card:
 
         Example ID: {green: 1, red: 2} -> 100002
         """
-        return "".join([str(self.token_cost.tokens[color])
-                        for color in self.token_cost.tokens
-                        if color != Token.YELLOW])
+        return self._id
 
     def __str__(self) -> str:
         return '\n'.join([f"Card {self.id}",
@@ -80,6 +157,16 @@ class CardManager:
                 raise ValueError("Not all cards have the same level.")
         self.table = [None] * self.table_size
 
+    def clone(self) -> 'CardManager':
+        """Returns a copy of the card manager with its own deck order and
+        table slots. (The cards themselves are shared.)"""
+        manager = CardManager.__new__(CardManager)
+        manager.card_level = self.card_level
+        manager.deck = self.deck.copy()
+        manager.table_size = self.table_size
+        manager.table = self.table.copy()
+        return manager
+
     def num_cards_on_table(self):
         """Gets the number of cards on the table that has 4 slots."""
         return len([card for card in self.table if card is not None])
@@ -97,13 +184,54 @@ class CardManager:
                                               else None)
 
 
+@dataclass(slots=True)
+class CardRegistry:
+    """Gives each card of a card set a stable integer index (its position
+    in the set) and looks up cards by index or string id in constant time.
+    (Card ids are assumed to be unique within the set.)"""
+    cards: tuple[Card, ...]
+    indices_by_id: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.cards = tuple(self.cards)
+        self.indices_by_id = {}
+        for card_index, card in enumerate(self.cards):
+            self.indices_by_id.setdefault(card.id, card_index)
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def get_card(self, card_index: int) -> Card:
+        """Returns the card with the given index."""
+        return self.cards[card_index]
+
+    def get_card_by_id(self, card_id: str) -> Optional[Card]:
+        """Returns the card with the given id if it is in the set."""
+        card_index = self.indices_by_id.get(card_id)
+        return None if card_index is None else self.cards[card_index]
+
+    def get_index(self, card: Card) -> int:
+        """Returns the index of the given card.
+
+        Raises:
+            ValueError: If the card is not in the set
+        """
+        card_index = self.indices_by_id.get(card.id)
+        if card_index is None or self.cards[card_index] != card:
+            raise ValueError(f"Card {card.id} is not in the card registry.")
+        return card_index
+
+
 @dataclass(slots=True)
 class CardManagerCollection:
     """Contains the card managers for all card levels."""
     managers: list[CardManager] = field(init=False)
+    # Index of all the cards in the collection (in the given order)
+    registry: CardRegistry = field(init=False, repr=False)
     cards: InitVar[list[Card]]
 
     def __post_init__(self, cards: list[Card]) -> None:
+        self.registry = CardRegistry(cards)
         # Separate the cards by level
         cards_1 = []
         cards_2 = []
@@ -118,6 +246,14 @@ class CardManagerCollection:
                          CardManager(cards_2),
                          CardManager(cards_3)]
 
+    def clone(self) -> 'CardManagerCollection':
+        """Returns a copy of the collection with copies of all the card
+        managers. (The cards & the registry are shared.)"""
+        collection = CardManagerCollection.__new__(CardManagerCollection)
+        collection.managers = [manager.clone() for manager in self.managers]
+        collection.registry = self.registry
+        return collection
+
     def get_manager(self, card_level: int) -> CardManager:
         """Returns the card manager for the given card level."""
         for manager in self.managers:
@@ -160,6 +296,14 @@ class CardManagerCollection:
                 return True
         return False
 
+    def reset(self) -> None:
+        """Puts all of the cards back in the decks (in the order of the
+        registry) and empties the tables."""
+        for manager in self.managers:
+            manager.deck[:] = [card for card in self.registry.cards
+                               if card.level == manager.card_level]
+            manager.table[:] = [None] * manager.table_size
+
     def remove_card_from_tables(self, card: Card) -> None:
         """Removes the given card from the appropriate table.
         (Replaces it with a card from the deck if possible, else None)"""
@@ -167,9 +311,11 @@ class CardManagerCollection:
             if manager.card_level == card.level:
                 manager.remove_card_from_table(card)
 
-    def shuffle_decks(self) -> None:
-        """Shuffle all of the decks."""
-        [shuffle(manager.deck) for manager in self.managers]
+    def shuffle_decks(self, rng: Optional[Random] = None) -> None:
+        """Shuffle all of the decks.
+        (With the given random number generator, else the random module.)"""
+        shuffle_deck = shuffle if rng is None else rng.shuffle
+        [shuffle_deck(manager.deck) for manager in self.managers]
 
     def fill_tables(self) -> None:
         """Fill all of the tables."""
@@ -181,7 +327,10 @@ class CardGenerator:
     @staticmethod
     def generate_from_csv() -> CardManagerCollection:
         """Generates the CardManagerCollection from the original card info
-        in the .csv file."""
+        in the .csv file.
+        (pandas is only required here, i.e. when regenerating the card data.)
+        """
+        import pandas as pd
         cards_df = pd.read_csv(CARDS_FILE_PATH_CSV, header=1)
         columns_to_ffill = ['Level', 'Gem color']
         cards_df[columns_to_ffill] = (cards_df[columns_to_ffill]
@@ -192,7 +341,7 @@ class CardGenerator:
                                        .fillna(0))
         # Create cards from their info
         cards = [Card(level=int(row['Level']), prestige_points=int(row['PV']),
-                      token_cost=TokenBag().add(
+                      token_cost=ArrayTokenBag().add(
                           {Token.GREEN: int(row['(g)reen']),
                            Token.WHITE: int(row['(w)hite']),
                            Token.BLUE: int(row['bl(u)e']),
@@ -203,27 +352,129 @@ class CardGenerator:
         return CardManagerCollection(cards)
 
     @staticmethod
-    def save_to_pickle(cards_data: CardManagerCollection,
-                       filepath: Path = CARDS_FILE_PATH_PKL) -> None:
-        """Save the CardManagerCollection from the original card info
-        in a .pickle file."""
-        with open(filepath, 'wb') as f:
-            pickle.dump(cards_data, f)
+    def generate_from_card_data() -> CardManagerCollection:
+        """Generates the CardManagerCollection from the precompiled card
+        data module (without any dependencies)."""
+        cards = [Card(level=level, prestige_points=prestige_points,
+                      token_cost=ArrayTokenBag().add(
+                          dict(zip(CARDS_DATA_COST_COLORS, costs))),
+                      bonus_color=Token[bonus_color])
+                 for level, prestige_points, bonus_color, costs in CARDS_DATA]
+        return CardManagerCollection(cards)
+
+    @staticmethod
+    def save_to_card_data_module(cards_data: CardManagerCollection,
+                                 filepath: Path = CARDS_DATA_FILE_PATH
+                                 ) -> None:
+        """Save the cards of the CardManagerCollection as a Python module
+        with the card info as constants (in the order of the registry).
+
+        Regenerate the module after changing the .csv file with:
+            CardGenerator.save_to_card_data_module(
+                CardGenerator.generate_from_csv())
+        """
+        lines = ['"""Precompiled card info generated from '
+                 f'{CARDS_FILE_PATH_CSV.name}.',
+                 '(Generated by CardGenerator.save_to_card_data_module, '
+                 'don\'t edit manually.)',
+                 '',
+                 'Each card is (level, prestige points, bonus color, '
+                 'token costs in the order',
+                 'of ' + ', '.join(color.name for color
+                                   in CARDS_DATA_COST_COLORS) + ').',
+                 '"""',
+                 'CARDS_DATA: tuple[tuple[int, int, str, '
+                 'tuple[int, ...]], ...] = (']
+        for card in cards_data.registry.cards:
+            costs = tuple(card.token_cost.tokens[color]
+                          for color in CARDS_DATA_COST_COLORS)
+            lines.append(f'    ({card.level}, {card.prestige_points}, '
+                         f'{card.bonus_color.name!r}, {costs}),')
+        lines.append(')')
+        with open(filepath, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
 
     @staticmethod
-    def generate_cards(shuffled=True) -> CardManagerCollection:
-        """Returns the CardManagerCollection from the pickle file
-        if it exists, or generated from the .csv file,
-        shuffling the decks if requested.
+    def cache_path(cache_dir: Path = CARDS_CACHE_DIR) -> Path:
+        """Returns the path of the pickle file cache of the cards, which is
+        keyed by the hash of the card data the cache is built from (see
+        generate_from_card_data) & the cache schema version.
+        (Changed card data or schema never reads a stale cache.)"""
+        key = sha256(repr(CARDS_DATA).encode())
+        key.update(f'schema {CARDS_CACHE_SCHEMA_VERSION}'.encode())
+        return (cache_dir /
+                f'cards_manager_collection_{key.hexdigest()[:16]}.pkl')
+
+    @staticmethod
+    def save_to_pickle(cards_data: CardManagerCollection,
+                       filepath: Path) -> None:
+        """Save the CardManagerCollection in a .pickle file.
+
+        The file is written under a temporary name and atomically renamed,
+        so concurrent readers never see a partially written file.
         """
-        if path.exists(CARDS_FILE_PATH_PKL):
-            with open(CARDS_FILE_PATH_PKL, 'rb') as f:
+        temp_file = NamedTemporaryFile('wb', dir=filepath.parent,
+                                       prefix=f'.{filepath.name}.',
+                                       delete=False)
+        try:
+            with temp_file:
+                pickle.dump(cards_data, temp_file)
+            os.replace(temp_file.name, filepath)
+        except BaseException:
+            os.remove(temp_file.name)
+            raise
+
+    @staticmethod
+    def load_cards(cache_dir: Path = CARDS_CACHE_DIR
+                   ) -> CardManagerCollection:
+        """Returns the unshuffled CardManagerCollection from the pickle file
+        cache if it exists, else generated from the precompiled card data
+        and saved to the cache.
+        (Only kept in memory if the cache directory is read-only.)"""
+        try:
+            filepath = CardGenerator.cache_path(cache_dir)
+        except OSError:
+            return CardGenerator.generate_from_card_data()
+        try:
+            with open(filepath, 'rb') as f:
                 cards_data = pickle.load(f)
-            if not isinstance(cards_data, CardManagerCollection):
-                raise ValueError("A CardManagerCollection wasn't saved in"
-                                 f"{CARDS_FILE_PATH_PKL}")
-        else:
-            cards_data = CardGenerator.generate_from_csv()
-            CardGenerator.save_to_pickle(cards_data)
-        cards_data.shuffle_decks() if shuffled else None
+            if isinstance(cards_data, CardManagerCollection):
+                return cards_data
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, TypeError, ValueError):
+            # An unreadable cache is regenerated
+            pass
+        cards_data = CardGenerator.generate_from_card_data()
+        try:
+            CardGenerator.save_to_pickle(cards_data, filepath)
+        except OSError:
+            pass
+        return cards_data
+
+    @staticmethod
+    def generate_cards(shuffled=True,
+                       rng: Optional[Random] = None) -> CardManagerCollection:
+        """Returns a copy of the card template (see card_template),
+        shuffling the decks (with the given random number generator)
+        if requested.
+        """
+        cards_data = CardGenerator.card_template().clone()
+        cards_data.shuffle_decks(rng) if shuffled else None
         return cards_data
+
+    @staticmethod
+    def card_template() -> CardManagerCollection:
+        """Returns the unshuffled CardManagerCollection that is loaded once
+        per process (see load_cards) and copied for every game.
+        (The template must not be modified.)
+        """
+        global _CARDS_TEMPLATE
+        if _CARDS_TEMPLATE is None:
+            _CARDS_TEMPLATE = CardGenerator.load_cards()
+        return _CARDS_TEMPLATE
+
+
+# The card template of the process (see CardGenerator.card_template)
+_CARDS_TEMPLATE: Optional[CardManagerCollection] = None
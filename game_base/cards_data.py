@@ -0,0 +1,98 @@
+"""Precompiled card info generated from splendor_cards_list.csv.
+(Generated by CardGenerator.save_to_card_data_module, don't edit manually.)
+
+Each card is (level, prestige points, bonus color, token costs in the order
+of GREEN, WHITE, BLUE, BLACK, RED).
+"""
+CARDS_DATA: tuple[tuple[int, int, str, tuple[int, ...]], ...] = (
+    (1, 0, 'BLACK', (1, 1, 1, 0, 1)),
+    (1, 0, 'BLACK', (1, 1, 2, 0, 1)),
+    (1, 0, 'BLACK', (0, 2, 2, 0, 1)),
+    (1, 0, 'BLACK', (1, 0, 0, 1, 3)),
+    (1, 0, 'BLACK', (2, 0, 0, 0, 1)),
+    (1, 0, 'BLACK', (2, 2, 0, 0, 0)),
+    (1, 0, 'BLACK', (3, 0, 0, 0, 0)),
+    (1, 1, 'BLACK', (0, 0, 4, 0, 0)),
+    (1, 0, 'BLUE', (1, 1, 0, 1, 1)),
+    (1, 0, 'BLUE', (1, 1, 0, 1, 2)),
+    (1, 0, 'BLUE', (2, 1, 0, 0, 2)),
+    (1, 0, 'BLUE', (3, 0, 1, 0, 1)),
+    (1, 0, 'BLUE', (0, 1, 0, 2, 0)),
+    (1, 0, 'BLUE', (2, 0, 0, 2, 0)),
+    (1, 0, 'BLUE', (0, 0, 0, 3, 0)),
+    (1, 1, 'BLUE', (0, 0, 0, 0, 4)),
+    (1, 0, 'WHITE', (1, 0, 1, 1, 1)),
+    (1, 0, 'WHITE', (2, 0, 1, 1, 1)),
+    (1, 0, 'WHITE', (2, 0, 2, 1, 0)),
+    (1, 0, 'WHITE', (0, 3, 1, 1, 0)),
+    (1, 0, 'WHITE', (0, 0, 0, 1, 2)),
+    (1, 0, 'WHITE', (0, 0, 2, 2, 0)),
+    (1, 0, 'WHITE', (0, 0, 3, 0, 0)),
+    (1, 1, 'WHITE', (4, 0, 0, 0, 0)),
+    (1, 0, 'GREEN', (0, 1, 1, 1, 1)),
+    (1, 0, 'GREEN', (0, 1, 1, 2, 1)),
+    (1, 0, 'GREEN', (0, 0, 1, 2, 2)),
+    (1, 0, 'GREEN', (1, 1, 3, 0, 0)),
+    (1, 0, 'GREEN', (0, 2, 1, 0, 0)),
+    (1, 0, 'GREEN', (0, 0, 2, 0, 2)),
+    (1, 0, 'GREEN', (0, 0, 0, 0, 3)),
+    (1, 1, 'GREEN', (0, 0, 0, 4, 0)),
+    (1, 0, 'RED', (1, 1, 1, 1, 0)),
+    (1, 0, 'RED', (1, 2, 1, 1, 0)),
+    (1, 0, 'RED', (1, 2, 0, 2, 0)),
+    (1, 0, 'RED', (0, 1, 0, 3, 1)),
+    (1, 0, 'RED', (1, 0, 2, 0, 0)),
+    (1, 0, 'RED', (0, 2, 0, 0, 2)),
+    (1, 0, 'RED', (0, 3, 0, 0, 0)),
+    (1, 1, 'RED', (0, 4, 0, 0, 0)),
+    (2, 1, 'BLACK', (2, 3, 2, 0, 0)),
+    (2, 1, 'BLACK', (3, 3, 0, 2, 0)),
+    (2, 2, 'BLACK', (4, 0, 1, 0, 2)),
+    (2, 2, 'BLACK', (5, 0, 0, 0, 3)),
+    (2, 2, 'BLACK', (0, 5, 0, 0, 0)),
+    (2, 3, 'BLACK', (0, 0, 0, 6, 0)),
+    (2, 1, 'BLUE', (2, 0, 2, 0, 3)),
+    (2, 1, 'BLUE', (3, 0, 2, 3, 0)),
+    (2, 2, 'BLUE', (0, 5, 3, 0, 0)),
+    (2, 2, 'BLUE', (0, 2, 0, 4, 1)),
+    (2, 2, 'BLUE', (0, 0, 5, 0, 0)),
+    (2, 3, 'BLUE', (0, 0, 6, 0, 0)),
+    (2, 1, 'WHITE', (3, 0, 0, 2, 2)),
+    (2, 1, 'WHITE', (0, 2, 3, 0, 3)),
+    (2, 2, 'WHITE', (1, 0, 0, 2, 4)),
+    (2, 2, 'WHITE', (0, 0, 0, 3, 5)),
+    (2, 2, 'WHITE', (0, 0, 0, 0, 5)),
+    (2, 3, 'WHITE', (0, 6, 0, 0, 0)),
+    (2, 1, 'GREEN', (2, 3, 0, 0, 3)),
+    (2, 1, 'GREEN', (0, 2, 3, 2, 0)),
+    (2, 2, 'GREEN', (0, 4, 2, 1, 0)),
+    (2, 2, 'GREEN', (3, 0, 5, 0, 0)),
+    (2, 2, 'GREEN', (5, 0, 0, 0, 0)),
+    (2, 3, 'GREEN', (6, 0, 0, 0, 0)),
+    (2, 1, 'RED', (0, 2, 0, 3, 2)),
+    (2, 1, 'RED', (0, 0, 3, 3, 2)),
+    (2, 2, 'RED', (2, 1, 4, 0, 0)),
+    (2, 2, 'RED', (0, 3, 0, 5, 0)),
+    (2, 2, 'RED', (0, 0, 0, 5, 0)),
+    (2, 3, 'RED', (0, 0, 0, 0, 6)),
+    (3, 3, 'BLACK', (5, 3, 3, 0, 3)),
+    (3, 4, 'BLACK', (0, 0, 0, 0, 7)),
+    (3, 4, 'BLACK', (3, 0, 0, 3, 6)),
+    (3, 5, 'BLACK', (0, 0, 0, 3, 7)),
+    (3, 3, 'BLUE', (3, 3, 0, 5, 3)),
+    (3, 4, 'BLUE', (0, 7, 0, 0, 0)),
+    (3, 4, 'BLUE', (0, 6, 3, 3, 0)),
+    (3, 5, 'BLUE', (0, 7, 3, 0, 0)),
+    (3, 3, 'WHITE', (3, 0, 3, 3, 5)),
+    (3, 4, 'WHITE', (0, 0, 0, 7, 0)),
+    (3, 4, 'WHITE', (0, 3, 0, 6, 3)),
+    (3, 5, 'WHITE', (0, 3, 0, 7, 0)),
+    (3, 3, 'GREEN', (0, 5, 3, 3, 3)),
+    (3, 4, 'GREEN', (0, 0, 7, 0, 0)),
+    (3, 4, 'GREEN', (3, 3, 6, 0, 0)),
+    (3, 5, 'GREEN', (3, 0, 7, 0, 0)),
+    (3, 3, 'RED', (3, 3, 5, 3, 0)),
+    (3, 4, 'RED', (7, 0, 0, 0, 0)),
+    (3, 4, 'RED', (6, 0, 3, 0, 3)),
+    (3, 5, 'RED', (7, 0, 0, 0, 3)),
+)
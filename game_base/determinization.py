@@ -0,0 +1,56 @@
+"""Determinization of the hidden information of a game.
+
+The only hidden information of the game is the order of the cards in the
+decks (cards are only reserved from the tables), so a determinization of
+a game is a random order of the cards left in each deck, which are the
+cards of the level that haven't been seen.
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+from game_base.games import Game
+
+
+@dataclass(slots=True)
+class DeterminizationSampler:
+    """Samples determinizations of games by reshuffling their decks.
+
+    Each deck is reordered by shuffling a preallocated array of the
+    positions of its cards in place, so sampling doesn't allocate any
+    arrays.
+
+    Parameters
+    ----------
+    seed : Optional[int]
+        The seed of the sampler's random number generator.
+    max_deck_size : int
+        The maximum number of cards in a deck.
+    """
+    seed: Optional[int] = None
+    max_deck_size: int = 40
+    generator: np.random.Generator = field(init=False, repr=False)
+    # The positions of the cards in a deck in order & the buffer shuffled
+    # for each deck
+    _positions: np.ndarray = field(init=False, repr=False)
+    _order: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.generator = np.random.default_rng(self.seed)
+        self._positions = np.arange(self.max_deck_size, dtype=np.intp)
+        self._order = np.empty(self.max_deck_size, dtype=np.intp)
+
+    def sample(self, game: Game) -> None:
+        """Reshuffles the cards left in each deck of the game in place
+        (the tables & the hash of the game don't change).
+        (Sample a clone of the game to keep the original order.)"""
+        for deck in game.cards.get_all_decks():
+            num_cards = len(deck)
+            if num_cards < 2:
+                continue
+            if num_cards > self.max_deck_size:
+                raise ValueError(f"The deck has {num_cards} cards, more "
+                                 f"than {self.max_deck_size}")
+            order = self._order[:num_cards]
+            np.copyto(order, self._positions[:num_cards])
+            self.generator.shuffle(order)
+            deck[:] = [deck[position] for position in order.tolist()]
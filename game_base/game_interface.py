@@ -2,13 +2,15 @@ from copy import deepcopy
 from dataclasses import dataclass, field
 from abc import ABC, abstractmethod
 from itertools import combinations
-from typing import Any, Callable
+from typing import Any, Callable, Optional
+import numpy as np
 from game_base.games import Game, GameState
 from game_base.players import Player
-from game_base.actions import (Action, ReserveCard, PurchaseCard,
-                               Reserve2SameColorTokens,
+from game_base.actions import (Action, Reserve2SameColorTokens,
                                Reserve3UniqueColorTokens)
+from game_base.action_sets import STANDARD_CARD_ACTIONS
 from game_base.tokens import Token
+from game_base.observations import ObservationEncoder
 
 
 @dataclass(slots=True)
@@ -69,8 +71,8 @@ class GameInterface(ABC):
 
     @abstractmethod
     def show_game_state(self, dense: bool = True) -> Any:
-        """Abstract method for showing the entire current state of the game."""
-        # TODO: Return a numpy.matrix() for agent interface
+        """Abstract method for showing the entire current state of the game.
+        (Printed for humans, returned as a numpy array for agents.)"""
         pass
 
 
@@ -299,24 +301,24 @@ class CLI(GameInterface):
 
     def can_reserve_card_cmd(self, card_id: str) -> bool:
         card = self.game.get_card_by_id(card_id)
-        action = ReserveCard(card)
+        action = STANDARD_CARD_ACTIONS.reserve(card)
         return super(CLI, self).can_make_move_for_current_player(action)
 
     def reserve_card_cmd(self, card_id: str) -> None:
         card = self.game.get_card_by_id(card_id)
-        action = ReserveCard(card)
+        action = STANDARD_CARD_ACTIONS.reserve(card)
         self._display_action_cmd(action)
         super(CLI, self).make_move_for_current_player(action)
         self._update_card_action_cmd_params(['res', 'buy'])
 
     def can_purchase_card_cmd(self, card_id: str) -> bool:
         card = self.game.get_card_by_id(card_id)
-        action = PurchaseCard(card)
+        action = STANDARD_CARD_ACTIONS.purchase(card)
         return super(CLI, self).can_make_move_for_current_player(action)
 
     def purchase_card_cmd(self, card_id: str) -> None:
         card = self.game.get_card_by_id(card_id)
-        action = PurchaseCard(card)
+        action = STANDARD_CARD_ACTIONS.purchase(card)
         nobles_pre_purchase = deepcopy(self.game.nobles)
         player = self.game.current_player
         self._display_action_cmd(action)
@@ -393,6 +395,9 @@ class CLI(GameInterface):
 @dataclass
 class GameInterfaceAgents(GameInterface):
     """An interface for playing a game with agents."""
+    # Observation encoders of the game by layout (dense or sparse)
+    observation_encoders: dict[bool, ObservationEncoder] = field(
+        default_factory=dict, repr=False)
 
     def run(self) -> None:
         pass
@@ -412,22 +417,30 @@ class GameInterfaceAgents(GameInterface):
     def show_game_cards_on_tables(self) -> None:
         pass
 
-    def show_game_state(self, dense: bool = True) -> None:
-        """Prints the state of the game on the console."""
-        # TODO: implement dense & sparse matrix representations
-        # Ex. dense
-        # Player tokens: [1 3 0 0 0 0 2]
-        # Ex. sparse
-        # Player tokens:
-        # [1 0 0 0 0 0 0]
-        # [0 0 0 0 0 0 0]
-        # [1 1 1 0 0 0 0]
-        # [0 0 0 0 0 0 0]
-        # [0 0 0 0 0 0 0]
-        # [0 0 0 0 0 0 0]
-        # [1 1 0 0 0 0 0]
-        self.show_game_meta_data()
-        self.show_game_nobles()
-        self.show_game_bank()
-        self.show_game_players()
-        self.show_game_cards_on_tables()
+    def show_game_state(self, dense: bool = True) -> Optional[np.ndarray]:
+        """Returns the state of the game from the current player's
+        perspective as an observation vector (see ObservationEncoder),
+        None if the game hasn't started.
+        (The vector is reused between calls, so copy it to keep it.)
+
+        Ex. dense
+        Player tokens: [1 0 3 0 0 2]
+        Ex. sparse
+        Player tokens:
+        [1 0 0 0 0 0 0]
+        [0 0 0 0 0 0 0]
+        [1 1 1 0 0 0 0]
+        [0 0 0 0 0 0 0]
+        [0 0 0 0 0 0 0]
+        [1 1 0 0 0 0 0]
+        """
+        if self.game.meta_data.state == GameState.NOT_STARTED:
+            return None
+        encoder = self.observation_encoders.get(dense)
+        if (encoder is None or
+                encoder.num_players != self.game.num_players or
+                encoder.registry is not self.game.cards.registry):
+            encoder = ObservationEncoder(self.game.num_players, dense=dense,
+                                         registry=self.game.cards.registry)
+            self.observation_encoders[dense] = encoder
+        return encoder.encode(self.game)
@@ -1,13 +1,20 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, InitVar
 from enum import Enum, auto
+from random import Random
 from typing import Optional
+import numpy as np
 from game_base.players import Player
 from game_base.banks import Bank
 from game_base.nobles import Noble, NobleGenerator
 from game_base.cards import CardGenerator, CardManagerCollection
-from game_base.actions import Action
+from game_base.actions import (Action, Reserve3UniqueColorTokens,
+                               Reserve2SameColorTokens, ReserveCard,
+                               PurchaseCard)
 from game_base.cards import Card
-from game_base.action_sets import ActionSet, StandardActionSet
+from game_base.tokens import Token
+from game_base.action_sets import (ActionSet, StandardActionSet,
+                                   LegalActionCache, ACTION_SPACE_SIZE)
+from game_base.zobrist import ZOBRIST_KEYS, noble_key
 
 
 class GameState(Enum):
@@ -26,6 +33,11 @@ class GameMetaData:
     turns_played: int = 0
     curr_player_index: int = 0
 
+    def clone(self) -> 'GameMetaData':
+        """Returns a copy of the meta-data."""
+        return GameMetaData(self.state, self.turns_played,
+                            self.curr_player_index)
+
     def change_game_state(self, new_state: GameState) -> None:
         """Changes the current state of the game."""
         if new_state == GameState.NOT_STARTED:
@@ -39,6 +51,30 @@ class GameMetaData:
         return "\n".join(output)
 
 
+@dataclass(slots=True)
+class UndoRecord:
+    """The state changed by a single move, as needed to undo it.
+    (Created by Game.apply and consumed by Game.undo.)"""
+    action: Action
+    meta_data: GameMetaData
+    bank_tokens: list[int]
+    player_idx: int
+    player_tokens: list[int]
+    player_bonuses: list[int]
+    player_prestige_points: int
+    player_cards_reserved: list[Optional[Card]]
+    player_num_cards_owned: int
+    player_num_nobles_owned: int
+    nobles: list[Noble]
+    # The table slot of the card taken by the move (if any)
+    table_level: Optional[int] = None
+    table_slot: Optional[int] = None
+    table_card: Optional[Card] = None
+    # The deck size before the move (to know if a card was drawn)
+    deck_size: int = 0
+    zobrist_hash: int = 0
+
+
 @dataclass(slots=True)
 class Game:
     """A representation of the whole process of playing the game."""
@@ -51,9 +87,23 @@ class Game:
     players: list[Player] = field(default_factory=list)
     bank: Bank = field(init=False)
     nobles: list[Noble] = field(init=False)
-    cards: CardManagerCollection = field(default_factory=lambda:
-                                         (CardGenerator.generate_cards(shuffled=True)))
+    # (Shuffled cards are generated with the game's random number generator
+    # if no cards are given)
+    cards: CardManagerCollection = None
     possible_actions: ActionSet = field(default_factory=StandardActionSet)
+    # Seed of the game's random number generator (decks & nobles shuffling)
+    seed: InitVar[Optional[int]] = None
+    rng: Random = field(init=False, repr=False, compare=False)
+    # Legal action masks maintained between moves (see track_legal_actions)
+    legal_action_cache: Optional[LegalActionCache] = field(
+        default=None, init=False, repr=False, compare=False)
+    # Check the cached masks against the full computation (for debugging)
+    verify_legal_actions: bool = field(default=False, init=False,
+                                       repr=False, compare=False)
+    # Hash of the game state, updated with every move
+    # (see game_base.zobrist & compute_zobrist_hash)
+    zobrist_hash: int = field(default=0, init=False, repr=False,
+                              compare=False)
     # %% Game properties
 
     @property
@@ -75,9 +125,9 @@ class Game:
         """Returns the card from the table with the given id.
         (Used for human players.)
         """
-        for card in self.cards.get_all_cards_on_tables():
-            if card is not None and card.id == card_id:
-                return card
+        card = self.cards.registry.get_card_by_id(card_id)
+        if card is not None and self.cards.is_card_in_tables(card):
+            return card
         return None
 
     def get_card_by_idx(self, card_idx: int) -> Optional[Card]:
@@ -86,13 +136,61 @@ class Game:
         """
         return self.cards.get_all_cards_on_tables()[card_idx]
 
-    def __post_init__(self) -> None:
+    def get_card_by_index(self, card_index: int) -> Card:
+        """Returns the card with the given index in the card registry,
+        regardless of where the card currently is.
+        (The index of a card is stable for the entire game.)
+        """
+        return self.cards.registry.get_card(card_index)
+
+    def get_card_index(self, card: Card) -> int:
+        """Returns the index of the given card in the card registry."""
+        return self.cards.registry.get_index(card)
+
+    def __post_init__(self, seed: Optional[int]) -> None:
         if self.num_players > self._MAX_PLAYERS:
             raise ValueError("Game can't be initialized with "
                              f"{self.num_players} players")
+        self.rng = Random(seed)
+        if self.cards is None:
+            self.cards = CardGenerator.generate_cards(shuffled=True,
+                                                      rng=self.rng)
         self.meta_data = GameMetaData()
         self.bank = None
         self.nobles = None
+
+    def clone(self, rng: Optional[Random] = None) -> 'Game':
+        """Returns a copy of the game for branching (e.g. in tree search).
+
+        Only the mutable state is copied (meta-data, token amounts, player
+        inventories, table slots & deck order), while the immutable cards,
+        nobles & action set are shared with the original game.
+        (Much faster than copy.deepcopy.)
+
+        Parameters
+        ----------
+        rng : Optional[Random]
+            The random number generator of the copy. By default the copy
+            gets its own generator in the same state as the game's, so
+            drawing from (or reseeding) the copy doesn't change the game's.
+        """
+        game = Game.__new__(Game)
+        game.meta_data = self.meta_data.clone()
+        game.players = [player.clone() for player in self.players]
+        game.bank = None if self.bank is None else self.bank.clone()
+        game.nobles = None if self.nobles is None else self.nobles.copy()
+        game.cards = self.cards.clone()
+        game.possible_actions = self.possible_actions
+        if rng is None:
+            # (Without seeding it, as its state is replaced)
+            rng = Random.__new__(Random)
+            rng.setstate(self.rng.getstate())
+        game.rng = rng
+        game.legal_action_cache = (None if self.legal_action_cache is None
+                                   else self.legal_action_cache.clone())
+        game.verify_legal_actions = self.verify_legal_actions
+        game.zobrist_hash = self.zobrist_hash
+        return game
     # %% Game initialization methods
 
     def can_add_player(self, player: Player) -> bool:
@@ -147,9 +245,39 @@ class Game:
             raise ValueError("Game can't be initialized")
         # Generate the game assets
         self.bank = Bank(self.num_players)
-        self.nobles = NobleGenerator.generate_nobles(self.num_players)
+        self.nobles = NobleGenerator.generate_nobles(self.num_players,
+                                                     rng=self.rng)
         self.meta_data.change_game_state(GameState.IN_PROGRESS)
         self.cards.fill_tables()
+        self._invalidate_legal_actions()
+        self.zobrist_hash = self.compute_zobrist_hash()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        """Starts a new game with the same players, reusing the existing
+        objects of the game (only their contents are rewritten).
+        (Reseeds the random number generator if a seed is given, then a game
+        is the same as a new one with the same seed & players.)"""
+        if self.num_players < self._MIN_PLAYERS:
+            raise ValueError("Game can't be reset with "
+                             f"{self.num_players} players")
+        if seed is not None:
+            self.rng.seed(seed)
+        self.cards.reset()
+        self.cards.shuffle_decks(self.rng)
+        for player in self.players:
+            player.reset()
+        if self.bank is None:
+            self.bank = Bank(self.num_players)
+        else:
+            self.bank.reset()
+        self.nobles = NobleGenerator.generate_nobles(self.num_players,
+                                                     rng=self.rng)
+        self.meta_data.state = GameState.IN_PROGRESS
+        self.meta_data.turns_played = 0
+        self.meta_data.curr_player_index = 0
+        self.cards.fill_tables()
+        self._invalidate_legal_actions()
+        self.zobrist_hash = self.compute_zobrist_hash()
 
     # %% Active game methods
     def is_final_turn(self) -> bool:
@@ -180,11 +308,18 @@ class Game:
             if self.current_player.is_eligible_for_noble(noble):
                 self.current_player.add_noble(noble)
                 self.nobles.remove(noble)
+                key = noble_key(noble)
+                self.zobrist_hash ^= (
+                    ZOBRIST_KEYS.key('noble', key) ^
+                    ZOBRIST_KEYS.key('noble_owned', self.current_player_idx,
+                                     key))
                 break
 
     def _end_player_turn(self) -> None:
         """Updates everything turn-related automatically after player
         performs an action."""
+        self.zobrist_hash ^= ZOBRIST_KEYS.key('side',
+                                              self.current_player_idx)
         # If all the players made their turn
         if self.current_player_idx + 1 == self.num_players:
             if self.is_final_turn():
@@ -196,30 +331,323 @@ class Game:
         else:
             # Continue the game with the next player to move
             self.meta_data.curr_player_index += 1
+        self.zobrist_hash ^= ZOBRIST_KEYS.key('side',
+                                              self.current_player_idx)
 
     def can_make_move_for_current_player(self, action: Action) -> bool:
         """Checks if the given action can be performed for the current
         player's move.
         """
+        return self._move_payment(action) is not None
+
+    def _move_payment(self, action: Action) -> Optional[dict[Token, int]]:
+        """Returns the tokens the current player pays for the given action
+        (see Player.card_payment, empty if it isn't a purchase), None if it
+        can't be performed as their move.
+        (So a purchase computes its payment once, for the checks & the
+        purchase.)"""
         if hasattr(action, 'card'):
-            if ((action.card not in self.cards.get_all_cards_on_tables() and
-                 action.card not in self.current_player.cards_reserved) or
-                    action.card is None):
-                return False
-        return (self.meta_data.state == GameState.IN_PROGRESS and
-                action.can_perform(self.current_player, self.bank))
+            # Cards are interned, so the membership checks are by identity
+            if (action.card is None or
+                    (not self.cards.is_card_in_tables(action.card) and
+                     action.card not in self.current_player.cards_reserved)):
+                return None
+        if self.meta_data.state != GameState.IN_PROGRESS:
+            return None
+        if isinstance(action, PurchaseCard):
+            return self.current_player.card_payment(action.card)
+        return ({} if action.can_perform(self.current_player, self.bank)
+                else None)
 
     def make_move_for_current_player(self, action: Action) -> None:
         """Performs the given action as the player's move and iterate the
         current player index.
         (Automatically makes the noble check after the action is performed.)
         """
-        if not self.can_make_move_for_current_player(action):
+        payment = self._move_payment(action)
+        if payment is None:
             raise ValueError(f"Player {self.current_player.id} can't {action}")
-        action.perform(player=self.current_player, bank=self.bank)
+        player_idx = self.current_player_idx
+        player = self.current_player
+        table_slot = None
+        card = getattr(action, 'card', None)
+        reserved_slot = (player.cards_reserved.index(card)
+                         if card in player.cards_reserved else None)
+        transfer = self._token_transfer(action, payment)
+        if transfer is None:
+            bank_tokens = self.bank.token_available.counts.copy()
+            player_tokens = player.token_reserved.counts.copy()
+        if isinstance(action, PurchaseCard):
+            action.perform(player=player, bank=self.bank, payment=payment)
+        else:
+            action.perform(player=player, bank=self.bank)
+        if transfer is None:
+            self.zobrist_hash ^= (
+                ZOBRIST_KEYS.counts_delta('bank', None, bank_tokens,
+                                          self.bank.token_available.counts) ^
+                ZOBRIST_KEYS.counts_delta('tokens', player_idx, player_tokens,
+                                          player.token_reserved.counts))
+        else:
+            self._hash_token_transfer(player_idx, transfer)
         # If action with card wasn't purchasing a reserved card.
         if hasattr(action, 'card'):
+            self._hash_card_action(card, player_idx, reserved_slot)
             if self.cards.is_card_in_tables(action.card):
-                self.cards.remove_card_from_tables(action.card)
+                if self.legal_action_cache is not None:
+                    table_slot = self.cards.get_all_cards_on_tables().index(
+                        action.card)
+                self._remove_card_from_tables(action.card)
         self.noble_check_for_current_player()
         self._end_player_turn()
+        if self.legal_action_cache is not None:
+            self.legal_action_cache.update(
+                self.players, self.bank, self.cards.get_all_cards_on_tables(),
+                player_idx, table_slot)
+
+    def _token_transfer(self, action: Action, payment: dict[Token, int]
+                        ) -> Optional[dict[Token, int]]:
+        """Returns the tokens the action will move from the bank to the
+        current player (negative amounts are paid to the bank, given by the
+        payment of a purchase, see _move_payment), None if it isn't a
+        standard action.
+        (So the hash is updated without copying the token counts.)"""
+        player = self.current_player
+        if isinstance(action, Reserve3UniqueColorTokens):
+            return dict.fromkeys(action.colors, 1)
+        if isinstance(action, Reserve2SameColorTokens):
+            return {action.color: 2}
+        if isinstance(action, ReserveCard):
+            # (The same check as ReserveCard.perform)
+            single_wildcard = {Token.YELLOW: 1}
+            if (self.bank.can_remove_token(single_wildcard) and
+                    player.can_add_token(single_wildcard)):
+                return single_wildcard
+            return {}
+        if isinstance(action, PurchaseCard):
+            return {color: -amount for color, amount in payment.items()}
+        return None
+
+    def _hash_token_transfer(self, player_idx: int,
+                             transfer: dict[Token, int]) -> None:
+        """Updates the hash for the tokens that were just moved from the bank
+        to the player (see _token_transfer)."""
+        keys = ZOBRIST_KEYS
+        bank_counts = self.bank.token_available.counts
+        player_counts = self.players[player_idx].token_reserved.counts
+        for color, amount in transfer.items():
+            if amount:
+                color_idx = color.ordinal
+                bank = bank_counts[color_idx]
+                tokens = player_counts[color_idx]
+                self.zobrist_hash ^= (
+                    keys.key('bank', None, color_idx, bank + amount) ^
+                    keys.key('bank', None, color_idx, bank) ^
+                    keys.key('tokens', player_idx, color_idx,
+                             tokens - amount) ^
+                    keys.key('tokens', player_idx, color_idx, tokens))
+
+    def _remove_card_from_tables(self, card: Card) -> None:
+        """Removes the card from its table slot (replacing it with a card
+        from the deck if possible) & updates the hash for the slot."""
+        manager = self.cards.get_manager(card.level)
+        position = manager.table.index(card)
+        self.cards.remove_card_from_tables(card)
+        replacement = manager.table[position]
+        keys = ZOBRIST_KEYS
+        self.zobrist_hash ^= keys.key('table', card.level, position, card)
+        if replacement is not None:
+            self.zobrist_hash ^= (
+                keys.key('table', card.level, position, replacement) ^
+                keys.key('deck', replacement))
+
+    def _hash_card_action(self, card: Card, player_idx: int,
+                          reserved_slot: Optional[int]) -> None:
+        """Updates the hash for the card that was just reserved or purchased
+        by the player, from the given reserved slot if it was reserved.
+        (The table slot is updated when it is emptied.)"""
+        player = self.players[player_idx]
+        keys = ZOBRIST_KEYS
+        if card in player.cards_reserved:
+            self.zobrist_hash ^= keys.key('reserved', player_idx,
+                                          player.cards_reserved.index(card),
+                                          card)
+            return
+        # A purchase from the table or the reserved cards
+        if reserved_slot is not None:
+            self.zobrist_hash ^= keys.key('reserved', player_idx,
+                                          reserved_slot, card)
+        self.zobrist_hash ^= keys.key('owned', player_idx, card)
+        bonus_idx = card.bonus_color.ordinal
+        bonus = player.bonus_owned.counts[bonus_idx]
+        self.zobrist_hash ^= (keys.key('bonuses', player_idx, bonus_idx,
+                                       bonus - 1) ^
+                              keys.key('bonuses', player_idx, bonus_idx,
+                                       bonus))
+
+    def compute_zobrist_hash(self) -> int:
+        """Computes the hash of the game state from scratch
+        (see game_base.zobrist).
+        (The same as zobrist_hash, which is updated with every move.)"""
+        if self.bank is None:
+            return 0
+        keys = ZOBRIST_KEYS
+        zobrist_hash = keys.key('side', self.current_player_idx)
+        for color_idx, count in enumerate(self.bank.token_available.counts):
+            zobrist_hash ^= keys.key('bank', None, color_idx, count)
+        for seat, player in enumerate(self.players):
+            for color_idx, count in enumerate(player.token_reserved.counts):
+                zobrist_hash ^= keys.key('tokens', seat, color_idx, count)
+            for color_idx, count in enumerate(player.bonus_owned.counts):
+                zobrist_hash ^= keys.key('bonuses', seat, color_idx, count)
+            for slot, card in enumerate(player.cards_reserved):
+                if card is not None:
+                    zobrist_hash ^= keys.key('reserved', seat, slot, card)
+            for card in player.cards_owned:
+                zobrist_hash ^= keys.key('owned', seat, card)
+            for noble in player.nobles_owned:
+                zobrist_hash ^= keys.key('noble_owned', seat,
+                                         noble_key(noble))
+        for manager in self.cards.managers:
+            for position, card in enumerate(manager.table):
+                if card is not None:
+                    zobrist_hash ^= keys.key('table', manager.card_level,
+                                             position, card)
+            for card in manager.deck:
+                zobrist_hash ^= keys.key('deck', card)
+        for noble in self.nobles:
+            zobrist_hash ^= keys.key('noble', noble_key(noble))
+        return zobrist_hash
+
+    # %% Incremental legal actions
+    def track_legal_actions(self, enabled: bool = True,
+                            verify: bool = False) -> None:
+        """Maintains the legal action masks incrementally between moves
+        instead of computing them from scratch for every legal_action_mask
+        call (see LegalActionCache).
+
+        Parameters
+        ----------
+        enabled : bool
+            Whether to maintain the masks.
+        verify : bool
+            Check every cached mask against the full computation
+            (raises RuntimeError if they differ, for debugging).
+        """
+        self.legal_action_cache = (LegalActionCache(self.num_players)
+                                   if enabled else None)
+        self.verify_legal_actions = verify
+
+    def _invalidate_legal_actions(self) -> None:
+        """Rebuilds the legal action masks when they're next used.
+        (Needed after changes to the game that aren't moves.)"""
+        if self.legal_action_cache is not None:
+            self.legal_action_cache.invalidate()
+
+    def legal_action_mask(self,
+                          out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns a boolean mask of the legal moves for the current player
+        over the fixed action space (see game_base.action_sets).
+        (The mask is written into out if it is given.)"""
+        if self.meta_data.state != GameState.IN_PROGRESS:
+            if out is None:
+                return np.zeros(ACTION_SPACE_SIZE, dtype=bool)
+            out.fill(0)
+            return out
+        cache = self.legal_action_cache
+        if cache is None:
+            return self.possible_actions.legal_action_mask(
+                self.current_player, self.bank,
+                self.cards.get_all_cards_on_tables(), out=out)
+        if cache.dirty:
+            cache.rebuild(self.players, self.bank,
+                          self.cards.get_all_cards_on_tables())
+        mask = cache.legal_action_mask(self.current_player_idx, out=out)
+        if self.verify_legal_actions:
+            expected = self.possible_actions.legal_action_mask(
+                self.current_player, self.bank,
+                self.cards.get_all_cards_on_tables())
+            if not np.array_equal(mask, expected):
+                raise RuntimeError(
+                    "The cached legal actions "
+                    f"{np.flatnonzero(mask).tolist()} differ from the legal "
+                    f"actions {np.flatnonzero(expected).tolist()}")
+        return mask
+
+    def step(self, action_index: int) -> Action:
+        """Performs the action with the given index in the fixed action space
+        as the player's move (see game_base.action_sets for the layout).
+        Returns the performed action.
+        """
+        action = self.possible_actions.decode_action(
+            action_index, self.current_player,
+            self.cards.get_all_cards_on_tables())
+        if action is None:
+            raise ValueError(f"Player {self.current_player.id} can't make "
+                             f"the move {action_index} with an empty "
+                             "card slot")
+        self.make_move_for_current_player(action)
+        return action
+
+    # %% Reversible move methods
+    def apply(self, action: Action) -> UndoRecord:
+        """Performs the given action as the player's move (the same as
+        make_move_for_current_player) and returns the record needed to
+        undo it.
+
+        Allows searching the game tree on a single game without copying,
+        by pairing every apply with an undo in reverse order.
+        """
+        player = self.current_player
+        bank_tokens = self.bank.token_available.counts
+        record = UndoRecord(action=action,
+                            meta_data=self.meta_data.clone(),
+                            bank_tokens=bank_tokens.copy(),
+                            player_idx=self.current_player_idx,
+                            player_tokens=player.token_reserved.counts.copy(),
+                            player_bonuses=player.bonus_owned.counts.copy(),
+                            player_prestige_points=player.prestige_points,
+                            player_cards_reserved=player.cards_reserved.copy(),
+                            player_num_cards_owned=len(player.cards_owned),
+                            player_num_nobles_owned=len(player.nobles_owned),
+                            nobles=self.nobles.copy(),
+                            zobrist_hash=self.zobrist_hash)
+        card = getattr(action, 'card', None)
+        if card is not None and self.cards.is_card_in_tables(card):
+            manager = self.cards.get_manager(card.level)
+            record.table_level = card.level
+            record.table_slot = manager.table.index(card)
+            record.table_card = card
+            record.deck_size = len(manager.deck)
+        self.make_move_for_current_player(action)
+        return record
+
+    def undo(self, record: UndoRecord) -> None:
+        """Restores the game to the state before the move of the given record.
+        (Records have to be undone in the reverse order they were applied.)
+        """
+        player = self.players[record.player_idx]
+        self.meta_data.state = record.meta_data.state
+        self.meta_data.turns_played = record.meta_data.turns_played
+        self.meta_data.curr_player_index = record.meta_data.curr_player_index
+        self.bank.token_available.counts[:] = record.bank_tokens
+        player.token_reserved.counts[:] = record.player_tokens
+        player.bonus_owned.counts[:] = record.player_bonuses
+        player.prestige_points = record.player_prestige_points
+        player.cards_reserved[:] = record.player_cards_reserved
+        del player.cards_owned[record.player_num_cards_owned:]
+        del player.nobles_owned[record.player_num_nobles_owned:]
+        self.nobles[:] = record.nobles
+        if record.table_card is not None:
+            manager = self.cards.get_manager(record.table_level)
+            # Put the card drawn as a replacement back on top of the deck
+            if len(manager.deck) < record.deck_size:
+                manager.deck.append(manager.table[record.table_slot])
+            manager.table[record.table_slot] = record.table_card
+        self.zobrist_hash = record.zobrist_hash
+        if self.legal_action_cache is not None:
+            # The undo changes the same state as the move
+            cards = self.cards.get_all_cards_on_tables()
+            self.legal_action_cache.update(
+                self.players, self.bank, cards, record.player_idx,
+                None if record.table_card is None
+                else cards.index(record.table_card))
@@ -1,6 +1,7 @@
 from dataclasses import dataclass, field, InitVar
-from random import shuffle
-from game_base.tokens import Token, TokenBag
+from random import Random, shuffle
+from typing import Optional
+from game_base.tokens import Token, ArrayTokenBag
 
 
 @dataclass(frozen=True, slots=True)
@@ -11,13 +12,13 @@ class Noble:
     # Number of prestige points the noble is worth
     prestige_points: int = 3
     # Number of bonuses per color required to acquire noble (constant values!)
-    bonus_required: TokenBag = field(default_factory=TokenBag)
+    bonus_required: ArrayTokenBag = field(default_factory=ArrayTokenBag)
 
     def __post_init__(self, input_bonuses: dict[Token, int]) -> None:
         if all(cost == 0 for cost in input_bonuses.values()):
             raise ValueError("A noble can't require nothing.")
         self.bonus_required.add(input_bonuses)
-        if self.bonus_required.tokens[Token.YELLOW]:
+        if self.bonus_required.counts[Token.YELLOW.ordinal]:
             raise ValueError("A noble can't require wildcard bonuses")
 
     def __str__(self) -> str:
@@ -52,8 +53,17 @@ class NobleGenerator:
                        Token.BLACK: 3, Token.RED: 3})]
 
     @staticmethod
-    def generate_nobles(num_players: int = 4) -> list[Noble]:
-        """Returns n + 1 nobles for n players from a shuffled list."""
-        shuffled_nobles = NobleGenerator.default_nobles_list()
-        shuffle(shuffled_nobles)
+    def generate_nobles(num_players: int = 4,
+                        rng: Optional[Random] = None) -> list[Noble]:
+        """Returns n + 1 nobles for n players from a shuffled list.
+        (Shuffled with the given random number generator,
+        else the random module.)"""
+        shuffled_nobles = list(DEFAULT_NOBLES)
+        shuffle_nobles = shuffle if rng is None else rng.shuffle
+        shuffle_nobles(shuffled_nobles)
         return shuffled_nobles[0:num_players + 1]
+
+
+# The default nobles shared by all games (nobles are immutable)
+DEFAULT_NOBLES: tuple[Noble, ...] = tuple(NobleGenerator
+                                          .default_nobles_list())
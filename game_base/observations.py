@@ -0,0 +1,231 @@
+from dataclasses import dataclass, field
+from typing import Optional
+import numpy as np
+from game_base.tokens import NUM_TOKEN_COLORS
+from game_base.cards import Card, CardGenerator, CardRegistry
+from game_base.nobles import Noble, DEFAULT_NOBLES
+from game_base.games import Game
+from game_base.tables import NUM_BONUS_COLORS
+from game_base.action_sets import NUM_TABLE_SLOTS, NUM_RESERVED_SLOTS
+
+# Counts >= this are encoded as this in the sparse layout
+MAX_SPARSE_COUNT: int = 7
+# Unary encoding of each count (count -> [1] * count + [0] * (max - count))
+# Ex. 3 -> [1 1 1 0 0 0 0]
+UNARY_COUNTS: np.ndarray = np.tri(MAX_SPARSE_COUNT + 1, MAX_SPARSE_COUNT,
+                                  k=-1)
+# Number of features of each count in the dense/sparse layout
+COUNT_WIDTH: dict[bool, int] = {True: 1, False: MAX_SPARSE_COUNT}
+
+
+def card_features(card: Optional[Card], dense: bool) -> list[int]:
+    """Returns the features of a card slot:
+    [occupied, prestige points, costs per color, bonus color (one-hot)]
+    (The costs are unary encoded in the sparse layout.)"""
+    if card is None:
+        return [0] * (2 + NUM_BONUS_COLORS * COUNT_WIDTH[dense] +
+                      NUM_BONUS_COLORS)
+    costs = card.token_cost.counts[:NUM_BONUS_COLORS]
+    if not dense:
+        costs = UNARY_COUNTS[np.minimum(costs, MAX_SPARSE_COUNT)].ravel()
+    bonus_color = [0] * NUM_BONUS_COLORS
+    bonus_color[card.bonus_color.ordinal] = 1
+    return [1, card.prestige_points, *costs, *bonus_color]
+
+
+def noble_features(noble: Optional[Noble], dense: bool) -> list[int]:
+    """Returns the features of a noble slot:
+    [present, prestige points, bonuses required per color]
+    (The bonuses are unary encoded in the sparse layout.)"""
+    if noble is None:
+        return [0] * (2 + NUM_BONUS_COLORS * COUNT_WIDTH[dense])
+    bonuses = noble.bonus_required.counts[:NUM_BONUS_COLORS]
+    if not dense:
+        bonuses = UNARY_COUNTS[np.minimum(bonuses, MAX_SPARSE_COUNT)].ravel()
+    return [1, noble.prestige_points, *bonuses]
+
+
+@dataclass(slots=True)
+class ObservationEncoder:
+    """Encodes the public state of a game from the current player's
+    perspective into a vector that is reused for every call.
+    (Only the vector & the index buffers are preallocated: copying the
+    token counts of the game's lists still makes small temporary arrays.)
+
+    The players are ordered starting from the observing player (the current
+    player by default). The vector consists of the following blocks
+    (see layout for their positions):
+        counts  : the tokens of the bank, then the tokens & bonuses of
+                  each player
+        players : the prestige points, number of reserved cards & number
+                  of nobles of each player
+        cards   : the table slots (level 1 first), then the reserved slots
+                  of each player (see card_features)
+        nobles  : the noble slots (see noble_features)
+        turn    : turns played, the observing player's index (one-hot)
+                  & whether the final turn is being played
+
+    The dense layout holds the counts as numbers, while the sparse layout
+    holds every count (of tokens, bonuses, costs & requirements) in unary,
+    ex. 3 green tokens -> [1 1 1 0 0 0 0].
+
+    Parameters
+    ----------
+    num_players : int
+        The number of players in the encoded games.
+    dense : bool
+        Whether to use the dense or the sparse layout.
+    hide_opponents_reserved : bool
+        Only encode whether the opponents' reserved slots are occupied.
+    registry : CardRegistry
+        The registry of the cards in the encoded games.
+    dtype : type
+        The type of the observation vector.
+    """
+    num_players: int
+    dense: bool = True
+    hide_opponents_reserved: bool = False
+    registry: CardRegistry = field(default_factory=lambda: (
+        CardGenerator.card_template().registry), repr=False)
+    dtype: type = np.float32
+    # The positions of the blocks in the observation vector
+    layout: dict[str, slice] = field(init=False, repr=False)
+    observation: np.ndarray = field(init=False, repr=False)
+    # Feature tables indexed by card/noble index (last rows for empty slots
+    # & hidden cards)
+    card_table: np.ndarray = field(init=False, repr=False)
+    noble_table: np.ndarray = field(init=False, repr=False)
+    unary_table: np.ndarray = field(init=False, repr=False)
+    # Preallocated buffers & views of the observation vector
+    _counts: np.ndarray = field(init=False, repr=False)
+    _card_indices: np.ndarray = field(init=False, repr=False)
+    _noble_indices: np.ndarray = field(init=False, repr=False)
+    _card_index_by_card: dict[Optional[Card], int] = field(init=False,
+                                                           repr=False)
+    _noble_index_by_id: dict[int, int] = field(init=False, repr=False)
+    _views: dict[str, np.ndarray] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        num_cards = len(self.registry)
+        hidden_card = card_features(None, self.dense)
+        hidden_card[0] = 1
+        self.card_table = np.array(
+            [card_features(card, self.dense) for card in self.registry.cards]
+            + [card_features(None, self.dense), hidden_card], dtype=self.dtype)
+        self.noble_table = np.array(
+            [noble_features(noble, self.dense) for noble in DEFAULT_NOBLES]
+            + [noble_features(None, self.dense)], dtype=self.dtype)
+        self.unary_table = UNARY_COUNTS.astype(self.dtype)
+        # (Cards are interned & hashed by identity)
+        self._card_index_by_card = {card: card_idx for card_idx, card
+                                    in enumerate(self.registry.cards)}
+        self._card_index_by_card[None] = num_cards
+        self._noble_index_by_id = {id(noble): noble_idx for noble_idx, noble
+                                   in enumerate(DEFAULT_NOBLES)}
+        num_counts = NUM_TOKEN_COLORS + self.num_players * (
+            NUM_TOKEN_COLORS + NUM_BONUS_COLORS)
+        num_card_slots = (NUM_TABLE_SLOTS +
+                          self.num_players * NUM_RESERVED_SLOTS)
+        num_noble_slots = self.num_players + 1
+        block_sizes = {
+            'counts': num_counts * COUNT_WIDTH[self.dense],
+            'players': self.num_players * 3,
+            'cards': num_card_slots * self.card_table.shape[1],
+            'nobles': num_noble_slots * self.noble_table.shape[1],
+            'turn': 1 + self.num_players + 1}
+        self.layout = {}
+        start = 0
+        for block, size in block_sizes.items():
+            self.layout[block] = slice(start, start + size)
+            start += size
+        self.observation = np.zeros(start, dtype=self.dtype)
+        self._counts = np.zeros(num_counts, dtype=np.intp)
+        self._card_indices = np.full(num_card_slots, num_cards,
+                                     dtype=np.intp)
+        self._noble_indices = np.full(num_noble_slots, len(DEFAULT_NOBLES),
+                                      dtype=np.intp)
+        views = {block: self.observation[block_slice]
+                 for block, block_slice in self.layout.items()}
+        if not self.dense:
+            views['counts'] = views['counts'].reshape(num_counts,
+                                                      MAX_SPARSE_COUNT)
+        views['cards'] = views['cards'].reshape(num_card_slots, -1)
+        views['nobles'] = views['nobles'].reshape(num_noble_slots, -1)
+        self._views = views
+
+    @property
+    def size(self) -> int:
+        """The length of the observation vector."""
+        return len(self.observation)
+
+    def _card_index(self, card: Optional[Card], hidden: bool) -> int:
+        if hidden and card is not None:
+            return len(self.registry) + 1
+        card_idx = self._card_index_by_card.get(card)
+        return self.registry.get_index(card) if card_idx is None else card_idx
+
+    def _noble_index(self, noble: Noble) -> int:
+        noble_idx = self._noble_index_by_id.get(id(noble))
+        return (DEFAULT_NOBLES.index(noble) if noble_idx is None
+                else noble_idx)
+
+    def encode(self, game: Game,
+               player_idx: Optional[int] = None) -> np.ndarray:
+        """Encodes the state of the game from the perspective of the player
+        with the given index (the current player by default) into the
+        observation vector.
+        (The same vector is returned for every call, so copy it to keep it.)
+        """
+        if game.num_players != self.num_players:
+            raise ValueError(f"The game has {game.num_players} players "
+                             f"instead of {self.num_players}")
+        views = self._views
+        counts = self._counts
+        card_indices = self._card_indices
+        if player_idx is None:
+            player_idx = game.current_player_idx
+        counts[:NUM_TOKEN_COLORS] = game.bank.token_available.counts
+        count_idx = NUM_TOKEN_COLORS
+        card_slot = NUM_TABLE_SLOTS
+        players_view = views['players']
+        for seat in range(self.num_players):
+            player = game.players[(player_idx + seat) % self.num_players]
+            counts[count_idx:count_idx + NUM_TOKEN_COLORS] = (
+                player.token_reserved.counts)
+            count_idx += NUM_TOKEN_COLORS
+            counts[count_idx:count_idx + NUM_BONUS_COLORS] = (
+                player.bonus_owned.counts[:NUM_BONUS_COLORS])
+            count_idx += NUM_BONUS_COLORS
+            players_view[3 * seat] = player.prestige_points
+            players_view[3 * seat + 1] = player.num_reserved_cards
+            players_view[3 * seat + 2] = len(player.nobles_owned)
+            hidden = seat > 0 and self.hide_opponents_reserved
+            for card in player.cards_reserved:
+                card_indices[card_slot] = self._card_index(card, hidden)
+                card_slot += 1
+        if self.dense:
+            np.copyto(views['counts'], counts)
+        else:
+            np.minimum(counts, MAX_SPARSE_COUNT, out=counts)
+            np.take(self.unary_table, counts, axis=0, out=views['counts'],
+                    mode='clip')
+        card_slot = 0
+        card_index = self._card_index
+        for manager in game.cards.managers:
+            for card in manager.table:
+                card_indices[card_slot] = card_index(card, False)
+                card_slot += 1
+        np.take(self.card_table, card_indices, axis=0, out=views['cards'],
+                mode='clip')
+        noble_indices = self._noble_indices
+        noble_indices.fill(len(DEFAULT_NOBLES))
+        for noble_slot, noble in enumerate(game.nobles):
+            noble_indices[noble_slot] = self._noble_index(noble)
+        np.take(self.noble_table, noble_indices, axis=0, out=views['nobles'],
+                mode='clip')
+        turn_view = views['turn']
+        turn_view.fill(0)
+        turn_view[0] = game.meta_data.turns_played
+        turn_view[1 + player_idx] = 1
+        turn_view[-1] = game.is_final_turn()
+        return self.observation
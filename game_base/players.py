@@ -1,7 +1,9 @@
 from dataclasses import dataclass, field
+from typing import Optional, Sequence
+import numpy as np
 from game_base.cards import Card
 from game_base.nobles import Noble
-from game_base.tokens import Token, TokenBag
+from game_base.tokens import Token, ArrayTokenBag, NUM_TOKEN_COLORS
 
 
 @dataclass(slots=True)
@@ -11,19 +13,39 @@ class Player:
     # TODO make it a user account with elo (in the future)
     # For now just use a string name
     id: str
-    token_reserved: TokenBag = field(default_factory=TokenBag)
+    token_reserved: ArrayTokenBag = field(default_factory=ArrayTokenBag)
     cards_reserved: list[Card] = field(default_factory=lambda: [None] * 3)
     cards_owned: list[Card] = field(default_factory=list)
     # Bonuses from Owned Cards, Wildcard in TokenBag is unused
-    bonus_owned: TokenBag = field(default_factory=TokenBag)
+    bonus_owned: ArrayTokenBag = field(default_factory=ArrayTokenBag)
     nobles_owned: list[Noble] = field(default_factory=list)
     # Metric for winning the game. >= 15 is eligible to win the game
     prestige_points: int = 0
 
+    def clone(self) -> 'Player':
+        """Returns a copy of the player with its own tokens & card slots.
+        (The cards & nobles themselves are immutable and shared.)"""
+        return Player(self.id, self.token_reserved.clone(),
+                      self.cards_reserved.copy(), self.cards_owned.copy(),
+                      self.bonus_owned.clone(), self.nobles_owned.copy(),
+                      self.prestige_points)
+
+    def reset(self) -> None:
+        """Empties the player's inventory in place (for a new game)."""
+        self.token_reserved.counts[:] = [0] * NUM_TOKEN_COLORS
+        self.cards_reserved[:] = [None] * len(self.cards_reserved)
+        self.cards_owned.clear()
+        self.bonus_owned.counts[:] = [0] * NUM_TOKEN_COLORS
+        self.nobles_owned.clear()
+        self.prestige_points = 0
+
     def can_remove_token(self, amount_to_remove: dict[Token, int]) -> bool:
         """Check if tokens of given colors can be removed."""
-        return all([(self.token_reserved.tokens[color] - amount_to_remove[color]
-                     >= 0) for color in amount_to_remove])
+        reserved = self.token_reserved.counts
+        for color, amount in amount_to_remove.items():
+            if reserved[color.ordinal] < amount:
+                return False
+        return True
 
     def remove_token(self, amount_to_remove: dict[Token, int]) -> None:
         """Remove tokens of given colors by the amount given for each.
@@ -39,7 +61,7 @@ class Player:
 
     def can_add_token(self, amount_to_add: dict[Token, int]) -> bool:
         """Check if tokens of given colors can be added."""
-        return (sum(self.token_reserved.tokens.values()) +
+        return (sum(self.token_reserved.counts) +
                 sum(amount_to_add.values()) <= 10)
 
     def add_token(self, amount_to_add: dict[Token, int]) -> None:
@@ -108,29 +130,29 @@ class Player:
         card : Card
             The card that the player wants to purchase.
         """
-        collateral_wildcards = 0
-        color_costs = card.token_cost.tokens
-        for color in color_costs:
-            player_buying_power = (self.bonus_owned.tokens[color] +
-                                   self.token_reserved.tokens[color])
-            # If the card can be purchased without wildcards
-            if color_costs[color] <= player_buying_power:
-                continue
-            # If the card can be purchased with wildcards
-            # that weren't reserved for previous costs
-            # in the card requirements
-            elif color_costs[color] <= (player_buying_power +
-                                        self.token_reserved.tokens[Token.YELLOW]
-                                        - collateral_wildcards):
-                # Add the remainder of the cost to the number of
-                # collateral wildcards for the purchase
-                collateral_wildcards += (color_costs[color] -
-                                         player_buying_power)
-                continue
-            # Else the card can't be purchased
-            else:
-                return False
-        return True
+        return self.card_payment(card) is not None
+
+    def affordable_cards(self, card_indices: Sequence[int]
+                         ) -> tuple[np.ndarray, np.ndarray]:
+        """Check which of the given cards the player can purchase, all at
+        once (see can_purchase_card).
+
+        Parameters
+        ----------
+        card_indices : Sequence[int]
+            The indices of the standard cards (see game_base.tables).
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Whether each card is affordable
+            & the token amounts that would be paid for it
+            (num. cards x num. token colors, see purchase_card).
+        """
+        # (Imported here, as the tables build the standard cards)
+        from game_base.tables import NUM_BONUS_COLORS, affordable_cards
+        return affordable_cards(
+            np.array(self.token_reserved.counts),
+            np.array(self.bonus_owned.counts[:NUM_BONUS_COLORS]),
+            np.asarray(card_indices, dtype=np.intp))
 
     def add_to_owned_cards(self, card: Card) -> None:
         """Add card to list of owned cards.
@@ -146,10 +168,36 @@ class Player:
         if card in self.cards_reserved:
             self.remove_from_reserved_cards(card)
         self.cards_owned.append(card)
-        self.bonus_owned.add({card.bonus_color: 1})
+        self.bonus_owned.counts[card.bonus_color.ordinal] += 1
         self.prestige_points += card.prestige_points
 
-    def purchase_card(self, card: Card) -> dict[Token, int]:
+    def card_payment(self, card: Card) -> Optional[dict[Token, int]]:
+        """Returns the token amounts the player would pay for the given card
+        (see purchase_card), None if they can't purchase it.
+
+        Parameters
+        ----------
+        card : Card
+            The card that the player wants to purchase.
+        """
+        payment = {Token.YELLOW: 0}
+        for color, cost, bonus, reserved in zip(Token,
+                                                card.token_cost.counts,
+                                                self.bonus_owned.counts,
+                                                self.token_reserved.counts):
+            if color == Token.YELLOW:
+                continue
+            discounted_cost = max(cost - bonus, 0)
+            payment[color] = min(discounted_cost, reserved)
+            payment[Token.YELLOW] += discounted_cost - payment[color]
+        if (payment[Token.YELLOW] >
+                self.token_reserved.counts[Token.YELLOW.ordinal]):
+            return None
+        return payment
+
+    def purchase_card(self, card: Card,
+                      payment: Optional[dict[Token, int]] = None
+                      ) -> dict[Token, int]:
         """Purchases the given card for the player.
 
         The process of purchasing a card follows this process for each color
@@ -166,31 +214,26 @@ class Player:
             player's inventory.
 
         Post-purchase, the card is added to the player's owned cards.
+        (The payment is computed & checked in a single pass, see
+        card_payment.)
 
         Parameters
         ----------
         card : Card
             The card that the player wants to purchase.
+        payment : Optional[dict[Token, int]]
+            The payment of the card already computed by card_payment
+            (computed & checked here if it isn't given).
 
         Returns:
             dict[Token, int]: The token amounts that are removed from the
             player and are to be returned to the bank.
         """
+        removed_tokens = (self.card_payment(card) if payment is None
+                          else payment)
         # Sanity check
-        if not self.can_purchase_card(card):
+        if removed_tokens is None:
             raise ValueError(f"Player {self.id} can't purchase {card}.")
-
-        removed_tokens = {Token.YELLOW: 0}
-        color_costs = card.token_cost.tokens
-        for color in color_costs:
-            if color == Token.YELLOW:
-                continue
-            discounted_cost = max((color_costs[color] -
-                                   self.bonus_owned.tokens[color]), 0)
-            removed_tokens[color] = min(discounted_cost,
-                                        self.token_reserved.tokens[color])
-            removed_tokens[Token.YELLOW] += (discounted_cost -
-                                             removed_tokens[color])
         self.token_reserved.remove(removed_tokens)
         self.add_to_owned_cards(card)
         return removed_tokens
@@ -203,9 +246,7 @@ class Player:
         noble : Noble
             The noble whose bonuses we check against
         """
-        return all([(self.bonus_owned.tokens[color] >=
-                     noble.bonus_required.tokens[color])
-                    for color in noble.bonus_required.tokens])
+        return self.bonus_owned >= noble.bonus_required
 
     def add_noble(self, noble: Noble) -> None:
         """Add noble to list of owned nobles.
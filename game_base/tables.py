@@ -0,0 +1,91 @@
+"""Static NumPy tables of the standard cards, nobles & token actions,
+built once at import.
+
+Cards are indexed by their index in the card registry of the card template
+(see CardGenerator.card_template) and nobles by their index in
+DEFAULT_NOBLES. The color columns are in the order of the token ordinals
+without the wildcard (GREEN, WHITE, BLUE, BLACK, RED).
+(The token action table TOKEN_ACTION_DELTAS is in game_base.action_sets.)
+
+The tables are read-only, as they are shared by all games.
+"""
+import numpy as np
+from game_base.tokens import NUM_TOKEN_COLORS
+from game_base.cards import CardGenerator, CardRegistry
+from game_base.nobles import DEFAULT_NOBLES
+
+# Number of colors of the card costs, bonuses & noble requirements
+# (the colors without the wildcard)
+NUM_BONUS_COLORS: int = NUM_TOKEN_COLORS - 1
+STANDARD_CARDS: CardRegistry = CardGenerator.card_template().registry
+NUM_CARDS: int = len(STANDARD_CARDS)
+NUM_NOBLES: int = len(DEFAULT_NOBLES)
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+# %% Cards (num. cards x num. bonus colors & num. cards)
+CARD_COSTS: np.ndarray = _read_only(np.array(
+    [card.token_cost.counts[:NUM_BONUS_COLORS]
+     for card in STANDARD_CARDS.cards], dtype=np.int16))
+CARD_LEVELS: np.ndarray = _read_only(np.array(
+    [card.level for card in STANDARD_CARDS.cards], dtype=np.int16))
+CARD_POINTS: np.ndarray = _read_only(np.array(
+    [card.prestige_points for card in STANDARD_CARDS.cards], dtype=np.int16))
+CARD_BONUS_COLORS: np.ndarray = _read_only(np.array(
+    [card.bonus_color.ordinal for card in STANDARD_CARDS.cards],
+    dtype=np.int16))
+# The bonus of each card as a one-hot row
+CARD_BONUSES: np.ndarray = _read_only(
+    np.eye(NUM_BONUS_COLORS, dtype=np.int16)[CARD_BONUS_COLORS])
+
+# %% Nobles (num. nobles x num. bonus colors & num. nobles)
+NOBLE_REQUIREMENTS: np.ndarray = _read_only(np.array(
+    [noble.bonus_required.counts[:NUM_BONUS_COLORS]
+     for noble in DEFAULT_NOBLES], dtype=np.int16))
+NOBLE_POINTS: np.ndarray = _read_only(np.array(
+    [noble.prestige_points for noble in DEFAULT_NOBLES], dtype=np.int16))
+
+
+def affordable_cards(tokens: np.ndarray, bonuses: np.ndarray,
+                     card_indices: np.ndarray
+                     ) -> tuple[np.ndarray, np.ndarray]:
+    """Checks which of the cards can be purchased with the given tokens &
+    bonuses, and the tokens that would be paid for each of them.
+    (Works for a single player or a batch of players/games.)
+
+    The bonuses discount the cost of each color, the tokens of the same
+    color pay the rest and the shortfall is paid with wildcards.
+
+    Parameters
+    ----------
+    tokens : np.ndarray
+        The tokens of the players (..., num. token colors).
+    bonuses : np.ndarray
+        The bonuses of the players (..., num. bonus colors).
+    card_indices : np.ndarray
+        The indices of the cards to check for each player (..., num. cards).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Whether each card is affordable
+        (..., num. cards) & the tokens paid for it, including the
+        wildcards (..., num. cards, num. token colors).
+    """
+    tokens = np.asarray(tokens)
+    bonuses = np.asarray(bonuses)[..., None, :NUM_BONUS_COLORS]
+    # (Computed in place, as the intermediate arrays are the largest ones)
+    discounted_costs = CARD_COSTS[card_indices] - bonuses
+    np.maximum(discounted_costs, 0, out=discounted_costs)
+    payments = np.empty(discounted_costs.shape[:-1] + (NUM_TOKEN_COLORS,),
+                        dtype=discounted_costs.dtype)
+    np.minimum(discounted_costs, tokens[..., None, :NUM_BONUS_COLORS],
+               out=payments[..., :NUM_BONUS_COLORS])
+    # The shortfall is paid with wildcards
+    discounted_costs -= payments[..., :NUM_BONUS_COLORS]
+    discounted_costs.sum(axis=-1, out=payments[..., NUM_BONUS_COLORS])
+    affordable = (payments[..., NUM_BONUS_COLORS] <=
+                  tokens[..., None, NUM_BONUS_COLORS])
+    return affordable, payments
@@ -1,5 +1,6 @@
 from enum import Enum, auto
-from typing import Optional
+from typing import Iterator, Optional
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field, InitVar
 
 
@@ -11,6 +12,10 @@ class Token(Enum):
     RED = auto()
     YELLOW = auto()
 
+    def __init__(self, value: int) -> None:
+        # Position of the color in array-backed token containers
+        self.ordinal = value - 1
+
     def __str__(self) -> str:
         return f"{self.name.lower()}"
 
@@ -63,33 +68,33 @@ class TokenBag:
         return self
 
     def __eq__(self, other):
-        if isinstance(other, TokenBag):
+        if isinstance(other, (TokenBag, ArrayTokenBag)):
             return self.tokens == other.tokens
         return False
 
     def __lt__(self, other):
-        if isinstance(other, TokenBag):
+        if isinstance(other, (TokenBag, ArrayTokenBag)):
             return all([self.tokens[color] < other.tokens[color]
                         for color in self.tokens])
         raise TypeError(
             f"Comparison not supported between 'TokenBag' and {type(other)}")
 
     def __le__(self, other):
-        if isinstance(other, TokenBag):
+        if isinstance(other, (TokenBag, ArrayTokenBag)):
             return all([self.tokens[color] <= other.tokens[color]
                         for color in self.tokens])
         raise TypeError(
             f"Comparison not supported between 'TokenBag' and {type(other)}")
 
     def __gt__(self, other):
-        if isinstance(other, TokenBag):
+        if isinstance(other, (TokenBag, ArrayTokenBag)):
             return all([self.tokens[color] > other.tokens[color]
                         for color in self.tokens])
         raise TypeError(
             f"Comparison not supported between 'TokenBag' and {type(other)}")
 
     def __ge__(self, other):
-        if isinstance(other, TokenBag):
+        if isinstance(other, (TokenBag, ArrayTokenBag)):
             return all([self.tokens[color] >= other.tokens[color]
                         for color in self.tokens])
         raise TypeError(
@@ -98,3 +103,156 @@ class TokenBag:
     def __str__(self) -> str:
         return "\n".join([f"{str(color).capitalize():<5}: {self.tokens[color]}"
                           for color in self.tokens if self.tokens[color] > 0])
+
+
+# Number of slots in an ArrayTokenBag (one per color)
+NUM_TOKEN_COLORS: int = len(Token)
+
+
+class TokenCounts(MutableMapping):
+    """A dict-like view of the amounts in an ArrayTokenBag keyed by color.
+    Reads and writes go straight to the underlying array."""
+    __slots__ = ('_counts',)
+
+    def __init__(self, counts: list[int]) -> None:
+        self._counts = counts
+
+    def __getitem__(self, color: Token) -> int:
+        try:
+            return self._counts[color.ordinal]
+        except AttributeError:
+            raise KeyError(color) from None
+
+    def __setitem__(self, color: Token, amount: int) -> None:
+        try:
+            self._counts[color.ordinal] = amount
+        except AttributeError:
+            raise KeyError(color) from None
+
+    def __delitem__(self, color: Token) -> None:
+        raise TypeError("Token colors can't be removed from a TokenBag.")
+
+    def __iter__(self) -> Iterator[Token]:
+        return iter(Token)
+
+    def __len__(self) -> int:
+        return NUM_TOKEN_COLORS
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
+@dataclass(slots=True)
+class ArrayTokenBag:
+    """A TokenBag that holds the amount of tokens in a fixed array with
+    one slot per color, indexed by Token.ordinal.
+
+    Has the same public API as TokenBag ('tokens' is a dict-like view
+    of the array), while game entities can work on 'counts' directly."""
+    counts: list[int] = field(init=False)
+    standard_amount: InitVar[int] = 0
+    wildcard_amount: InitVar[Optional[int]] = None
+
+    def __post_init__(self, standard_amount: int,
+                      wildcard_amount: Optional[int]):
+        """Initialize the Token Bag with a standard amount of tokens
+        for all colors and possible separate amount for wildcard tokens.
+        Default initialization is an empty Token Bag.
+        Cannot work with negative values.
+
+        Args:
+            standard_amount InitVar[int]: The standard amount of tokens for
+            all colors. Defaults to 0.
+            wildcard_amount InitVar[int]: The separate amount for wildcard tokens.
+            Will only apply if different value than standard_amount.
+            Defaults to 0.
+        """
+        if (standard_amount < 0 or
+                (wildcard_amount is not None and wildcard_amount < 0)):
+            raise ValueError("TokenBag cannot work with negative values.")
+        self.counts = [standard_amount] * NUM_TOKEN_COLORS
+        if wildcard_amount is not None:
+            self.counts[Token.YELLOW.ordinal] = wildcard_amount
+
+    @classmethod
+    def from_bag(cls, token_bag: 'TokenBag | ArrayTokenBag'
+                 ) -> 'ArrayTokenBag':
+        """Creates an ArrayTokenBag with the same amounts as the given bag."""
+        array_bag = cls()
+        array_bag.add(token_bag.tokens)
+        return array_bag
+
+    def clone(self) -> 'ArrayTokenBag':
+        """Returns a copy of the Token Bag."""
+        token_bag = ArrayTokenBag.__new__(ArrayTokenBag)
+        token_bag.counts = self.counts.copy()
+        return token_bag
+
+    @property
+    def tokens(self) -> TokenCounts:
+        """The amount of tokens for each color as a dict-like view."""
+        return TokenCounts(self.counts)
+
+    def add(self, amount: dict[Token, int]) -> 'ArrayTokenBag':
+        """Adds tokens of given colors by the amount given for each."""
+        counts = self.counts
+        for color, color_amount in amount.items():
+            if color_amount < 0:
+                raise ValueError("TokenBag cannot work with negative values.")
+            counts[color.ordinal] += color_amount
+        return self
+
+    def remove(self, amount: dict[Token, int]) -> 'ArrayTokenBag':
+        """Removes tokens of given colors by the amount given for each.
+        Assumes you're not going to 'remove' negative amounts."""
+        counts = self.counts
+        for color, color_amount in amount.items():
+            counts[color.ordinal] -= color_amount
+            if counts[color.ordinal] < 0 or color_amount < 0:
+                raise ValueError("TokenBag cannot work with negative values.")
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, ArrayTokenBag):
+            return self.counts == other.counts
+        if isinstance(other, TokenBag):
+            return self.tokens == other.tokens
+        return False
+
+    def _other_counts(self, other) -> list[int]:
+        """Returns the counts of the other bag in ordinal order."""
+        if isinstance(other, ArrayTokenBag):
+            return other.counts
+        if isinstance(other, TokenBag):
+            return [other.tokens[color] for color in Token]
+        raise TypeError(
+            f"Comparison not supported between 'TokenBag' and {type(other)}")
+
+    def __lt__(self, other):
+        for mine, theirs in zip(self.counts, self._other_counts(other)):
+            if mine >= theirs:
+                return False
+        return True
+
+    def __le__(self, other):
+        for mine, theirs in zip(self.counts, self._other_counts(other)):
+            if mine > theirs:
+                return False
+        return True
+
+    def __gt__(self, other):
+        for mine, theirs in zip(self.counts, self._other_counts(other)):
+            if mine <= theirs:
+                return False
+        return True
+
+    def __ge__(self, other):
+        for mine, theirs in zip(self.counts, self._other_counts(other)):
+            if mine < theirs:
+                return False
+        return True
+
+    def __str__(self) -> str:
+        return "\n".join([f"{str(color).capitalize():<5}: {amount}"
+                          for color, amount in zip(Token, self.counts)
+                          if amount > 0])
@@ -0,0 +1,77 @@
+"""Zobrist keys for hashing game states.
+
+The hash of a game state is the XOR of the keys of all of its parts:
+    - the count of each token color in the bank
+    - the count of each token color & bonus color of each player (by seat)
+    - the cards in each reserved slot & the owned cards of each player
+    - the cards in each table slot & the cards left in each deck (as a set)
+    - the available nobles & the nobles owned by each player
+    - the player to move
+so a move only changes the hash by the keys of the parts it changes
+(see Game.zobrist_hash).
+
+Keys are derived from the game objects' attributes (not their identity),
+so the same state has the same hash in every process.
+"""
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Hashable, Optional
+from game_base.cards import Card
+from game_base.nobles import Noble
+
+
+def card_key(card: Card) -> tuple:
+    """Returns the attributes that identify a card."""
+    return (card.level, card.prestige_points, tuple(card.token_cost.counts),
+            card.bonus_color.ordinal)
+
+
+def noble_key(noble: Noble) -> tuple:
+    """Returns the attributes that identify a noble."""
+    return (noble.prestige_points, tuple(noble.bonus_required.counts))
+
+
+@dataclass(slots=True)
+class ZobristKeys:
+    """Pseudo-random 64-bit keys of the parts of a game state, generated
+    on first use & cached.
+
+    Parameters
+    ----------
+    seed : int
+        The seed of the keys (different seeds give independent keys).
+    """
+    seed: int = 0
+    _keys: dict[tuple, int] = field(default_factory=dict, init=False,
+                                    repr=False)
+
+    def key(self, *parts: Hashable) -> int:
+        """Returns the key of the state part with the given description,
+        ex. key('bank', color index, count).
+        (Cards are described by themselves, nobles with noble_key.)"""
+        key = self._keys.get(parts)
+        if key is None:
+            description = tuple(card_key(part) if isinstance(part, Card)
+                                else part for part in parts)
+            key = int.from_bytes(blake2b(
+                repr((self.seed, description)).encode(),
+                digest_size=8).digest(), 'little')
+            self._keys[parts] = key
+        return key
+
+    def counts_delta(self, name: str, owner: Optional[int],
+                     counts_before: list[int],
+                     counts_after: list[int]) -> int:
+        """Returns the change of the hash for the changed counts of a
+        token/bonus bag (owner is the player's seat, None for the bank)."""
+        delta = 0
+        for color_idx, (count_before, count_after) in enumerate(
+                zip(counts_before, counts_after)):
+            if count_before != count_after:
+                delta ^= (self.key(name, owner, color_idx, count_before) ^
+                          self.key(name, owner, color_idx, count_after))
+        return delta
+
+
+# The keys used by all games
+ZOBRIST_KEYS: ZobristKeys = ZobristKeys()
@@ -0,0 +1,5 @@
+from agents.selfplay import main
+
+
+if __name__ == '__main__':
+    main()
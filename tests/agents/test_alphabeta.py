@@ -0,0 +1,135 @@
+import pytest
+from game_base.games import Game, GameState
+from game_base.action_sets import (PURCHASE_TABLE_OFFSET,
+                                   PURCHASE_RESERVED_OFFSET)
+from agents.alphabeta import (AlphaBetaAgent, evaluate_paranoid, score,
+                              WIN_VALUE)
+from tests.agents.test_mcts import game_for_testing
+
+
+def minimax(game: Game, depth: int, player_idx: int, ply: int = 0) -> float:
+    """The paranoid value of the game searched without pruning."""
+    if depth == 0 or game.meta_data.state != GameState.IN_PROGRESS:
+        return evaluate_paranoid(game, player_idx, ply)
+    values = []
+    cards = game.cards.get_all_cards_on_tables()
+    for action_index in game.legal_action_mask().nonzero()[0].tolist():
+        record = game.apply(game.possible_actions.decode_action(
+            action_index, game.current_player, cards))
+        values.append(minimax(game, depth - 1, player_idx, ply + 1))
+        game.undo(record)
+    if not values:
+        return evaluate_paranoid(game, player_idx, ply)
+    return (max(values) if game.current_player_idx == player_idx
+            else min(values))
+
+
+class TestingEvaluateParanoid:
+    def test_evaluate_paranoid_best_opponent(self) -> None:
+        game = game_for_testing(num_players=3)
+        game.players[1].prestige_points = 4
+        game.players[2].prestige_points = 2
+        assert evaluate_paranoid(game, 0) == -score(game.players[1]) == -4
+        assert evaluate_paranoid(game, 1) == 2
+
+    def test_evaluate_paranoid_finished(self) -> None:
+        game = game_for_testing()
+        game.players[1].prestige_points = 15
+        game.meta_data.state = GameState.FINISHED
+        assert evaluate_paranoid(game, 0) == -WIN_VALUE
+        assert evaluate_paranoid(game, 1) == WIN_VALUE
+        # Faster wins & slower losses are worth more
+        assert evaluate_paranoid(game, 0, ply=3) == 3 - WIN_VALUE
+        assert evaluate_paranoid(game, 1, ply=3) == WIN_VALUE - 3
+
+
+class TestingAlphaBetaAgent:
+    def test_alphabeta_agent_legal_move(self) -> None:
+        game = game_for_testing(num_moves=6)
+        expected = game.clone()
+        agent = AlphaBetaAgent(max_depth=3, time_limit=None)
+        action_index = agent(game)
+        assert game == expected
+        assert game.zobrist_hash == expected.zobrist_hash
+        assert game.legal_action_mask()[action_index]
+        assert agent.stats.depth == 3
+        assert agent.stats.nodes > 1
+        assert agent.stats.cutoffs >= agent.stats.first_move_cutoffs > 0
+
+    @pytest.mark.parametrize('num_players', [2, 3])
+    def test_alphabeta_agent_minimax_value(self, num_players: int) -> None:
+        game = game_for_testing(num_players=num_players, num_moves=5)
+        expected = minimax(game, 2, game.current_player_idx)
+        for agent in [AlphaBetaAgent(max_depth=2, time_limit=None),
+                      AlphaBetaAgent(max_depth=2, time_limit=None,
+                                     transpositions=None)]:
+            action_index, value = agent.search(game)
+            assert value == pytest.approx(expected)
+            record = game.apply(game.possible_actions.decode_action(
+                action_index, game.current_player,
+                game.cards.get_all_cards_on_tables()))
+            assert minimax(game, 1, record.player_idx) == (
+                pytest.approx(expected))
+            game.undo(record)
+
+    def test_alphabeta_agent_reused_transpositions(self) -> None:
+        # Searches reusing the stored values find the values of minimax
+        agent = AlphaBetaAgent(max_depth=3, time_limit=None)
+        for num_moves in range(4, 10):
+            game = game_for_testing(num_players=3, num_moves=num_moves)
+            expected = minimax(game, 3, game.current_player_idx)
+            for _ in range(2):
+                assert agent.search(game)[1] == pytest.approx(expected)
+
+    def test_alphabeta_agent_time_limit(self) -> None:
+        agent = AlphaBetaAgent(time_limit=0.1)
+        action_index = agent(game_for_testing(num_moves=4))
+        assert 0.1 <= agent.stats.seconds < 1
+        assert agent.stats.depth >= 1
+        assert action_index >= 0
+
+    def test_alphabeta_agent_takes_winning_purchase(self) -> None:
+        game = game_for_testing(num_moves=8)
+        # The first player reached 15 points, so the game ends after the
+        # last player's move, who only wins by reaching 16 points
+        game.meta_data.curr_player_index = 1
+        game.players[0].prestige_points = 15
+        game.players[1].prestige_points = 14
+        game.players[1].token_reserved.counts[:] = [2, 2, 2, 2, 2, 0]
+        game.players[1].bonus_owned.counts[:] = [2, 2, 2, 2, 2, 0]
+        cards = game.cards.get_all_cards_on_tables()
+        winning = [action_index for action_index
+                   in game.legal_action_mask().nonzero()[0].tolist()
+                   if PURCHASE_TABLE_OFFSET <= action_index <
+                   PURCHASE_RESERVED_OFFSET and
+                   cards[action_index - PURCHASE_TABLE_OFFSET]
+                   .prestige_points >= 2]
+        assert winning
+        agent = AlphaBetaAgent(max_depth=4, time_limit=None)
+        action_index, value = agent.search(game)
+        assert action_index in winning
+        assert value == WIN_VALUE - 1
+        # The search stops at the depth that found the win
+        assert agent.stats.depth == 1
+
+    def test_alphabeta_agent_move_ordering(self) -> None:
+        game = game_for_testing(num_moves=4)
+        agent = AlphaBetaAgent(max_depth=2, time_limit=None)
+        agent.search(game)
+        agent._killers = [[5, 9]]
+        agent._history[0][:] = [0] * len(agent._history[0])
+        agent._history[0][3] = 8
+        agent._history[0][1] = 4
+        assert agent._order_moves([0, 1, 2, 3, 5, 7, 9], 7, 0, 0) == (
+            [7, 5, 9, 3, 1, 0, 2])
+
+    def test_alphabeta_agent_errors(self) -> None:
+        with pytest.raises(ValueError):
+            AlphaBetaAgent(max_depth=None, time_limit=None)
+        with pytest.raises(ValueError):
+            AlphaBetaAgent(max_depth=0)
+        game = game_for_testing()
+        game.bank.token_available.counts[:] = [0] * 6
+        game.players[0].cards_reserved[:] = game.cards.get_deck(1)[:3]
+        with pytest.raises(ValueError):
+            AlphaBetaAgent(max_depth=1)(game)
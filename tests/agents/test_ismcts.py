@@ -0,0 +1,63 @@
+import numpy as np
+from game_base.action_sets import ACTION_SPACE_SIZE
+from agents.mcts import ROOT
+from agents.ismcts import InformationSetTree, ISMCTSAgent
+from tests.agents.test_mcts import game_for_testing
+
+
+class TestingInformationSetTree:
+    def test_information_set_tree_expand_all(self) -> None:
+        tree = InformationSetTree(capacity=8)
+        tree.expand_all(ROOT, mover=1)
+        assert tree.size == 1 + ACTION_SPACE_SIZE
+        assert tree.action[1:tree.size].tolist() == list(
+            range(ACTION_SPACE_SIZE))
+        assert (tree.availability[:tree.size] == 0).all()
+
+    def test_information_set_tree_select_legal(self) -> None:
+        tree = InformationSetTree()
+        tree.expand_all(ROOT, mover=0)
+        legal = np.zeros(ACTION_SPACE_SIZE, dtype=bool)
+        legal[[3, 7]] = True
+        assert tree.select_available_child(ROOT, legal, 1.0) == 1 + 3
+        tree.backpropagate([ROOT, 1 + 3], [0.0, 1.0])
+        assert tree.select_available_child(ROOT, legal, 1.0) == 1 + 7
+        tree.backpropagate([ROOT, 1 + 7], [1.0, 0.0])
+        # A better child that isn't legal isn't selected
+        tree.backpropagate([ROOT, 1 + 5], [1.0, 0.0])
+        legal[7] = False
+        assert tree.select_available_child(ROOT, legal, 0.0) == 1 + 3
+        assert tree.availability[[1 + 3, 1 + 5, 1 + 7]].tolist() == (
+            [3, 0, 2])
+
+
+class TestingISMCTSAgent:
+    def test_ismcts_agent_legal_move(self) -> None:
+        game = game_for_testing(num_moves=6)
+        expected = game.clone()
+        agent = ISMCTSAgent(iterations=50)
+        action_index = agent(game)
+        assert game == expected
+        assert game.cards.get_all_decks() == expected.cards.get_all_decks()
+        assert game.legal_action_mask()[action_index]
+        assert agent.stats.iterations == 50
+
+    def test_ismcts_agent_visits_legal_root_moves(self) -> None:
+        game = game_for_testing(num_players=3, num_moves=3)
+        tree = ISMCTSAgent(iterations=100).search(game)
+        children = tree.children(ROOT)
+        visits = tree.visits[children.start:children.stop]
+        assert tree.visits[ROOT] == visits.sum() == 100
+        assert (visits.nonzero()[0].tolist() ==
+                game.legal_action_mask().nonzero()[0].tolist())
+
+    def test_ismcts_agent_expired_time_limit(self) -> None:
+        # A search out of time still picks a legal move (all of the actions
+        # are children of the root)
+        game = game_for_testing()
+        game.bank.token_available.counts[:5] = [0] * 5
+        legal = game.legal_action_mask()
+        assert not legal[0]
+        agent = ISMCTSAgent(iterations=None, time_limit=1e-9)
+        assert legal[agent(game)]
+        assert agent.stats.iterations == 1
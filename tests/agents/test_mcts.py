@@ -0,0 +1,159 @@
+import pytest
+from game_base.games import Game, GameState
+from game_base.players import Player
+from game_base.action_sets import (PURCHASE_TABLE_OFFSET,
+                                   PURCHASE_RESERVED_OFFSET)
+from agents.mcts import (MCTSAgent, SearchTree, ROOT, evaluate,
+                         greedy_rollout_policy)
+
+
+def game_for_testing(num_players: int = 2, seed: int = 0,
+                     num_moves: int = 0) -> Game:
+    game = Game(players=[Player(f'player_{i + 1}')
+                         for i in range(num_players)], seed=seed)
+    game.initialize()
+    for _ in range(num_moves):
+        game.step(game.rng.choice(
+            game.legal_action_mask().nonzero()[0].tolist()))
+    return game
+
+
+class TestingSearchTree:
+    def test_search_tree_expand_and_grow(self) -> None:
+        tree = SearchTree(capacity=4)
+        tree.expand(ROOT, [0, 5, 20], mover=0)
+        assert tree.is_expanded(ROOT)
+        assert list(tree.children(ROOT)) == [1, 2, 3]
+        tree.expand(2, [1, 2, 3, 4], mover=1)
+        assert tree.capacity >= tree.size == 8
+        assert tree.action[1:8].tolist() == [0, 5, 20, 1, 2, 3, 4]
+        assert tree.mover[1:8].tolist() == [0, 0, 0, 1, 1, 1, 1]
+        assert not tree.is_expanded(1)
+
+    def test_search_tree_select_unvisited_first(self) -> None:
+        tree = SearchTree()
+        tree.expand(ROOT, [0, 1, 2], mover=0)
+        tree.backpropagate([ROOT, 1], [1.0, 0.0])
+        assert tree.select_child(ROOT, exploration=1.0) == 2
+
+    def test_search_tree_select_ucb(self) -> None:
+        tree = SearchTree()
+        tree.expand(ROOT, [0, 1], mover=0)
+        for _ in range(3):
+            tree.backpropagate([ROOT, 1], [1.0, 0.0])
+        tree.backpropagate([ROOT, 2], [0.0, 1.0])
+        # Without exploration the child with the best mean value wins
+        assert tree.select_child(ROOT, exploration=0.0) == 1
+        # With a lot of exploration the least visited child wins
+        assert tree.select_child(ROOT, exploration=100.0) == 2
+
+    def test_search_tree_backpropagate_mover_rewards(self) -> None:
+        tree = SearchTree()
+        tree.expand(ROOT, [0], mover=0)
+        tree.expand(1, [3], mover=1)
+        tree.backpropagate([ROOT, 1, 2], [0.25, 0.75])
+        assert tree.visits[:3].tolist() == [1, 1, 1]
+        assert tree.value_sum[1:3].tolist() == [0.25, 0.75]
+        assert tree.best_action() == 0
+
+
+class TestingEvaluate:
+    def test_evaluate_unfinished_leader(self) -> None:
+        game = game_for_testing(num_players=3)
+        game.players[1].prestige_points = 4
+        assert evaluate(game) == [0.0, 1.0, 0.0]
+        game.players[2].prestige_points = 4
+        assert evaluate(game) == [0.0, 0.5, 0.5]
+
+    def test_evaluate_finished(self) -> None:
+        game = game_for_testing()
+        game.players[0].prestige_points = 15
+        game.meta_data.state = GameState.FINISHED
+        assert evaluate(game) == [1.0, 0.0]
+
+
+class TestingMCTSAgent:
+    def test_mcts_agent_legal_move(self) -> None:
+        game = game_for_testing(num_moves=6)
+        agent = MCTSAgent(iterations=50)
+        action_index = agent(game)
+        assert game.legal_action_mask()[action_index]
+        assert agent.stats.iterations == 50
+        assert agent.stats.nodes > 1
+        assert agent.stats.nodes_per_second > 0
+
+    def test_mcts_agent_doesnt_modify_game(self) -> None:
+        game = game_for_testing(num_moves=4)
+        expected = game.clone()
+        state = game.rng.getstate()
+        MCTSAgent(iterations=30, rollout_policy='greedy')(game)
+        assert game.rng.getstate() == state
+        assert game == expected
+        assert game.zobrist_hash == expected.zobrist_hash
+
+    def test_mcts_agent_visits(self) -> None:
+        game = game_for_testing(num_players=3, num_moves=3)
+        tree = MCTSAgent(iterations=100).search(game)
+        children = tree.children(ROOT)
+        assert tree.visits[ROOT] == 100
+        assert tree.visits[children.start:children.stop].sum() == 100
+        assert sorted(tree.action[children.start:children.stop]) == (
+            game.legal_action_mask().nonzero()[0].tolist())
+
+    def test_mcts_agent_time_limit(self) -> None:
+        agent = MCTSAgent(iterations=None, time_limit=0.05)
+        agent(game_for_testing())
+        assert 0.05 <= agent.stats.seconds < 1
+        assert agent.stats.iterations > 0
+
+    def test_mcts_agent_reproducible(self) -> None:
+        actions = [MCTSAgent(iterations=40)(game_for_testing(seed=5,
+                                                             num_moves=2))
+                   for _ in range(2)]
+        assert actions[0] == actions[1]
+
+    def test_mcts_agent_takes_winning_purchase(self) -> None:
+        game = game_for_testing(num_moves=8)
+        # The first player reached 15 points, so the game ends after the
+        # last player's move, who only wins by reaching 16 points
+        game.meta_data.curr_player_index = 1
+        game.players[0].prestige_points = 15
+        game.players[1].prestige_points = 14
+        game.players[1].token_reserved.counts[:] = [2, 2, 2, 2, 2, 0]
+        game.players[1].bonus_owned.counts[:] = [2, 2, 2, 2, 2, 0]
+        purchases = [action_index for action_index
+                     in game.legal_action_mask().nonzero()[0].tolist()
+                     if PURCHASE_TABLE_OFFSET <= action_index <
+                     PURCHASE_RESERVED_OFFSET]
+        cards = game.cards.get_all_cards_on_tables()
+        winning = [action_index for action_index in purchases
+                   if cards[action_index - PURCHASE_TABLE_OFFSET]
+                   .prestige_points >= 2]
+        assert winning
+        assert MCTSAgent(iterations=200)(game) in winning
+
+    def test_mcts_agent_errors(self) -> None:
+        with pytest.raises(ValueError):
+            MCTSAgent(iterations=None, time_limit=None)
+        with pytest.raises(ValueError):
+            MCTSAgent(iterations=0)
+        with pytest.raises(ValueError):
+            MCTSAgent(rollout_policy='unknown')
+        game = game_for_testing()
+        # No tokens to take, cards to reserve or tokens to purchase with
+        game.bank.token_available.counts[:] = [0] * 6
+        game.players[0].cards_reserved[:] = game.cards.get_deck(1)[:3]
+        with pytest.raises(ValueError):
+            MCTSAgent(iterations=10)(game)
+
+
+def test_greedy_rollout_policy_most_points() -> None:
+    game = game_for_testing(num_moves=4)
+    game.players[game.current_player_idx].bonus_owned.counts[:] = (
+        [7, 7, 7, 7, 7, 0])
+    legal = game.legal_action_mask().nonzero()[0].tolist()
+    action_index = greedy_rollout_policy(game, legal)
+    cards = game.cards.get_all_cards_on_tables()
+    assert action_index >= PURCHASE_TABLE_OFFSET
+    assert (cards[action_index - PURCHASE_TABLE_OFFSET].prestige_points ==
+            max(card.prestige_points for card in cards if card is not None))
@@ -0,0 +1,72 @@
+import pickle
+from agents.mcts import MCTSAgent, ROOT
+from agents.parallel_mcts import (WorkerPool, RootParallelMCTSAgent,
+                                  LeafParallelMCTSAgent)
+from tests.agents.test_mcts import game_for_testing
+
+
+class TestingWorkerPool:
+    def test_worker_pool_map(self) -> None:
+        for workers in [1, 2]:
+            pool = WorkerPool(workers)
+            assert pool.map(abs, [-1, 2, -3]) == [1, 2, 3]
+            pool.close()
+            assert pool._executor is None
+
+    def test_worker_pool_pickle(self) -> None:
+        pool = WorkerPool(2)
+        pool.map(abs, [-1])
+        unpickled = pickle.loads(pickle.dumps(pool))
+        pool.close()
+        assert unpickled.workers == 2
+        assert unpickled._executor is None
+
+
+class TestingRootParallelMCTSAgent:
+    def test_root_parallel_merges_trees(self) -> None:
+        game = game_for_testing(num_moves=5)
+        expected = game.clone()
+        agent = RootParallelMCTSAgent(MCTSAgent(iterations=20), num_trees=3,
+                                      pool=WorkerPool(1))
+        visits, value_sums = agent.search(game)
+        assert game == expected
+        assert visits.sum() == 60
+        assert agent.stats.iterations == 60
+        assert (visits.nonzero()[0].tolist() ==
+                game.legal_action_mask().nonzero()[0].tolist())
+        assert (value_sums <= visits).all()
+
+    def test_root_parallel_worker_processes(self) -> None:
+        game = game_for_testing(num_moves=3)
+        agent = RootParallelMCTSAgent(MCTSAgent(iterations=10),
+                                      pool=WorkerPool(2))
+        action_index = agent(game)
+        agent.close()
+        assert game.legal_action_mask()[action_index]
+        assert agent.stats.iterations == 20
+
+    def test_root_parallel_reproducible(self) -> None:
+        actions = [RootParallelMCTSAgent(MCTSAgent(iterations=20),
+                                         num_trees=2, pool=WorkerPool(1))(
+                       game_for_testing(seed=3, num_moves=2))
+                   for _ in range(2)]
+        assert actions[0] == actions[1]
+
+
+class TestingLeafParallelMCTSAgent:
+    def test_leaf_parallel_rollouts(self) -> None:
+        game = game_for_testing(num_moves=5)
+        agent = LeafParallelMCTSAgent(iterations=15, rollouts_per_leaf=3,
+                                      pool=WorkerPool(1))
+        tree = agent.search(game)
+        children = tree.children(ROOT)
+        assert tree.visits[ROOT] == 45
+        assert tree.visits[children.start:children.stop].sum() == 45
+
+    def test_leaf_parallel_worker_processes(self) -> None:
+        game = game_for_testing(num_moves=3)
+        agent = LeafParallelMCTSAgent(iterations=5, pool=WorkerPool(2))
+        tree = agent.search(game)
+        agent.close()
+        assert tree.visits[ROOT] == 10
+        assert game.legal_action_mask()[tree.best_action()]
@@ -0,0 +1,68 @@
+import pytest
+import json
+from game_base.games import Game
+from game_base.players import Player
+from agents.selfplay import (AGENTS, GameRecord, play_game, run_selfplay,
+                             random_agent, greedy_agent, main)
+
+
+class TestingSelfplay:
+    def test_play_game_record(self) -> None:
+        record = play_game(0, [greedy_agent, random_agent], seed=3)
+        assert isinstance(record, GameRecord)
+        assert len(record.final_points) == 2
+        assert record.turns <= 100
+        if record.winner is not None:
+            assert record.final_points[record.winner] >= 15
+
+    def test_play_game_moves_replay(self) -> None:
+        record = play_game(0, [greedy_agent, greedy_agent, random_agent],
+                           seed=5)
+        # Replaying the moves in a game with the same seed gives the same
+        # final state
+        game = TestingSelfplay.replay(record, num_players=3)
+        assert tuple(player.prestige_points
+                     for player in game.players) == record.final_points
+        assert game.meta_data.turns_played == record.turns
+
+    @staticmethod
+    def replay(record: GameRecord, num_players: int) -> Game:
+        game = Game(players=[Player(f'player_{i + 1}')
+                             for i in range(num_players)], seed=record.seed)
+        game.initialize()
+        for action_index in record.moves:
+            game.step(action_index)
+        return game
+
+    def test_play_game_max_turns(self) -> None:
+        record = play_game(0, [random_agent, random_agent], max_turns=3)
+        assert record.turns <= 3
+
+    def test_run_selfplay_same_in_process_and_pool(self) -> None:
+        in_process = list(run_selfplay(6, ['greedy', 'random'], seed=10,
+                                       workers=1))
+        pooled = list(run_selfplay(6, ['greedy', 'random'], seed=10,
+                                   workers=2, chunksize=2))
+        assert [record.game_idx for record in pooled] == list(range(6))
+        assert in_process == pooled
+
+    def test_run_selfplay_invalid_num_agents(self) -> None:
+        with pytest.raises(ValueError):
+            list(run_selfplay(1, ['random'], workers=1))
+
+    def test_main_output(self, tmp_path, capsys) -> None:
+        output = tmp_path / 'records.jsonl'
+        main(['--games', '3', '--agents', 'greedy', 'random',
+              '--workers', '1', '--output', str(output)])
+        records = [json.loads(line)
+                   for line in output.read_text().splitlines()]
+        assert [record['game_idx'] for record in records] == [0, 1, 2]
+        assert 'Played 3 games' in capsys.readouterr().out
+
+
+def test_agents_built_when_played() -> None:
+    # Every player gets its own agent
+    records = list(run_selfplay(1, ['alphabeta', 'alphabeta'], workers=1,
+                                max_turns=2))
+    assert records[0].turns <= 2
+    assert AGENTS['alphabeta']() is not AGENTS['alphabeta']()
@@ -0,0 +1,86 @@
+import pytest
+from agents.transposition import (TranspositionTable, TranspositionEntry,
+                                  LOWER_BOUND, ENTRY_BYTES, MAX_AGE)
+from tests.agents.test_mcts import game_for_testing
+
+
+class TestingTranspositionTable:
+    def test_transposition_table_capacity(self) -> None:
+        table = TranspositionTable(capacity=1000, probe_limit=3)
+        assert table.capacity == 1024
+        assert table.nbytes == (1024 + 2) * ENTRY_BYTES
+        table = TranspositionTable.from_megabytes(1)
+        assert table.nbytes <= 2 ** 20 < 2 * table.nbytes
+        with pytest.raises(ValueError):
+            TranspositionTable(capacity=0)
+        with pytest.raises(ValueError):
+            TranspositionTable.from_megabytes(0)
+
+    def test_transposition_table_store_and_probe(self) -> None:
+        table = TranspositionTable(capacity=16)
+        key = game_for_testing(num_moves=3).zobrist_hash
+        assert table.probe(key) is None
+        assert table.store(key, depth=3, value=0.5, best_action=7,
+                           bound=LOWER_BOUND)
+        assert table.probe(key) == TranspositionEntry(
+            depth=3, value=0.5, best_action=7, bound=LOWER_BOUND)
+        assert table.num_entries == 1
+        assert (table.hits, table.probes) == (1, 2)
+        # The last 64 bits of the key differ
+        assert table.probe(key ^ (1 << 63)) is None
+
+    def test_transposition_table_same_key_depth(self) -> None:
+        table = TranspositionTable(capacity=16)
+        table.store(5, depth=4, value=1.0)
+        assert not table.store(5, depth=2, value=0.0)
+        assert table.probe(5).value == 1.0
+        assert table.store(5, depth=4, value=0.0)
+        assert table.probe(5).value == 0.0
+        # Shallower results of a new search replace the old ones
+        table.new_search()
+        assert table.store(5, depth=1, value=0.5)
+        assert table.probe(5).depth == 1
+        assert table.num_entries == 1
+
+    def test_transposition_table_age_restart(self) -> None:
+        table = TranspositionTable(capacity=16)
+        table.store(5, depth=4, value=1.0)
+        for _ in range(MAX_AGE + 1):
+            table.new_search()
+        # The entry is still older than the current search
+        assert table.age == 1
+        assert table.store(5, depth=1, value=0.5)
+        assert table.probe(5).depth == 1
+
+    def test_transposition_table_replacement(self) -> None:
+        table = TranspositionTable(capacity=16, probe_limit=2)
+        # Keys with the same home slot
+        table.store(3, depth=5, value=0.0)
+        table.store(3 + 16, depth=2, value=0.0)
+        # The shallowest entry is replaced by deeper ones only
+        assert not table.store(3 + 32, depth=1, value=0.0)
+        assert table.store(3 + 48, depth=2, value=0.0)
+        assert table.probe(3 + 16) is None
+        assert table.probe(3) is not None
+        # Entries of older searches are replaced first
+        table.new_search()
+        table.store(3 + 64, depth=6, value=0.0)
+        table.store(3 + 80, depth=0, value=0.0)
+        assert table.probe(3 + 64) is not None
+        assert table.probe(3 + 80) is not None
+        assert table.probe(3) is None and table.probe(3 + 48) is None
+        assert table.num_entries == 2
+
+    def test_transposition_table_last_slots(self) -> None:
+        table = TranspositionTable(capacity=4, probe_limit=3)
+        for key in [3, 7, 11]:
+            assert table.store(key, depth=1, value=key)
+        assert [table.probe(key).value for key in [3, 7, 11]] == [3, 7, 11]
+
+    def test_transposition_table_clear(self) -> None:
+        table = TranspositionTable(capacity=16)
+        table.store(0, depth=0, value=1.0)
+        table.new_search()
+        table.clear()
+        assert table.probe(0) is None
+        assert table.num_entries == table.age == 0
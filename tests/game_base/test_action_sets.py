@@ -1,5 +1,19 @@
-from game_base.action_sets import StandardActionSet
-from game_base.tokens import Token
+import pytest
+from dataclasses import FrozenInstanceError
+from game_base.action_sets import (StandardActionSet, ACTION_SPACE_SIZE,
+                                   CardActionPool, STANDARD_CARD_ACTIONS,
+                                   CARD_SLOT_ACTIONS, NUM_TOKEN_ACTIONS,
+                                   RESERVE_TABLE_OFFSET,
+                                   PURCHASE_TABLE_OFFSET,
+                                   PURCHASE_RESERVED_OFFSET)
+from game_base.actions import (ReserveCard, PurchaseCard,
+                               Reserve2SameColorTokens,
+                               Reserve3UniqueColorTokens)
+from game_base.cards import Card, CardGenerator, CardRegistry
+from game_base.games import Game
+from game_base.tokens import Token, TokenBag
+from game_base.players import Player
+from game_base.banks import Bank
 from itertools import combinations
 
 
@@ -11,3 +25,133 @@ def test_standard_action_set_initialization() -> None:
     #                                                            Token.BLACK,
     #                                                            Token.RED], 3))
     assert True
+
+
+def test_standard_action_set_legal_actions_skip_empty_slots() -> None:
+    action_set = StandardActionSet()
+    player = Player('test_player')
+    bank = Bank()
+    legal_actions = action_set.legal_actions(player, bank, [None] * 12)
+    assert legal_actions == action_set.token_actions
+
+
+class TestingStandardActionSpace:
+    @staticmethod
+    def game_for_testing() -> Game:
+        players = [Player(f'test_player_{i + 1}') for i in range(2)]
+        game = Game(players=players,
+                    cards=CardGenerator.generate_cards(shuffled=False))
+        game.initialize()
+        return game
+
+    def test_action_space_size(self) -> None:
+        assert ACTION_SPACE_SIZE == 42
+        assert len(CARD_SLOT_ACTIONS) == ACTION_SPACE_SIZE - NUM_TOKEN_ACTIONS
+
+    def test_decode_token_actions(self) -> None:
+        action_set = StandardActionSet()
+        player = Player('test_player')
+        for action_index in range(NUM_TOKEN_ACTIONS):
+            action = action_set.decode_action(action_index, player, [])
+            assert action is action_set.token_actions[action_index]
+
+    def test_decode_card_actions(self) -> None:
+        action_set = StandardActionSet()
+        game = self.game_for_testing()
+        cards = game.cards.get_all_cards_on_tables()
+        player = game.current_player
+        player.add_to_reserved_cards(game.cards.get_deck(2)[0])
+        assert (action_set.decode_action(RESERVE_TABLE_OFFSET + 5, player,
+                                         cards) == ReserveCard(cards[5]))
+        assert (action_set.decode_action(PURCHASE_TABLE_OFFSET + 11, player,
+                                         cards) == PurchaseCard(cards[11]))
+        assert (action_set.decode_action(PURCHASE_RESERVED_OFFSET, player,
+                                         cards) ==
+                PurchaseCard(player.cards_reserved[0]))
+        # Empty reserved card slot
+        assert action_set.decode_action(PURCHASE_RESERVED_OFFSET + 1,
+                                        player, cards) is None
+
+    def test_decode_error_index(self) -> None:
+        action_set = StandardActionSet()
+        with pytest.raises(IndexError) as e:
+            action_set.decode_action(ACTION_SPACE_SIZE, Player('test'), [])
+        with pytest.raises(IndexError) as e:
+            action_set.decode_action(-1, Player('test'), [])
+
+    def test_encode_decode_all_actions(self) -> None:
+        action_set = StandardActionSet()
+        game = self.game_for_testing()
+        cards = game.cards.get_all_cards_on_tables()
+        player = game.current_player
+        for card in game.cards.get_deck(3)[:3]:
+            player.add_to_reserved_cards(card)
+        for action_index in range(ACTION_SPACE_SIZE):
+            action = action_set.decode_action(action_index, player, cards)
+            assert (action_set.encode_action(action, player, cards) ==
+                    action_index)
+
+    def test_encode_token_actions_color_order(self) -> None:
+        action_set = StandardActionSet()
+        player = Player('test_player')
+        action_1 = Reserve3UniqueColorTokens((Token.GREEN, Token.WHITE,
+                                              Token.BLUE))
+        action_2 = Reserve3UniqueColorTokens((Token.BLUE, Token.GREEN,
+                                              Token.WHITE))
+        assert (action_set.encode_action(action_1, player, []) ==
+                action_set.encode_action(action_2, player, []) == 0)
+        assert action_set.encode_action(
+            Reserve2SameColorTokens(Token.RED), player, []) == 14
+
+    def test_encode_error_card_not_in_slots(self) -> None:
+        action_set = StandardActionSet()
+        game = self.game_for_testing()
+        cards = game.cards.get_all_cards_on_tables()
+        card_in_deck = game.cards.get_deck(1)[0]
+        with pytest.raises(ValueError) as e:
+            action_set.encode_action(PurchaseCard(card_in_deck),
+                                     game.current_player, cards)
+
+
+class TestingCardActionPool:
+    def test_pool_indexed_by_card_index(self) -> None:
+        registry = CardGenerator.card_template().registry
+        pool = CardActionPool(registry)
+        assert len(pool.reserve_actions) == len(pool.purchase_actions) == 90
+        for card_index, card in enumerate(registry.cards):
+            assert pool.reserve(card) is pool.reserve_actions[card_index]
+            assert pool.reserve(card) == ReserveCard(card)
+            assert pool.purchase(card) is pool.purchase_actions[card_index]
+            assert pool.purchase(card) == PurchaseCard(card)
+
+    def test_pool_card_not_in_set(self) -> None:
+        card = Card(level=1, prestige_points=0, bonus_color=Token.RED,
+                    token_cost=TokenBag().add({Token.RED: 9}))
+        pool = CardActionPool(CardRegistry(()))
+        assert pool.reserve(card) == ReserveCard(card)
+        assert pool.purchase(card) == PurchaseCard(card)
+
+    def test_pool_actions_frozen(self) -> None:
+        pool = CardActionPool(CardGenerator.card_template().registry)
+        card = pool.purchase_actions[1].card
+        with pytest.raises(FrozenInstanceError):
+            pool.reserve_actions[0].card = card
+        with pytest.raises(FrozenInstanceError):
+            pool.purchase_actions[0].card = card
+
+    def test_possible_card_actions_are_shared(self) -> None:
+        game = TestingStandardActionSpace.game_for_testing()
+        cards = game.cards.get_all_cards_on_tables()
+        player = game.current_player
+        player.add_to_reserved_cards(game.cards.get_deck(2)[0])
+        action_set = StandardActionSet()
+        actions_1 = action_set.possible_card_actions(player, cards)
+        actions_2 = StandardActionSet().possible_card_actions(player, cards)
+        assert len(actions_1) == 12 + 12 + 1
+        assert all(action_1 is action_2
+                   for action_1, action_2 in zip(actions_1, actions_2))
+        assert all(action_set.decode_action(action_index, player, cards) is
+                   action for action_index, action
+                   in zip(range(RESERVE_TABLE_OFFSET, ACTION_SPACE_SIZE),
+                          actions_1))
+        assert action_set.card_actions is STANDARD_CARD_ACTIONS
@@ -0,0 +1,97 @@
+import pytest
+import random
+import numpy as np
+from game_base.action_sets import ACTION_SPACE_SIZE
+from game_base.aec_env import SplendorAECEnv
+from game_base.games import GameState
+
+
+def play_random(env: SplendorAECEnv, seed: int) -> list[float]:
+    """Plays the game until all of the agents are removed and returns the
+    final cumulative rewards of the agents."""
+    rng = random.Random(seed)
+    final_rewards = {}
+    while env.agents:
+        observation, reward, termination, truncation, info = env.last()
+        if termination or truncation:
+            final_rewards[env.agent_selection] = reward
+            env.step(None)
+        else:
+            env.step(rng.choice(np.flatnonzero(
+                observation['action_mask']).tolist()))
+    return [final_rewards[agent] for agent in env.possible_agents]
+
+
+class TestingSplendorAECEnv:
+    def test_env_reset(self) -> None:
+        env = SplendorAECEnv(num_players=3)
+        env.reset(seed=0)
+        assert env.agents == ['player_0', 'player_1', 'player_2']
+        assert env.agent_selection == 'player_0'
+        observation = env.observe('player_0')
+        assert observation['observation'].shape == (env.encoder.size,)
+        assert observation['action_mask'].shape == (ACTION_SPACE_SIZE,)
+        assert (observation['action_mask'].astype(bool).tolist() ==
+                env.game.legal_action_mask().tolist())
+        # Only the selected agent has legal actions
+        assert not env.observe('player_1')['action_mask'].any()
+
+    def test_env_observe_copies(self) -> None:
+        env = SplendorAECEnv(num_players=2)
+        env.reset(seed=0)
+        observation_0 = env.observe('player_0')
+        observation_1 = env.observe('player_1')
+        assert (observation_0['observation'].tolist() !=
+                observation_1['observation'].tolist())
+        assert observation_0['action_mask'].any()
+        env.step(int(observation_0['action_mask'].argmax()))
+        assert observation_0['action_mask'].any()
+
+    def test_env_init_error(self) -> None:
+        with pytest.raises(ValueError):
+            SplendorAECEnv(num_players=5)
+
+    def test_env_reset_seed(self) -> None:
+        env_1, env_2 = SplendorAECEnv(), SplendorAECEnv()
+        env_1.reset(seed=4)
+        env_2.reset(seed=4)
+        assert (env_1.observe('player_0')['observation'].tolist() ==
+                env_2.observe('player_0')['observation'].tolist())
+        assert play_random(env_1, seed=1) == play_random(env_2, seed=1)
+
+    def test_env_step_illegal(self) -> None:
+        env = SplendorAECEnv()
+        env.reset(seed=0)
+        with pytest.raises(ValueError):
+            env.step(ACTION_SPACE_SIZE - 1)
+
+    def test_env_step_order(self) -> None:
+        env = SplendorAECEnv(num_players=2)
+        env.reset(seed=0)
+        env.step(0)
+        assert env.agent_selection == 'player_1'
+        env.step(1)
+        assert env.agent_selection == 'player_0'
+        assert env.game.meta_data.turns_played == 1
+
+    def test_env_random_playouts(self) -> None:
+        num_finished = 0
+        env = SplendorAECEnv(num_players=2)
+        for seed in range(10):
+            env.reset(seed=seed)
+            rewards = play_random(env, seed)
+            if env.game.meta_data.state == GameState.FINISHED:
+                num_finished += 1
+                assert sorted(rewards) == [-1, 1]
+                winner = env.game.players.index(env.game.get_winner())
+                assert rewards[winner] == 1
+            else:
+                assert rewards == [0, 0]
+            assert env.agent_selection is None
+        assert num_finished > 0
+
+    def test_env_truncation_max_turns(self) -> None:
+        env = SplendorAECEnv(num_players=2, max_turns=2)
+        env.reset(seed=0)
+        assert play_random(env, seed=0) == [0, 0]
+        assert env.game.meta_data.turns_played == 2
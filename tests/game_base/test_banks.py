@@ -23,6 +23,12 @@ class TestingBankInit:
         with pytest.raises(ValueError) as e:
             bank = Bank(1)
 
+    def test_bank_reset(self) -> None:
+        bank = Bank(3)
+        bank.remove_token({Token.GREEN: 2, Token.YELLOW: 1})
+        bank.reset()
+        assert bank == Bank(3)
+
 
 class TestingBankCanRemoveToken:
     def test_bank_can_remove_token_3_unique_true(self) -> None:
@@ -0,0 +1,159 @@
+import pytest
+import random
+import numpy as np
+from game_base.players import Player
+from game_base.games import Game, GameState
+from game_base.action_sets import ACTION_SPACE_SIZE, PURCHASE_TABLE_OFFSET
+from game_base.batched_games import (BatchedGames, STANDARD_CARDS,
+                                     LEVEL_CARDS, EMPTY)
+
+
+def new_game(num_players: int) -> Game:
+    players = [Player(f'test_player_{i + 1}') for i in range(num_players)]
+    game = Game(players=players)
+    game.initialize()
+    return game
+
+
+def assert_same_state(batch: BatchedGames, games: list[Game]) -> None:
+    """Checks that the batch holds the same state as the given games."""
+    expected = BatchedGames.from_games(games)
+    for name in ['bank', 'player_tokens', 'player_bonuses',
+                 'player_reserved', 'player_points', 'player_num_cards',
+                 'player_num_nobles', 'tables', 'deck_sizes', 'nobles',
+                 'current_player', 'turns_played', 'finished']:
+        assert np.array_equal(getattr(batch, name),
+                              getattr(expected, name)), name
+    # Only the cards that are still in the decks matter
+    for game_idx in range(len(games)):
+        for level_idx, deck_size in enumerate(batch.deck_sizes[game_idx]):
+            assert np.array_equal(
+                batch.decks[game_idx, level_idx, :deck_size],
+                expected.decks[game_idx, level_idx, :deck_size])
+
+
+class TestingBatchedGames:
+    def test_batched_games_init(self) -> None:
+        batch = BatchedGames(8, num_players=3, seed=0)
+        assert batch.bank.shape == (8, 6)
+        assert batch.player_tokens.shape == (8, 3, 6)
+        assert batch.tables.shape == (8, 3, 4)
+        assert batch.nobles.shape == (8, 4)
+        assert (batch.bank == [5, 5, 5, 5, 5, 5]).all()
+        assert not batch.finished.any()
+        assert (batch.nobles != EMPTY).all()
+        for game_idx in range(8):
+            for level_idx, level_cards in enumerate(LEVEL_CARDS):
+                deck_size = batch.deck_sizes[game_idx, level_idx]
+                assert deck_size == len(level_cards) - 4
+                # Every card of the level is on the table or in the deck
+                cards = np.concatenate(
+                    [batch.tables[game_idx, level_idx],
+                     batch.decks[game_idx, level_idx, :deck_size]])
+                assert sorted(cards.tolist()) == level_cards.tolist()
+
+    def test_batched_games_init_invalid_num_players(self) -> None:
+        with pytest.raises(ValueError):
+            BatchedGames(2, num_players=5)
+
+    def test_batched_games_seed(self) -> None:
+        first, second = BatchedGames(4, seed=7), BatchedGames(4, seed=7)
+        assert np.array_equal(first.decks, second.decks)
+        assert np.array_equal(first.nobles, second.nobles)
+
+    def test_batched_games_from_games(self) -> None:
+        game = new_game(2)
+        batch = BatchedGames.from_games([game])
+        table = game.cards.get_all_cards_on_tables()
+        assert [STANDARD_CARDS.get_card(idx)
+                for idx in batch.tables[0].ravel()] == table
+        assert batch.legal_action_mask()[0].tolist() == (
+            game.legal_action_mask().tolist())
+
+    def test_batched_games_step_illegal(self) -> None:
+        batch = BatchedGames(2, seed=0)
+        # The players have no reserved cards to purchase yet
+        with pytest.raises(ValueError):
+            batch.step(np.full(2, ACTION_SPACE_SIZE - 1))
+
+    def test_batched_games_step_truncates_stalled(self) -> None:
+        batch = BatchedGames(3, num_players=2, seed=0)
+        # The first player of the 1st game can't take tokens, reserve or
+        # purchase any card
+        batch.bank[0] = 0
+        batch.player_reserved[0, 0] = LEVEL_CARDS[2][:3]
+        mask = batch.legal_action_mask()
+        assert not mask[0].any() and mask[1:].any(axis=1).all()
+        for _ in range(3):
+            actions = batch.legal_action_mask().argmax(axis=1)
+            batch.step(actions)
+        assert batch.truncated.tolist() == [True, False, False]
+        assert batch.current_player[0] == 0
+        assert batch.turns_played.tolist() == [0, 1, 1]
+        assert not batch.legal_action_mask()[0].any()
+        assert batch.winners()[0] == EMPTY
+        batch.reset(np.array([0]))
+        assert not batch.truncated.any()
+
+    def test_batched_games_truncate(self) -> None:
+        batch = BatchedGames(3, seed=2)
+        batch.finished[2] = True
+        batch.truncate(np.array([1, 2]))
+        assert batch.truncated.tolist() == [False, True, False]
+        mask = batch.legal_action_mask()
+        assert mask[0].any() and not mask[1:].any()
+        players = batch.current_player.copy()
+        batch.step(np.zeros(3, dtype=np.int64))
+        assert (batch.current_player[1:] == players[1:]).all()
+
+    def test_batched_games_step_matches_game(self) -> None:
+        random.seed(0)
+        num_finished = 0
+        for num_players in [2, 3, 4]:
+            games = [new_game(num_players) for _ in range(8)]
+            batch = BatchedGames.from_games(games)
+            for _ in range(400):
+                masks = [game.legal_action_mask() for game in games]
+                assert np.array_equal(batch.legal_action_mask(), masks)
+                # A player without legal moves stalls the game,
+                # so continue the cross-check without the stalled games
+                stalled = [game_idx for game_idx, (game, mask)
+                           in enumerate(zip(games, masks))
+                           if game.meta_data.state == GameState.IN_PROGRESS
+                           and not mask.any()]
+                if stalled:
+                    games = [game for game_idx, game in enumerate(games)
+                             if game_idx not in stalled]
+                    masks = [mask for game_idx, mask in enumerate(masks)
+                             if game_idx not in stalled]
+                    batch = BatchedGames.from_games(games)
+                if not any(mask.any() for mask in masks):
+                    break
+                actions = np.zeros(len(games), dtype=np.int64)
+                for game_idx, (game, mask) in enumerate(zip(games, masks)):
+                    if mask.any():
+                        # Prefer purchases, so the games reach the end
+                        legal = mask.nonzero()[0].tolist()
+                        purchases = [action for action in legal
+                                     if action >= PURCHASE_TABLE_OFFSET]
+                        actions[game_idx] = random.choice(purchases or legal)
+                        game.step(actions[game_idx])
+                batch.step(actions)
+                assert_same_state(batch, games)
+            finished = [game.meta_data.state == GameState.FINISHED
+                        for game in games]
+            num_finished += sum(finished)
+            assert batch.finished.tolist() == finished
+            winners = [game.players.index(game.get_winner())
+                       if is_finished else EMPTY
+                       for game, is_finished in zip(games, finished)]
+            assert batch.winners().tolist() == winners
+        assert num_finished > 0
+
+    def test_batched_games_reset(self) -> None:
+        batch = BatchedGames(3, seed=1)
+        batch.step(np.zeros(3, dtype=np.int64))
+        batch.reset(np.array([1]))
+        assert batch.current_player.tolist() == [1, 0, 1]
+        assert batch.player_tokens[1].sum() == 0
+        assert batch.player_tokens[0, 0].sum() == 3
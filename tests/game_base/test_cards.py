@@ -1,7 +1,14 @@
 import pytest
+import pickle
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from random import Random
+from copy import copy, deepcopy
 from dataclasses import FrozenInstanceError
-from game_base.tokens import Token, TokenBag
-from game_base.cards import (Card, CardManager,
+from game_base.tokens import Token, TokenBag, ArrayTokenBag
+import game_base.cards
+from game_base.cards import (Card, CardManager, CardRegistry,
                              CardManagerCollection, CardGenerator)
 
 
@@ -142,6 +149,47 @@ class TestingCard:
                              "Bonus token: Green")
 
 
+    def test_card_interned(self) -> None:
+        card_1 = Card(level=1, prestige_points=0, bonus_color=Token.GREEN,
+                      token_cost=TokenBag().add({Token.BLUE: 1,
+                                                 Token.RED: 2}))
+        card_2 = Card(level=1, prestige_points=0, bonus_color=Token.GREEN,
+                      token_cost=TokenBag().add({Token.RED: 2,
+                                                 Token.BLUE: 1}))
+        card_3 = Card(level=1, prestige_points=1, bonus_color=Token.GREEN,
+                      token_cost=TokenBag().add({Token.BLUE: 1,
+                                                 Token.RED: 2}))
+        assert card_1 is card_2
+        assert card_1 == card_2
+        assert card_1 != card_3
+
+    def test_card_interned_cost_copied(self) -> None:
+        token_cost = ArrayTokenBag().add({Token.WHITE: 3, Token.RED: 4})
+        card = Card(level=3, prestige_points=2, bonus_color=Token.GREEN,
+                    token_cost=token_cost)
+        assert card.token_cost is not token_cost
+        token_cost.add({Token.RED: 1})
+        assert card.token_cost.counts[Token.RED.ordinal] == 4
+        assert Card(level=3, prestige_points=2, bonus_color=Token.GREEN,
+                    token_cost=ArrayTokenBag().add({
+                        Token.WHITE: 3, Token.RED: 4})) is card
+
+    def test_card_hashable(self) -> None:
+        cards = TestingCardManager.card_list_for_testing(num_cards=4)
+        cards_set = set(cards + cards)
+        assert len(cards_set) == 4
+        cards_dict = {card: card.id for card in cards}
+        for card in cards:
+            assert cards_dict[card] == card.id
+
+    def test_card_copy_and_pickle_keep_identity(self) -> None:
+        card = Card(level=2, prestige_points=1, bonus_color=Token.RED,
+                    token_cost=TokenBag().add({Token.WHITE: 3}))
+        assert copy(card) is card
+        assert deepcopy(card) is card
+        assert pickle.loads(pickle.dumps(card)) is card
+
+
 class TestingCardManager:
     @staticmethod
     def card_list_for_testing(level: int = 1,
@@ -389,12 +437,67 @@ class TestingCardManagerColletion:
         assert cards_3 != card_collection.get_deck(3)
 
 
+class TestingCardRegistry:
+    def test_card_registry_indices(self) -> None:
+        cards = TestingCardManager.card_list_for_testing(num_cards=5)
+        registry = CardRegistry(cards)
+        assert len(registry) == 5
+        for card_index, card in enumerate(cards):
+            assert registry.get_card(card_index) is card
+            assert registry.get_index(card) == card_index
+            assert registry.get_card_by_id(card.id) is card
+
+    def test_card_registry_get_card_by_id_missing(self) -> None:
+        registry = CardRegistry(TestingCardManager.card_list_for_testing())
+        assert registry.get_card_by_id('99999') is None
+
+    def test_card_registry_get_index_error(self) -> None:
+        registry = CardRegistry(TestingCardManager.card_list_for_testing())
+        card = Card(level=1, prestige_points=0, bonus_color=Token.BLUE,
+                    token_cost=TokenBag().add({Token.RED: 9}))
+        with pytest.raises(ValueError) as e:
+            registry.get_index(card)
+
+    def test_card_registry_generated_cards(self) -> None:
+        card_collection = CardGenerator.generate_cards(shuffled=True)
+        registry = card_collection.registry
+        assert len(registry) == 90
+        assert len(registry.indices_by_id) == 90
+        # Indices follow the order in the .csv file, regardless of shuffling
+        assert registry.get_card(0).id == '11101'
+        assert [card.level for card in registry.cards] == sorted(
+            card.level for card in registry.cards)
+        for deck in card_collection.get_all_decks():
+            for card in deck:
+                assert registry.get_card(registry.get_index(card)) is card
+
+
 class TestingCardGenerator:
     def test_generate_from_csv(self) -> None:
         # Just check if it runs & the output type is correct
         card_collection = CardGenerator.generate_from_csv()
         assert isinstance(card_collection, CardManagerCollection)
 
+    def test_generate_from_card_data(self) -> None:
+        # The precompiled card data is up to date with the .csv file
+        card_collection = CardGenerator.generate_from_card_data()
+        assert (card_collection.registry.cards ==
+                CardGenerator.generate_from_csv().registry.cards)
+
+    def test_save_to_card_data_module(self, tmp_path) -> None:
+        filepath = tmp_path / 'cards_data.py'
+        CardGenerator.save_to_card_data_module(
+            CardGenerator.generate_from_csv(), filepath)
+        namespace = {}
+        exec(filepath.read_text(), namespace)
+        assert len(namespace['CARDS_DATA']) == 90
+
+    def test_import_without_pandas(self) -> None:
+        # Importing the game doesn't import pandas
+        code = ("import sys, game_base.games, game_base.cards; "
+                "sys.exit('pandas' in sys.modules)")
+        assert subprocess.run([sys.executable, '-c', code]).returncode == 0
+
     def test_generate_cards(self) -> None:
         # Just check if it runs & the output type is correct
         card_collection = CardGenerator.generate_cards()
@@ -409,3 +512,100 @@ class TestingCardGenerator:
                     card_collection_shuffled.get_deck(i))
             assert all(card in card_collection_shuffled.get_deck(i)
                        for card in card_collection.get_deck(i))
+
+    def test_generate_cards_seeded_rng(self) -> None:
+        card_collection_1 = CardGenerator.generate_cards(rng=Random(3))
+        card_collection_2 = CardGenerator.generate_cards(rng=Random(3))
+        assert (card_collection_1.get_all_decks() ==
+                card_collection_2.get_all_decks())
+
+    def test_load_cards_saves_cache(self, tmp_path) -> None:
+        card_collection = CardGenerator.load_cards(tmp_path)
+        assert CardGenerator.cache_path(tmp_path).exists()
+        assert (CardGenerator.load_cards(tmp_path).registry ==
+                card_collection.registry)
+        # Only the cache is left in the directory (no temporary files)
+        assert list(tmp_path.iterdir()) == [
+            CardGenerator.cache_path(tmp_path)]
+
+    def test_load_cards_corrupted_cache(self, tmp_path) -> None:
+        CardGenerator.cache_path(tmp_path).write_bytes(b'not a pickle')
+        card_collection = CardGenerator.load_cards(tmp_path)
+        assert len(card_collection.registry) == 90
+        # The cache is regenerated
+        assert (CardGenerator.load_cards(tmp_path).registry ==
+                card_collection.registry)
+
+    def test_load_cards_read_only_cache_dir(self, tmp_path) -> None:
+        # The cache can't be written, so the cards are only kept in memory
+        cache_dir = tmp_path / 'missing'
+        card_collection = CardGenerator.load_cards(cache_dir)
+        assert len(card_collection.registry) == 90
+        assert not cache_dir.exists()
+
+    def test_load_cards_concurrent(self, tmp_path) -> None:
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            collections = list(executor.map(CardGenerator.load_cards,
+                                            [tmp_path] * 8))
+        assert all(collection.registry == collections[0].registry
+                   for collection in collections)
+        assert list(tmp_path.iterdir()) == [
+            CardGenerator.cache_path(tmp_path)]
+
+    def test_cache_path_schema_version(self, tmp_path, monkeypatch) -> None:
+        cache_path = CardGenerator.cache_path(tmp_path)
+        monkeypatch.setattr(game_base.cards, 'CARDS_CACHE_SCHEMA_VERSION',
+                            game_base.cards.CARDS_CACHE_SCHEMA_VERSION + 1)
+        assert CardGenerator.cache_path(tmp_path) != cache_path
+
+    def test_cache_path_card_data(self, tmp_path, monkeypatch) -> None:
+        cache_path = CardGenerator.cache_path(tmp_path)
+        monkeypatch.setattr(game_base.cards, 'CARDS_DATA',
+                            game_base.cards.CARDS_DATA[:-1])
+        assert CardGenerator.cache_path(tmp_path) != cache_path
+
+    def test_load_cards_without_csv(self, tmp_path, monkeypatch) -> None:
+        # The cards only depend on the precompiled card data
+        monkeypatch.setattr(game_base.cards, 'CARDS_FILE_PATH_CSV',
+                            tmp_path / 'missing.csv')
+        card_collection = CardGenerator.load_cards(tmp_path)
+        assert len(card_collection.registry) == 90
+        assert CardGenerator.cache_path(tmp_path).exists()
+
+    def test_load_cards_cache_key_error(self, tmp_path, monkeypatch) -> None:
+        def cache_path(cache_dir):
+            raise PermissionError(cache_dir)
+        monkeypatch.setattr(CardGenerator, 'cache_path', cache_path)
+        card_collection = CardGenerator.load_cards(tmp_path)
+        assert len(card_collection.registry) == 90
+        assert list(tmp_path.iterdir()) == []
+
+    def test_save_to_pickle_error(self, tmp_path) -> None:
+        filepath = tmp_path / 'cards.pkl'
+        with pytest.raises(Exception):
+            CardGenerator.save_to_pickle(lambda: None, filepath)
+        assert list(tmp_path.iterdir()) == []
+
+    def test_generate_cards_copies_template(self) -> None:
+        card_collection = CardGenerator.generate_cards(shuffled=False)
+        card_collection.fill_tables()
+        template = CardGenerator.card_template()
+        assert CardGenerator.card_template() is template
+        assert card_collection.registry is template.registry
+        assert template.get_all_cards_on_tables() == [None] * 12
+        assert (CardGenerator.generate_cards(shuffled=False)
+                .get_all_decks() == template.get_all_decks())
+
+    def test_card_manager_collection_reset(self) -> None:
+        card_collection = CardGenerator.generate_cards(rng=Random(0))
+        card_collection.fill_tables()
+        card_collection.reset()
+        assert card_collection == CardGenerator.generate_cards(shuffled=False)
+
+    def test_generate_cards_interned(self) -> None:
+        card_collection_1 = CardGenerator.generate_cards(shuffled=False)
+        card_collection_2 = CardGenerator.generate_cards(shuffled=False)
+        for i in range(1, 4):
+            assert all(card_1 is card_2 for card_1, card_2
+                       in zip(card_collection_1.get_deck(i),
+                              card_collection_2.get_deck(i)))
@@ -0,0 +1,49 @@
+import pytest
+from game_base.games import Game
+from game_base.players import Player
+from game_base.determinization import DeterminizationSampler
+
+
+class TestingDeterminizationSampler:
+    @staticmethod
+    def game_for_testing(seed: int = 0) -> Game:
+        game = Game(players=[Player('player_1'), Player('player_2')],
+                    seed=seed)
+        game.initialize()
+        return game
+
+    def test_sample_reshuffles_decks(self) -> None:
+        game = self.game_for_testing()
+        original = game.clone()
+        DeterminizationSampler(seed=0).sample(game)
+        for deck, original_deck in zip(game.cards.get_all_decks(),
+                                       original.cards.get_all_decks()):
+            assert deck != original_deck
+            assert sorted(deck) == sorted(original_deck)
+        assert (game.cards.get_all_tables() ==
+                original.cards.get_all_tables())
+        assert game.zobrist_hash == game.compute_zobrist_hash()
+
+    def test_sample_reproducible(self) -> None:
+        games = [self.game_for_testing() for _ in range(2)]
+        for game in games:
+            sampler = DeterminizationSampler(seed=4)
+            for _ in range(3):
+                sampler.sample(game)
+        assert games[0].cards.get_all_decks() == (
+            games[1].cards.get_all_decks())
+
+    def test_sample_small_decks(self) -> None:
+        game = self.game_for_testing()
+        game.cards.managers[0].deck[:] = game.cards.managers[0].deck[:1]
+        game.cards.managers[1].deck.clear()
+        sampler = DeterminizationSampler(seed=0)
+        for _ in range(3):
+            sampler.sample(game)
+        assert len(game.cards.managers[0].deck) == 1
+        assert not game.cards.managers[1].deck
+
+    def test_sample_deck_too_large(self) -> None:
+        with pytest.raises(ValueError):
+            DeterminizationSampler(max_deck_size=10).sample(
+                self.game_for_testing())
@@ -1,14 +1,16 @@
 import pytest
 import random
+import numpy as np
 from game_base.cards import Card, CardGenerator
 from game_base.tokens import TokenBag, Token
 from game_base.players import Player
-from game_base.nobles import Noble
+from game_base.nobles import Noble, NobleGenerator
 from game_base.banks import Bank
-from game_base.actions import (ReserveCard, PurchaseCard,
+from game_base.actions import (Action, ReserveCard, PurchaseCard,
                                Reserve2SameColorTokens,
                                Reserve3UniqueColorTokens)
 from game_base.games import Game, GameState
+from game_base.action_sets import ACTION_SPACE_SIZE, NUM_TOKEN_ACTIONS
 from tests.game_base.test_cards import TestingCardManager
 
 random.seed(42)
@@ -193,6 +195,27 @@ class TestingGameInit:
         assert len(game.nobles) == num_players + 1
         assert len(game.cards.get_all_cards_on_tables()) == 12
 
+    def test_game_initialization_seed(self) -> None:
+        games = [Game(players=[Player(f'test_player_{i + 1}')
+                               for i in range(4)], seed=7)
+                 for _ in range(2)]
+        for game in games:
+            game.initialize()
+        assert games[0].nobles == games[1].nobles
+        assert (games[0].cards.get_all_cards_on_tables() ==
+                games[1].cards.get_all_cards_on_tables())
+        assert (games[0].cards.get_all_decks() ==
+                games[1].cards.get_all_decks())
+        # Random moves with the game's generator are reproducible as well
+        for _ in range(30):
+            moves = [game.rng.choice(
+                game.legal_action_mask().nonzero()[0].tolist())
+                for game in games]
+            assert moves[0] == moves[1]
+            for game in games:
+                game.step(moves[0])
+        assert games[0] == games[1]
+
     def test_game_can_initialize_False_min_players(self) -> None:
         game = Game()
         num_players = 1
@@ -300,6 +323,26 @@ class TestingGameGettingCard:
             card_idx = random.randint(0, 11)
             assert game.get_card_by_idx(card_idx) is None
 
+    def test_game_getting_card_by_id_not_on_table(self) -> None:
+        num_players = 4
+        players = [Player(f'test_player_{i + 1}') for i in range(num_players)]
+        game = Game(players=players,
+                    cards=CardGenerator.generate_cards(shuffled=False))
+        game.initialize()
+        card_in_deck = game.cards.get_deck(1)[0]
+        assert game.get_card_by_id(card_in_deck.id) is None
+
+    def test_game_getting_card_by_index(self) -> None:
+        num_players = 4
+        players = [Player(f'test_player_{i + 1}') for i in range(num_players)]
+        game = Game(players=players,
+                    cards=CardGenerator.generate_cards(shuffled=True))
+        game.initialize()
+        for card in game.cards.get_all_cards_on_tables():
+            card_index = game.get_card_index(card)
+            assert 0 <= card_index < 90
+            assert game.get_card_by_index(card_index) is card
+
 
 class TestingGameMakeMoveReserve3UniqueColorTokens:
 
@@ -1208,3 +1251,456 @@ class TestingGameMakeMovePurchaseCard:
         game.current_player.add_token({Token.YELLOW: wildcard_cost})
         with pytest.raises(ValueError) as e:
             game.make_move_for_current_player(action)
+
+
+class TestingGameClone:
+    @staticmethod
+    def game_for_testing() -> Game:
+        num_players = 3
+        players = [Player(f'test_player_{i + 1}') for i in range(num_players)]
+        game = Game(players=players,
+                    cards=CardGenerator.generate_cards(shuffled=False))
+        game.initialize()
+        game.make_move_for_current_player(Reserve2SameColorTokens(Token.RED))
+        game.make_move_for_current_player(
+            ReserveCard(game.cards.get_all_cards_on_tables()[2]))
+        return game
+
+    def test_game_clone_equal(self) -> None:
+        game = self.game_for_testing()
+        game_clone = game.clone()
+        assert game_clone == game
+        assert game_clone.meta_data == game.meta_data
+        assert game_clone.bank == game.bank
+        assert game_clone.nobles == game.nobles
+        assert game_clone.cards.get_all_decks() == game.cards.get_all_decks()
+        assert (game_clone.cards.get_all_tables() ==
+                game.cards.get_all_tables())
+        for player_clone, player in zip(game_clone.players, game.players):
+            assert player_clone.token_reserved == player.token_reserved
+            assert player_clone.cards_reserved == player.cards_reserved
+
+    def test_game_clone_shares_immutable_assets(self) -> None:
+        game = self.game_for_testing()
+        game_clone = game.clone()
+        assert all(noble_clone is noble for noble_clone, noble
+                   in zip(game_clone.nobles, game.nobles))
+        assert all(card_clone is card for card_clone, card
+                   in zip(game_clone.cards.get_deck(1),
+                          game.cards.get_deck(1)))
+        assert game_clone.cards.registry is game.cards.registry
+
+    def test_game_clone_independent(self) -> None:
+        game = self.game_for_testing()
+        game_clone = game.clone()
+        card = game_clone.cards.get_all_cards_on_tables()[0]
+        game_clone.make_move_for_current_player(ReserveCard(card))
+        game_clone.make_move_for_current_player(
+            Reserve3UniqueColorTokens((Token.GREEN, Token.WHITE, Token.BLUE)))
+        assert game_clone.meta_data.turns_played == 1
+        assert game.meta_data.turns_played == 0
+        assert game.meta_data.curr_player_index == 2
+        assert card in game.cards.get_table(1)
+        assert card not in game_clone.cards.get_table(1)
+        assert len(game.cards.get_deck(1)) == len(
+            game_clone.cards.get_deck(1)) + 1
+        assert game.players[2].token_reserved == TokenBag()
+        assert game.players[0].token_reserved == TokenBag().add(
+            {Token.RED: 2})
+        assert game_clone.players[0].token_reserved == TokenBag().add(
+            {Token.RED: 2, Token.GREEN: 1, Token.WHITE: 1, Token.BLUE: 1})
+        assert game.bank != game_clone.bank
+
+    def test_game_clone_own_rng(self) -> None:
+        game = self.game_for_testing()
+        game_clone = game.clone()
+        assert game_clone.rng is not game.rng
+        # The copy continues the same random stream independently
+        assert game_clone.rng.random() == game.rng.random()
+        state = game.rng.getstate()
+        game_clone.rng.random()
+        game_clone.reset(seed=1)
+        assert game.rng.getstate() == state
+        shared_rng = random.Random(0)
+        assert game.clone(rng=shared_rng).rng is shared_rng
+
+
+class TestingGameApplyUndo:
+    @staticmethod
+    def game_state(game: Game) -> tuple:
+        """Returns a snapshot of the entire state of the game."""
+        return (game.meta_data.state, game.meta_data.turns_played,
+                game.meta_data.curr_player_index,
+                game.bank.token_available.counts.copy(),
+                [(player.token_reserved.counts.copy(),
+                  player.bonus_owned.counts.copy(),
+                  player.cards_reserved.copy(), player.cards_owned.copy(),
+                  player.nobles_owned.copy(), player.prestige_points)
+                 for player in game.players],
+                game.nobles.copy(),
+                [table.copy() for table in game.cards.get_all_tables()],
+                [deck.copy() for deck in game.cards.get_all_decks()])
+
+    def test_game_apply_same_as_make_move(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        game_moved = game.clone()
+        card = game.cards.get_all_cards_on_tables()[5]
+        game.apply(ReserveCard(card))
+        game_moved.make_move_for_current_player(ReserveCard(card))
+        assert self.game_state(game) == self.game_state(game_moved)
+
+    def test_game_undo_reserve_card(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        state_before = self.game_state(game)
+        card = game.cards.get_all_cards_on_tables()[5]
+        record = game.apply(ReserveCard(card))
+        game.undo(record)
+        assert self.game_state(game) == state_before
+
+    def test_game_undo_purchase_card_and_noble(self) -> None:
+        num_players = 2
+        players = [Player(f'test_player_{i + 1}') for i in range(num_players)]
+        game = Game(players=players,
+                    cards=CardGenerator.generate_cards(shuffled=False))
+        game.initialize()
+        # (The unshuffled tables only hold red cards, so the noble has to
+        # require red bonuses)
+        game.nobles[0] = NobleGenerator.default_nobles_list()[0]
+        noble = game.nobles[0]
+        card = [card for card in game.cards.get_all_cards_on_tables()
+                if noble.bonus_required.tokens[card.bonus_color]][0]
+        # Make the player eligible for the noble with the card's bonus
+        for color in noble.bonus_required.tokens:
+            game.players[0].bonus_owned.tokens[color] = (
+                noble.bonus_required.tokens[color])
+        game.players[0].bonus_owned.tokens[card.bonus_color] -= 1
+        game.players[0].token_reserved.add(card.token_cost.tokens)
+        game.bank.token_available.remove(card.token_cost.tokens)
+        state_before = self.game_state(game)
+        record = game.apply(PurchaseCard(card))
+        assert card in game.players[0].cards_owned
+        assert noble in game.players[0].nobles_owned
+        game.undo(record)
+        assert self.game_state(game) == state_before
+
+    def test_game_undo_final_turn(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        game.players[0].prestige_points = 15
+        state_before = self.game_state(game)
+        record = game.apply(Reserve2SameColorTokens(Token.BLUE))
+        assert game.meta_data.state == GameState.FINISHED
+        game.undo(record)
+        assert self.game_state(game) == state_before
+
+    def test_game_apply_undo_random_playout(self) -> None:
+        num_players = 3
+        players = [Player(f'test_player_{i + 1}') for i in range(num_players)]
+        game = Game(players=players)
+        game.initialize()
+        states = []
+        records = []
+        for _ in range(60):
+            if game.meta_data.state != GameState.IN_PROGRESS:
+                break
+            legal_actions = game.possible_actions.legal_actions(
+                game.current_player, game.bank,
+                game.cards.get_all_cards_on_tables())
+            if not legal_actions:
+                break
+            states.append(self.game_state(game))
+            records.append(game.apply(random.choice(legal_actions)))
+        while records:
+            game.undo(records.pop())
+            assert self.game_state(game) == states.pop()
+
+
+class TestingGameReset:
+    @staticmethod
+    def new_game(seed: int) -> Game:
+        game = Game(players=[Player(f'test_player_{i + 1}')
+                             for i in range(3)], seed=seed)
+        game.initialize()
+        return game
+
+    def test_game_reset_same_as_new_game(self) -> None:
+        game = self.new_game(seed=1)
+        for _ in range(20):
+            game.step(game.rng.choice(
+                game.legal_action_mask().nonzero()[0].tolist()))
+        players, bank, cards = game.players, game.bank, game.cards
+        game.reset(seed=2)
+        assert game == self.new_game(seed=2)
+        # The objects of the game are reused
+        assert game.players is players
+        assert game.bank is bank
+        assert game.cards is cards
+
+    def test_game_reset_not_started(self) -> None:
+        game = Game(players=[Player(f'test_player_{i + 1}')
+                             for i in range(2)], seed=3)
+        game.reset()
+        assert game.meta_data.state == GameState.IN_PROGRESS
+        assert game.bank == Bank(2)
+        assert len(game.cards.get_all_cards_on_tables()) == 12
+
+    def test_game_reset_error_min_players(self) -> None:
+        game = Game(players=[Player('test_player_1')])
+        with pytest.raises(ValueError):
+            game.reset()
+
+
+class TestingGameStep:
+    def test_game_step_token_action(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        player = game.current_player
+        action = game.step(0)
+        assert action == Reserve3UniqueColorTokens((Token.GREEN, Token.WHITE,
+                                                    Token.BLUE))
+        assert player.token_reserved == TokenBag().add(
+            {Token.GREEN: 1, Token.WHITE: 1, Token.BLUE: 1})
+
+    def test_game_step_reserve_card(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        player = game.current_player
+        card = game.cards.get_all_cards_on_tables()[6]
+        game.step(15 + 6)
+        assert card in player.cards_reserved
+        assert card not in game.cards.get_all_cards_on_tables()
+
+    def test_game_step_error_empty_slot(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        with pytest.raises(ValueError) as e:
+            game.step(39)
+
+    def test_game_step_error_illegal(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        # Player can't afford any level 3 card at the start of the game
+        with pytest.raises(ValueError) as e:
+            game.step(27 + 11)
+
+
+class TestingGameLegalActionMask:
+    @staticmethod
+    def expected_mask(game: Game) -> list[bool]:
+        """Computes the mask by checking every action of the action space."""
+        cards = game.cards.get_all_cards_on_tables()
+        expected = []
+        for action_index in range(ACTION_SPACE_SIZE):
+            action = game.possible_actions.decode_action(
+                action_index, game.current_player, cards)
+            expected.append(action is not None and
+                            game.can_make_move_for_current_player(action))
+        return expected
+
+    def test_game_legal_action_mask_start(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        mask = game.legal_action_mask()
+        assert mask.dtype == bool
+        assert mask.shape == (ACTION_SPACE_SIZE,)
+        assert mask.tolist() == self.expected_mask(game)
+
+    def test_game_legal_action_mask_out(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        out = np.ones(ACTION_SPACE_SIZE, dtype=bool)
+        assert game.legal_action_mask(out=out) is out
+        assert out.tolist() == self.expected_mask(game)
+
+    def test_game_legal_action_mask_not_in_progress(self) -> None:
+        players = [Player(f'test_player_{i + 1}') for i in range(2)]
+        game = Game(players=players)
+        assert not game.legal_action_mask().any()
+
+    def test_game_legal_action_mask_random_playouts(self) -> None:
+        for _ in range(5):
+            players = [Player(f'test_player_{i + 1}') for i in range(4)]
+            game = Game(players=players)
+            game.initialize()
+            for _ in range(150):
+                mask = game.legal_action_mask()
+                assert mask.tolist() == self.expected_mask(game)
+                if not mask.any():
+                    break
+                game.step(random.choice(mask.nonzero()[0].tolist()))
+
+
+class TestingGameLegalActionCache:
+    @staticmethod
+    def tracked_game(num_players: int, seed: int) -> Game:
+        players = [Player(f'test_player_{i + 1}') for i in range(num_players)]
+        game = Game(players=players, seed=seed)
+        game.track_legal_actions(verify=True)
+        game.initialize()
+        return game
+
+    def test_game_legal_action_cache_random_playouts(self) -> None:
+        # (verify raises if the cached masks differ from the full ones)
+        for seed in range(5):
+            game = self.tracked_game(num_players=2 + seed % 3, seed=seed)
+            for _ in range(150):
+                mask = game.legal_action_mask()
+                assert not game.legal_action_cache.dirty
+                assert (mask.tolist() ==
+                        TestingGameLegalActionMask.expected_mask(game))
+                if not mask.any():
+                    break
+                game.step(game.rng.choice(mask.nonzero()[0].tolist()))
+
+    def test_game_legal_action_cache_apply_undo(self) -> None:
+        game = self.tracked_game(num_players=3, seed=7)
+        records = []
+        for _ in range(40):
+            mask = game.legal_action_mask()
+            if not mask.any():
+                break
+            action = game.possible_actions.decode_action(
+                game.rng.choice(mask.nonzero()[0].tolist()),
+                game.current_player, game.cards.get_all_cards_on_tables())
+            records.append(game.apply(action))
+        while records:
+            game.undo(records.pop())
+            game.legal_action_mask()
+        assert not game.legal_action_cache.dirty
+
+    def test_game_legal_action_cache_clone(self) -> None:
+        game = self.tracked_game(num_players=2, seed=3)
+        game.legal_action_mask()
+        clone = game.clone()
+        assert clone.legal_action_cache is not game.legal_action_cache
+        clone.step(int(clone.legal_action_mask().nonzero()[0][0]))
+        # The original game's cache isn't changed by the clone's moves
+        game.legal_action_mask()
+        clone.legal_action_mask()
+
+    def test_game_legal_action_cache_reset(self) -> None:
+        game = self.tracked_game(num_players=2, seed=3)
+        game.step(0)
+        game.reset(seed=4)
+        assert game.legal_action_cache.dirty
+        assert (game.legal_action_mask().tolist() ==
+                TestingGameLegalActionMask.expected_mask(game))
+
+    def test_game_legal_action_cache_verify_error(self) -> None:
+        game = self.tracked_game(num_players=2, seed=0)
+        game.legal_action_mask()
+        # Changes that aren't moves have to invalidate the cache
+        game.bank.token_available.counts[:] = [0] * 6
+        with pytest.raises(RuntimeError):
+            game.legal_action_mask()
+        game.legal_action_cache.invalidate()
+        assert not game.legal_action_mask()[:NUM_TOKEN_ACTIONS].any()
+
+    def test_game_track_legal_actions_disabled(self) -> None:
+        game = self.tracked_game(num_players=2, seed=0)
+        game.track_legal_actions(enabled=False)
+        assert game.legal_action_cache is None
+        assert (game.legal_action_mask().tolist() ==
+                TestingGameLegalActionMask.expected_mask(game))
+
+
+class TestingGameZobristHash:
+    @staticmethod
+    def random_playout(game: Game, num_moves: int) -> None:
+        for _ in range(num_moves):
+            mask = game.legal_action_mask()
+            if not mask.any():
+                break
+            game.step(game.rng.choice(mask.nonzero()[0].tolist()))
+            assert game.zobrist_hash == game.compute_zobrist_hash()
+
+    def test_game_zobrist_hash_random_playouts(self) -> None:
+        for seed in range(5):
+            players = [Player(f'test_player_{i + 1}')
+                       for i in range(2 + seed % 3)]
+            game = Game(players=players, seed=seed)
+            assert game.zobrist_hash == 0
+            game.initialize()
+            assert game.zobrist_hash == game.compute_zobrist_hash() != 0
+            self.random_playout(game, 200)
+
+    def test_game_zobrist_hash_same_seed(self) -> None:
+        hashes = []
+        for _ in range(2):
+            game = Game(players=[Player('a'), Player('b')], seed=11)
+            game.initialize()
+            self.random_playout(game, 30)
+            hashes.append(game.zobrist_hash)
+        assert hashes[0] == hashes[1]
+
+    def test_game_zobrist_hash_transposition(self) -> None:
+        # The same tokens taken in a different order give the same state
+        game_1 = Game(players=[Player('a'), Player('b')], seed=0)
+        game_1.initialize()
+        game_2 = game_1.clone()
+        for action_index in [0, 13, 14, 2]:
+            game_1.step(action_index)
+        for action_index in [14, 2, 0, 13]:
+            game_2.step(action_index)
+        assert game_1.zobrist_hash == game_2.zobrist_hash
+        game_1.step(0)
+        assert game_1.zobrist_hash != game_2.zobrist_hash
+
+    def test_game_zobrist_hash_custom_action(self) -> None:
+        # Actions that aren't standard are hashed from their token changes
+        class TakeWildcard(Action):
+            def can_perform(self, player: Player, bank: Bank) -> bool:
+                return bank.can_remove_token({Token.YELLOW: 1})
+
+            def perform(self, player: Player, bank: Bank) -> None:
+                bank.remove_token({Token.YELLOW: 1})
+                player.add_token({Token.YELLOW: 1})
+
+        game = Game(players=[Player('a'), Player('b')], seed=0)
+        game.initialize()
+        game.make_move_for_current_player(TakeWildcard())
+        assert game.players[0].token_reserved.counts[Token.YELLOW.ordinal] == 1
+        assert game.zobrist_hash == game.compute_zobrist_hash()
+
+    def test_game_zobrist_hash_purchase_single_payment(
+            self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # The payment of a purchase is computed once for the checks, the
+        # purchase & the hash
+        game = Game(players=[Player('a'), Player('b')], seed=0)
+        game.initialize()
+        card = game.cards.get_all_cards_on_tables()[0]
+        game.current_player.token_reserved.add(card.token_cost.tokens)
+        game.bank.token_available.remove(card.token_cost.tokens)
+        game.zobrist_hash = game.compute_zobrist_hash()
+        card_payment = Player.card_payment
+        calls = []
+
+        def counted_card_payment(player: Player, card: Card) -> dict:
+            calls.append(card)
+            return card_payment(player, card)
+
+        monkeypatch.setattr(Player, 'card_payment', counted_card_payment)
+        game.make_move_for_current_player(PurchaseCard(card))
+        assert calls == [card]
+        assert card in game.players[0].cards_owned
+        assert game.zobrist_hash == game.compute_zobrist_hash()
+
+    def test_game_zobrist_hash_side_to_move(self) -> None:
+        game = TestingGameClone.game_for_testing()
+        game_moved = game.clone()
+        game_moved.meta_data.curr_player_index = 1
+        assert game.compute_zobrist_hash() != game_moved.compute_zobrist_hash()
+
+    def test_game_zobrist_hash_apply_undo_reset(self) -> None:
+        game = Game(players=[Player('a'), Player('b'), Player('c')], seed=2)
+        game.initialize()
+        hashes = []
+        records = []
+        for _ in range(40):
+            mask = game.legal_action_mask()
+            if not mask.any():
+                break
+            action = game.possible_actions.decode_action(
+                game.rng.choice(mask.nonzero()[0].tolist()),
+                game.current_player, game.cards.get_all_cards_on_tables())
+            hashes.append(game.zobrist_hash)
+            records.append(game.apply(action))
+            assert game.zobrist_hash == game.compute_zobrist_hash()
+        while records:
+            game.undo(records.pop())
+            assert game.zobrist_hash == hashes.pop()
+        game.reset(seed=3)
+        assert game.zobrist_hash == game.compute_zobrist_hash()
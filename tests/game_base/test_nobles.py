@@ -1,4 +1,5 @@
 import pytest
+from random import Random
 from dataclasses import FrozenInstanceError
 from game_base.tokens import Token, TokenBag
 from game_base.nobles import Noble, NobleGenerator
@@ -79,3 +80,8 @@ class TestingNobleGenerator:
         nobles = NobleGenerator.generate_nobles()
         for noble in nobles:
             assert isinstance(noble, Noble)
+
+    def test_noble_generator_seeded_rng(self) -> None:
+        nobles_1 = NobleGenerator.generate_nobles(rng=Random(3))
+        nobles_2 = NobleGenerator.generate_nobles(rng=Random(3))
+        assert nobles_1 == nobles_2
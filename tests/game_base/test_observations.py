@@ -0,0 +1,119 @@
+import pytest
+import numpy as np
+from game_base.tokens import Token
+from game_base.players import Player
+from game_base.cards import CardGenerator
+from game_base.games import Game
+from game_base.actions import ReserveCard, Reserve3UniqueColorTokens
+from game_base.game_interface import GameInterfaceAgents
+from game_base.observations import (ObservationEncoder, NUM_BONUS_COLORS,
+                                    MAX_SPARSE_COUNT)
+
+
+def game_for_testing() -> Game:
+    game = Game(players=[Player(f'test_player_{i + 1}') for i in range(3)],
+                cards=CardGenerator.generate_cards(shuffled=False), seed=0)
+    game.initialize()
+    game.make_move_for_current_player(Reserve3UniqueColorTokens(
+        (Token.GREEN, Token.BLUE, Token.RED)))
+    game.make_move_for_current_player(
+        ReserveCard(game.cards.get_all_cards_on_tables()[5]))
+    return game
+
+
+class TestingObservationEncoder:
+    def test_observation_encoder_layout(self) -> None:
+        for dense in [True, False]:
+            encoder = ObservationEncoder(3, dense=dense)
+            assert encoder.layout['counts'].start == 0
+            assert encoder.layout['turn'].stop == encoder.size
+            for view in encoder._views.values():
+                assert np.shares_memory(view, encoder.observation)
+
+    def test_observation_encoder_reuses_buffer(self) -> None:
+        game = game_for_testing()
+        encoder = ObservationEncoder(3)
+        observation = encoder.encode(game)
+        assert encoder.encode(game) is observation
+        assert observation.dtype == np.float32
+
+    def test_observation_encoder_dense(self) -> None:
+        game = game_for_testing()
+        encoder = ObservationEncoder(3)
+        observation = encoder.encode(game)
+        counts = observation[encoder.layout['counts']]
+        # The bank, then the current player (3rd) & the other players
+        assert counts[:6].tolist() == game.bank.token_available.counts
+        assert counts[6:12].tolist() == [0] * 6
+        assert counts[17:23].tolist() == [1, 0, 1, 0, 1, 0]
+        assert counts[28:34].tolist() == [0, 0, 0, 0, 0, 1]
+        players = observation[encoder.layout['players']]
+        assert players.tolist() == [0, 0, 0, 0, 0, 0, 0, 1, 0]
+        cards = observation[encoder.layout['cards']].reshape(12 + 9, -1)
+        table = game.cards.get_all_cards_on_tables()
+        assert cards[0].tolist() == (
+            [1, table[0].prestige_points] +
+            table[0].token_cost.counts[:NUM_BONUS_COLORS] +
+            [int(table[0].bonus_color.ordinal == color)
+             for color in range(NUM_BONUS_COLORS)])
+        # Only the 2nd player has a reserved card
+        reserved = game.players[1].cards_reserved[0]
+        assert cards[12:, 0].tolist() == [0, 0, 0, 0, 0, 0, 1, 0, 0]
+        assert cards[18, 1] == reserved.prestige_points
+        nobles = observation[encoder.layout['nobles']].reshape(4, -1)
+        assert nobles[:, 0].tolist() == [1, 1, 1, 1]
+        assert nobles[0, 2:].tolist() == (
+            game.nobles[0].bonus_required.counts[:NUM_BONUS_COLORS])
+        assert observation[encoder.layout['turn']].tolist() == [
+            0, 0, 0, 1, 0]
+
+    def test_observation_encoder_sparse(self) -> None:
+        game = game_for_testing()
+        dense = ObservationEncoder(3, dense=True).encode(game)
+        encoder = ObservationEncoder(3, dense=False)
+        sparse = encoder.encode(game)
+        dense_counts = dense[:encoder.layout['counts'].stop //
+                             MAX_SPARSE_COUNT]
+        sparse_counts = sparse[encoder.layout['counts']].reshape(
+            -1, MAX_SPARSE_COUNT)
+        # Unary encoding of each count
+        assert sparse_counts.sum(axis=1).tolist() == np.minimum(
+            dense_counts, MAX_SPARSE_COUNT).tolist()
+        assert (np.diff(sparse_counts, axis=1) <= 0).all()
+
+    def test_observation_encoder_hide_opponents_reserved(self) -> None:
+        game = game_for_testing()
+        encoder = ObservationEncoder(3, hide_opponents_reserved=True)
+        cards = encoder.encode(game)[encoder.layout['cards']].reshape(21, -1)
+        assert cards[18, 0] == 1
+        assert not cards[18, 1:].any()
+
+    def test_observation_encoder_player_perspective(self) -> None:
+        game = game_for_testing()
+        encoder = ObservationEncoder(3)
+        observation = encoder.encode(game, player_idx=1)
+        counts = observation[encoder.layout['counts']]
+        # The 2nd player first, then the 3rd & 1st players
+        assert counts[6:12].tolist() == [0, 0, 0, 0, 0, 1]
+        assert counts[28:34].tolist() == [1, 0, 1, 0, 1, 0]
+        assert observation[encoder.layout['turn']].tolist() == [
+            0, 0, 1, 0, 0]
+
+    def test_observation_encoder_wrong_num_players(self) -> None:
+        with pytest.raises(ValueError):
+            ObservationEncoder(4).encode(game_for_testing())
+
+
+class TestingGameInterfaceAgents:
+    def test_show_game_state(self) -> None:
+        interface = GameInterfaceAgents(game=game_for_testing())
+        dense = interface.show_game_state(dense=True).copy()
+        sparse = interface.show_game_state(dense=False)
+        assert dense.tolist() == (ObservationEncoder(3).encode(interface.game)
+                                  .tolist())
+        assert sparse.size > dense.size
+        assert interface.show_game_state(dense=False) is sparse
+
+    def test_show_game_state_not_started(self) -> None:
+        game = Game(players=[Player('player_1'), Player('player_2')])
+        assert GameInterfaceAgents(game=game).show_game_state() is None
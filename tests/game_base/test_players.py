@@ -1,8 +1,11 @@
 import pytest
+import random
+import numpy as np
 from game_base.cards import Card
 from game_base.nobles import Noble
 from game_base.tokens import TokenBag, Token
 from game_base.players import Player
+from game_base.tables import STANDARD_CARDS, NUM_CARDS
 from tests.game_base.test_cards import TestingCardManager
 
 
@@ -17,6 +20,16 @@ class TestingPlayer:
         assert player.nobles_owned == []
         assert player.prestige_points == 0
 
+    def test_player_reset(self) -> None:
+        player = Player('test_player')
+        player.token_reserved.add({Token.GREEN: 3})
+        cards = TestingCardManager.card_list_for_testing(num_cards=2)
+        player.add_to_reserved_cards(cards[0])
+        player.add_to_owned_cards(cards[1])
+        player.prestige_points = 4
+        player.reset()
+        assert player == Player('test_player')
+
     def test_player_can_remove_token_True(self) -> None:
         player = Player('test_player')
         player.token_reserved.add({Token.GREEN: 3})
@@ -729,6 +742,72 @@ class TestingPlayerPurchaseCard:
             player.purchase_card(card_to_buy)
 
 
+class TestingPlayerAffordableCards:
+    @staticmethod
+    def random_player(rng: random.Random) -> Player:
+        player = Player('test_player')
+        player.token_reserved.counts[:] = [rng.randint(0, 4)
+                                           for _ in range(6)]
+        player.bonus_owned.counts[:5] = [rng.randint(0, 3)
+                                         for _ in range(5)]
+        return player
+
+    def test_player_affordable_cards_same_as_can_purchase(self) -> None:
+        rng = random.Random(0)
+        for _ in range(20):
+            player = self.random_player(rng)
+            affordable, _ = player.affordable_cards(range(NUM_CARDS))
+            assert affordable.tolist() == [player.can_purchase_card(card)
+                                           for card in STANDARD_CARDS.cards]
+
+    def test_player_affordable_cards_payment(self) -> None:
+        rng = random.Random(1)
+        for _ in range(20):
+            player = self.random_player(rng)
+            affordable, payments = player.affordable_cards(range(NUM_CARDS))
+            for card_idx in np.flatnonzero(affordable):
+                card = STANDARD_CARDS.get_card(card_idx)
+                removed_tokens = player.clone().purchase_card(card)
+                assert (payments[card_idx].tolist() ==
+                        [removed_tokens[color] for color in Token])
+
+    def test_player_card_payment(self) -> None:
+        rng = random.Random(2)
+        for _ in range(20):
+            player = self.random_player(rng)
+            affordable, payments = player.affordable_cards(range(NUM_CARDS))
+            for card_idx, card in enumerate(STANDARD_CARDS.cards):
+                payment = player.card_payment(card)
+                assert (payment is not None) == affordable[card_idx]
+                if payment is not None:
+                    assert ([payment[color] for color in Token] ==
+                            payments[card_idx].tolist())
+
+    def test_player_purchase_card_given_payment(self) -> None:
+        rng = random.Random(3)
+        for _ in range(20):
+            player = self.random_player(rng)
+            for card in STANDARD_CARDS.cards:
+                payment = player.card_payment(card)
+                assert player.can_purchase_card(card) == (payment is not None)
+                if payment is not None:
+                    tokens = player.token_reserved.counts.copy()
+                    assert player.purchase_card(card, payment) is payment
+                    assert card in player.cards_owned
+                    assert player.token_reserved.counts == [
+                        count - payment[color]
+                        for color, count in zip(Token, tokens)]
+                    break
+
+    def test_player_purchase_card_unaffordable(self) -> None:
+        player = Player('test_player')
+        card = next(card for card in STANDARD_CARDS.cards if card.level == 3)
+        with pytest.raises(ValueError):
+            player.purchase_card(card)
+        assert not player.cards_owned
+        assert player.prestige_points == 0
+
+
 class TestingPlayerStr:
     def test_player_str_default(self) -> None:
         player = Player('test_player')
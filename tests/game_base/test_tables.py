@@ -0,0 +1,101 @@
+import pytest
+import numpy as np
+from game_base.tokens import Token
+from game_base.nobles import DEFAULT_NOBLES
+from game_base.action_sets import (generate_standard_token_actions,
+                                   TOKEN_ACTION_DELTAS)
+from game_base.players import Player
+from game_base.banks import Bank
+from game_base.tables import (STANDARD_CARDS, NUM_CARDS, NUM_NOBLES,
+                              CARD_COSTS, CARD_LEVELS, CARD_POINTS,
+                              CARD_BONUS_COLORS, CARD_BONUSES,
+                              NOBLE_REQUIREMENTS, NOBLE_POINTS,
+                              affordable_cards)
+
+
+class TestingTables:
+    def test_tables_shapes(self) -> None:
+        assert (NUM_CARDS, NUM_NOBLES) == (90, 10)
+        assert CARD_COSTS.shape == (90, 5)
+        assert CARD_LEVELS.shape == CARD_POINTS.shape == (90,)
+        assert CARD_BONUS_COLORS.shape == (90,)
+        assert CARD_BONUSES.shape == (90, 5)
+        assert NOBLE_REQUIREMENTS.shape == (10, 5)
+        assert NOBLE_POINTS.shape == (10,)
+        assert TOKEN_ACTION_DELTAS.shape == (15, 5)
+
+    def test_tables_read_only(self) -> None:
+        with pytest.raises(ValueError):
+            CARD_COSTS[0, 0] = 1
+        with pytest.raises(ValueError):
+            NOBLE_REQUIREMENTS[0, 0] = 1
+
+    def test_tables_match_cards(self) -> None:
+        for card_idx, card in enumerate(STANDARD_CARDS.cards):
+            assert CARD_COSTS[card_idx].tolist() == [
+                card.token_cost.tokens[color] for color in Token
+                if color != Token.YELLOW]
+            assert CARD_LEVELS[card_idx] == card.level
+            assert CARD_POINTS[card_idx] == card.prestige_points
+            assert CARD_BONUS_COLORS[card_idx] == card.bonus_color.ordinal
+            assert CARD_BONUSES[card_idx, card.bonus_color.ordinal] == 1
+            assert CARD_BONUSES[card_idx].sum() == 1
+
+    def test_tables_match_nobles(self) -> None:
+        for noble_idx, noble in enumerate(DEFAULT_NOBLES):
+            assert (NOBLE_REQUIREMENTS[noble_idx].tolist() ==
+                    noble.bonus_required.counts[:5])
+            assert NOBLE_POINTS[noble_idx] == noble.prestige_points
+
+    def test_tables_match_token_actions(self) -> None:
+        for action_idx, action in enumerate(
+                generate_standard_token_actions()):
+            player = Player('test_player')
+            action.perform(player=player, bank=Bank())
+            assert (TOKEN_ACTION_DELTAS[action_idx].tolist() ==
+                    player.token_reserved.counts[:5])
+
+    def test_tables_noble_eligibility_broadcast(self) -> None:
+        bonuses = np.array([[4, 0, 0, 0, 4], [3, 3, 3, 0, 0]])
+        eligible = (bonuses[:, None, :] >= NOBLE_REQUIREMENTS).all(axis=2)
+        for player_bonuses, player_eligible in zip(bonuses, eligible):
+            player = Player('test_player')
+            player.bonus_owned.counts[:5] = player_bonuses.tolist()
+            assert player_eligible.tolist() == [
+                player.is_eligible_for_noble(noble)
+                for noble in DEFAULT_NOBLES]
+
+
+
+class TestingAffordableCards:
+    def test_affordable_cards_batched_same_as_single(self) -> None:
+        rng = np.random.default_rng(0)
+        tokens = rng.integers(0, 5, size=(8, 6))
+        bonuses = rng.integers(0, 4, size=(8, 5))
+        card_indices = rng.integers(0, NUM_CARDS, size=(8, 12))
+        affordable, payments = affordable_cards(tokens, bonuses,
+                                                card_indices)
+        assert affordable.shape == (8, 12)
+        assert payments.shape == (8, 12, 6)
+        for game_idx in range(8):
+            single_affordable, single_payments = affordable_cards(
+                tokens[game_idx], bonuses[game_idx], card_indices[game_idx])
+            assert (affordable[game_idx] == single_affordable).all()
+            assert (payments[game_idx] == single_payments).all()
+
+    def test_affordable_cards_shortfall(self) -> None:
+        rng = np.random.default_rng(1)
+        tokens = rng.integers(0, 5, size=(50, 6))
+        bonuses = rng.integers(0, 4, size=(50, 5))
+        card_indices = np.broadcast_to(np.arange(NUM_CARDS), (50, NUM_CARDS))
+        affordable, payments = affordable_cards(tokens, bonuses,
+                                                card_indices)
+        shortfalls = np.maximum(CARD_COSTS[card_indices] -
+                                (bonuses + tokens[:, :5])[:, None], 0)
+        assert (payments[..., 5] == shortfalls.sum(axis=2)).all()
+        assert (affordable == (shortfalls.sum(axis=2) <=
+                               tokens[:, None, 5])).all()
+        # Bonuses & the paid tokens cover the cost of the affordable cards
+        assert ((bonuses[:, None] + payments[..., :5]).sum(axis=2) +
+                payments[..., 5] >= CARD_COSTS[card_indices].sum(axis=2)
+                ).all()
@@ -1,5 +1,5 @@
 import pytest
-from game_base.tokens import Token, TokenBag
+from game_base.tokens import Token, TokenBag, ArrayTokenBag
 
 
 class TestingTokenBagInit:
@@ -476,3 +476,75 @@ class TestingTokenBagStr:
                                   "Black: 1\n"
                                   "Red  : 2\n"
                                   "Yellow: 3")
+
+
+class TestingArrayTokenBag:
+    def test_array_token_bag_initialization_default(self) -> None:
+        token_bag = ArrayTokenBag()
+        assert token_bag.counts == [0, 0, 0, 0, 0, 0]
+        assert token_bag.tokens == TokenBag().tokens
+
+    def test_array_token_bag_initialization_different_values(self) -> None:
+        token_bag = ArrayTokenBag(standard_amount=7, wildcard_amount=5)
+        assert token_bag.counts == [7, 7, 7, 7, 7, 5]
+        assert token_bag.tokens[Token.YELLOW] == 5
+
+    def test_array_token_bag_initialization_negative_value(self) -> None:
+        with pytest.raises(ValueError) as e:
+            token_bag = ArrayTokenBag(standard_amount=-1)
+
+    def test_array_token_bag_ordinals(self) -> None:
+        token_bag = ArrayTokenBag()
+        for ordinal, color in enumerate(Token):
+            token_bag.add({color: ordinal})
+        assert token_bag.counts == [0, 1, 2, 3, 4, 5]
+
+    def test_array_token_bag_add_and_remove(self) -> None:
+        token_bag = ArrayTokenBag(standard_amount=2)
+        token_bag.add({Token.GREEN: 2, Token.RED: 1})
+        token_bag.remove({Token.GREEN: 1, Token.YELLOW: 2})
+        expected = {Token.GREEN: 3,
+                    Token.WHITE: 2,
+                    Token.BLUE: 2,
+                    Token.BLACK: 2,
+                    Token.RED: 3,
+                    Token.YELLOW: 0}
+        assert token_bag.tokens == expected
+
+    def test_array_token_bag_add_expected_errors(self) -> None:
+        token_bag = ArrayTokenBag()
+        with pytest.raises(ValueError) as e:
+            token_bag.add({Token.GREEN: -1})
+
+    def test_array_token_bag_remove_expected_errors(self) -> None:
+        token_bag = ArrayTokenBag()
+        with pytest.raises(ValueError) as e:
+            token_bag.remove({Token.GREEN: 1})
+
+    def test_array_token_bag_tokens_view_writes_through(self) -> None:
+        token_bag = ArrayTokenBag()
+        token_bag.tokens[Token.BLUE] = 4
+        assert token_bag.counts[Token.BLUE.ordinal] == 4
+        assert dict(token_bag.tokens)[Token.BLUE] == 4
+
+    def test_array_token_bag_eq_token_bag(self) -> None:
+        amounts = {Token.GREEN: 1, Token.BLACK: 3}
+        assert ArrayTokenBag().add(amounts) == TokenBag().add(amounts)
+        assert TokenBag().add(amounts) == ArrayTokenBag().add(amounts)
+        assert not (ArrayTokenBag() == TokenBag().add(amounts))
+
+    def test_array_token_bag_comparisons(self) -> None:
+        token_bag_1 = ArrayTokenBag(standard_amount=5, wildcard_amount=4)
+        token_bag_2 = ArrayTokenBag(standard_amount=6, wildcard_amount=4)
+        assert token_bag_1 <= token_bag_2
+        assert not (token_bag_1 < token_bag_2)
+        assert token_bag_2 >= token_bag_1
+        assert not (token_bag_2 > token_bag_1)
+        assert token_bag_1 <= TokenBag(standard_amount=6, wildcard_amount=4)
+
+    def test_array_token_bag_str(self) -> None:
+        token_bag = ArrayTokenBag()
+        token_bag.add({Token.GREEN: 2, Token.BLUE: 4, Token.RED: 3})
+        assert str(token_bag) == ("Green: 2\n"
+                                  "Blue : 4\n"
+                                  "Red  : 3")
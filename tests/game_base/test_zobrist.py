@@ -0,0 +1,48 @@
+from game_base.cards import Card, CardGenerator
+from game_base.nobles import DEFAULT_NOBLES
+from game_base.tokens import Token, TokenBag
+from game_base.zobrist import ZobristKeys, ZOBRIST_KEYS, noble_key
+
+
+class TestingZobristKeys:
+    def test_zobrist_keys_cached(self) -> None:
+        keys = ZobristKeys()
+        key = keys.key('bank', None, 0, 4)
+        assert keys.key('bank', None, 0, 4) == key
+        assert 0 <= key < 2 ** 64
+
+    def test_zobrist_keys_distinct(self) -> None:
+        keys = ZobristKeys()
+        cards = CardGenerator.card_template().registry.cards
+        all_keys = ([keys.key('deck', card) for card in cards] +
+                    [keys.key('table', 1, 0, card) for card in cards] +
+                    [keys.key('noble', noble_key(noble))
+                     for noble in DEFAULT_NOBLES] +
+                    [keys.key('tokens', seat, color_idx, count)
+                     for seat in range(4) for color_idx in range(6)
+                     for count in range(11)])
+        assert len(set(all_keys)) == len(all_keys)
+
+    def test_zobrist_keys_seed(self) -> None:
+        assert (ZobristKeys(seed=0).key('side', 0) ==
+                ZOBRIST_KEYS.key('side', 0) !=
+                ZobristKeys(seed=1).key('side', 0))
+
+    def test_zobrist_keys_by_attributes(self) -> None:
+        # Keys don't depend on the identity of the objects
+        card = Card(level=1, prestige_points=0, bonus_color=Token.RED,
+                    token_cost=TokenBag().add({Token.RED: 9}))
+        key = ZobristKeys().key('deck', card)
+        assert ZobristKeys().key('deck', card) == key
+        other_card = Card(level=1, prestige_points=0, bonus_color=Token.RED,
+                          token_cost=TokenBag().add({Token.RED: 8}))
+        assert ZobristKeys().key('deck', other_card) != key
+
+    def test_zobrist_keys_counts_delta(self) -> None:
+        keys = ZobristKeys()
+        before = [1, 2, 3, 0, 0, 0]
+        after = [1, 3, 3, 0, 0, 1]
+        assert keys.counts_delta('tokens', 0, before, after) == (
+            keys.key('tokens', 0, 1, 2) ^ keys.key('tokens', 0, 1, 3) ^
+            keys.key('tokens', 0, 5, 0) ^ keys.key('tokens', 0, 5, 1))
+        assert keys.counts_delta('tokens', 0, before, before) == 0